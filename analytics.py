@@ -0,0 +1,76 @@
+import threading
+from collections import OrderedDict
+import pandas as pd
+from scoring import CORE_SCALES, HIGH_CUTOFF, MODERATE_CUTOFF, BANDS
+
+GROUP_COLUMNS = {"Team": "Team Name", "Position": "Position"}
+PERCENTILES = [0.1, 0.25, 0.5, 0.75, 0.9]
+
+
+def group_keys(series):
+    return series.fillna("N/A").astype(str).str.strip().replace("", "N/A")
+
+
+def numeric(df, column):
+    return pd.to_numeric(df[column], errors="coerce")
+
+
+def cohort_tables(df, by="Team Name"):
+    """Per-group domain distributions, band counts and validity rates, all via grouped ops"""
+    keys = group_keys(df[by]).rename(by)
+    scores = df[CORE_SCALES].apply(pd.to_numeric, errors="coerce").astype(float)
+    grouped = scores.groupby(keys)
+
+    percentiles = grouped.quantile(PERCENTILES).round(2)
+    percentiles.index = percentiles.index.set_names([by, "Percentile"])
+    percentiles = percentiles.rename(index=lambda q: f"P{round(q * 100)}", level="Percentile")
+
+    high = scores >= HIGH_CUTOFF
+    moderate = (scores >= MODERATE_CUTOFF) & ~high
+    development = scores < MODERATE_CUTOFF
+    bands = pd.concat({band: mask.groupby(keys).sum() for band, mask in zip(BANDS, (high, moderate, development))},
+                      names=["Band", by]).swaplevel()
+    bands = bands.reindex(pd.MultiIndex.from_product([grouped.size().index, BANDS], names=[by, "Band"]))
+
+    validity = pd.DataFrame({
+        "Assessments": keys.groupby(keys).size(),
+        "Attention fail %": ((numeric(df, "Attention Pass") == 0).groupby(keys).mean() * 100).round(1),
+        "Mean IM": numeric(df, "IM").groupby(keys).mean().round(2),
+        "Mean Inconsistency": numeric(df, "Inconsistency").groupby(keys).mean().round(3),
+    })
+
+    return {
+        "means": grouped.mean().round(2),
+        "counts": grouped.count(),
+        "percentiles": percentiles,
+        "bands": bands,
+        "validity": validity,
+    }
+
+
+class CohortAnalytics:
+    """cohort_tables over a CachedDataset, memoized per (dataset version, grouping, filters)"""
+
+    def __init__(self, dataset, maxsize=32):
+        self.dataset = dataset
+        self.maxsize = maxsize
+        self._memo = OrderedDict()
+        self._lock = threading.Lock()
+
+    def tables(self, by="Team Name", teams=(), positions=()):
+        df = self.dataset.frame()
+        key = (self.dataset.version, by, tuple(sorted(teams)), tuple(sorted(positions)))
+        with self._lock:
+            if key in self._memo:
+                self._memo.move_to_end(key)
+                return self._memo[key]
+        if teams:
+            df = df[group_keys(df["Team Name"]).isin(teams)]
+        if positions:
+            df = df[group_keys(df["Position"]).isin(positions)]
+        result = cohort_tables(df, by)
+        with self._lock:
+            self._memo[key] = result
+            while len(self._memo) > self.maxsize:
+                self._memo.popitem(last=False)
+        return result
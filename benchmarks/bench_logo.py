@@ -0,0 +1,51 @@
+"""Compare PDF header rendering with the raw logo PNG vs the cached, pre-scaled logo.
+
+    python benchmarks/bench_logo.py [--reports 50]
+"""
+import argparse, os, sys, time
+from io import BytesIO
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from reportlab.lib.pagesizes import A4
+from reportlab.pdfgen import canvas
+from report import LOGO_PATH, LOGO_WIDTH_PT, LOGO_BOX_PT, load_logo
+
+
+def render_header(image):
+    buffer = BytesIO()
+    c = canvas.Canvas(buffer, pagesize=A4)
+    width, height = A4
+    c.drawImage(image, 40, height - 20 - LOGO_BOX_PT, width=LOGO_WIDTH_PT, height=LOGO_BOX_PT,
+                preserveAspectRatio=True)
+    c.setFont("Helvetica-Bold", 16)
+    c.drawString(180, height - 60, "FOOTPSY — Individual Psychological Report")
+    c.save()
+    return buffer.getvalue()
+
+
+def bench(label, fn, reports):
+    start = time.perf_counter()
+    for _ in range(reports):
+        pdf = fn()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<10} {elapsed / reports * 1000:8.2f} ms/report  {len(pdf) / 1024:8.1f} KiB/report")
+    return elapsed, len(pdf)
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--reports", type=int, default=50)
+    args = ap.parse_args()
+
+    start = time.perf_counter()
+    logo = load_logo()
+    print(f"startup    {(time.perf_counter() - start) * 1000:8.2f} ms (one-off downsample)")
+
+    raw_t, raw_size = bench("raw png", lambda: render_header(LOGO_PATH), args.reports)
+    cached_t, cached_size = bench("cached", lambda: render_header(logo.reader), args.reports)
+    print(f"speedup    {raw_t / cached_t:8.1f}x   size {raw_size / cached_size:.1f}x smaller")
+
+
+if __name__ == "__main__":
+    main()
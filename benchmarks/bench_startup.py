@@ -0,0 +1,120 @@
+"""Cold-start benchmark: what the app imports before page 1, and how long page 1 takes.
+
+Each measurement runs in a fresh interpreter:
+  * `-X importtime` over streamlit plus every module the app imports at top
+    level, broken down by top-level package (streamlit's own share is listed
+    separately);
+  * wall time of a cold AppTest render of page 1;
+  * the libraries that should only load on first use (Google clients,
+    ReportLab, Pillow): what they cost on their own and whether that real
+    page-1 run loaded them, including from background threads it started.
+
+    python benchmarks/bench_startup.py [--runs 3] [--top 15] [--json startup.json]
+"""
+import argparse, ast, json, os, statistics, subprocess, sys
+
+BASE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_PATH = os.path.join(BASE, "football_psych_auto_report_generator.py")
+DEFERRED = ["gspread", "google.oauth2", "googleapiclient", "reportlab", "PIL"]
+
+PAGE1_SNIPPET = f"""
+import json, sys, threading, time
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file({APP_PATH!r}, default_timeout=120)
+at.run()
+assert not at.exception, at.exception
+elapsed = time.perf_counter() - start
+for thread in threading.enumerate():  # let a warm-up thread finish so its imports count
+    if thread.name == "footpsy-warmup":
+        thread.join(timeout=30)
+print(json.dumps({{"seconds": elapsed, "loaded": [m for m in {DEFERRED!r} if m in sys.modules]}}))
+"""
+
+
+def app_imports(path=APP_PATH):
+    """Top-level modules the app script imports at module level"""
+    tree = ast.parse(open(path, encoding="utf-8").read())
+    names = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            names += [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.module:
+            names.append(node.module)
+    return list(dict.fromkeys(names))
+
+
+def importtime(statement):
+    """{module: cumulative us} for every import made by `statement` in a fresh interpreter"""
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", statement], cwd=BASE,
+                          capture_output=True, text=True, check=True)
+    modules = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not name.startswith("  "):  # top level: not imported by another module in this list
+            modules[name.strip()] = int(cumulative)
+    return modules
+
+
+def by_package(modules):
+    totals = {}
+    for name, us in modules.items():
+        package = name.split(".")[0]
+        totals[package] = totals.get(package, 0) + us
+    return totals
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--runs", type=int, default=3, help="cold page-1 renders to time")
+    ap.add_argument("--top", type=int, default=15)
+    ap.add_argument("--json", help="write the measurements to this file")
+    args = ap.parse_args()
+
+    modules = app_imports()
+    streamlit_only = by_package(importtime("import streamlit"))
+    startup = by_package(importtime("import " + ", ".join(["streamlit"] + modules)))
+
+    total_ms = sum(startup.values()) / 1000
+    print(f"Import time before page 1: {total_ms:.0f} ms "
+          f"(streamlit itself {sum(streamlit_only.values()) / 1000:.0f} ms)")
+    print(f"{'package':<24}{'ms':>10}")
+    for package, us in sorted(startup.items(), key=lambda kv: -kv[1])[:args.top]:
+        print(f"{package:<24}{us / 1000:>10.1f}")
+
+    renders, loaded = [], set()
+    for _ in range(args.runs):
+        proc = subprocess.run([sys.executable, "-c", PAGE1_SNIPPET], cwd=BASE, capture_output=True, text=True,
+                              check=True)
+        run = json.loads(proc.stdout.strip().splitlines()[-1])
+        renders.append(run["seconds"])
+        loaded.update(run["loaded"])
+
+    print("\nLoaded on first use (checked after a real page-1 run):")
+    deferred = {}
+    for name in DEFERRED:
+        at_startup = name in loaded
+        try:
+            own_ms = sum(importtime(f"import {name}").values()) / 1000
+        except subprocess.CalledProcessError:
+            own_ms = None  # not installed here
+        deferred[name] = {"loaded_by_page1": at_startup, "import_ms": own_ms}
+        cost = f"{own_ms:8.0f} ms" if own_ms is not None else "  not installed"
+        print(f"  {name:<20}{cost}  {'LOADED BY PAGE 1' if at_startup else 'deferred'}")
+
+    print(f"\nCold page-1 render (fresh interpreter, incl. imports): "
+          f"median {statistics.median(renders) * 1000:.0f} ms over {args.runs} run(s)")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"import_ms": round(total_ms, 1),
+                       "streamlit_import_ms": round(sum(streamlit_only.values()) / 1000, 1),
+                       "packages_ms": {p: round(us / 1000, 1) for p, us in startup.items()},
+                       "deferred": deferred,
+                       "page1_cold_ms": [round(t * 1000) for t in renders]}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+"""Hot-path benchmark suite: scoring, PDF rendering and result persistence.
+
+Synthetic 66-item respondents (fixed seed) are scored one at a time and as a
+batch, rendered to PDF with and without the logo, and persisted through the
+local store, the Sheets writers and the upload pipeline against the in-memory
+Google fakes (no network, zero simulated latency).
+
+    python benchmarks/bench_suite.py --out benchmarks/baseline.json
+    python benchmarks/bench_suite.py --compare benchmarks/baseline.json [--tolerance 0.25]
+
+With --compare the run exits non-zero if any case is slower than the baseline
+by more than the tolerance. Baselines are machine-specific: record one on the
+deploy host (or CI runner) and compare against it there.
+"""
+import argparse, datetime, json, os, platform, statistics, sys, tempfile, time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from scoring import ScoringPlan, score_one, score_batch, N_ITEMS
+from report import load_logo, render_report
+from results import RESULT_COLUMNS, build_result_row, responses_from_vector
+from fake_google import make_fake_clients
+from pipeline import ResultPipeline
+from sheet_writer import DirectSheetWriter, BufferedSheetWriter
+from storage import SQLiteResultStore, SheetsResultStore
+
+BASE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MAPPING_PATH = os.path.join(BASE, "assets", "scales_mapping.csv")
+POSITIONS = ["GK", "DF", "MF", "FW"]
+
+
+def synthetic_responses(n, seed=0):
+    """n x 66 Likert answers (1–5) that pass both attention checks"""
+    rng = np.random.default_rng(seed)
+    X = rng.integers(1, 6, size=(n, N_ITEMS)).astype(float)
+    X[:, 17] = 1  # item 18: "Strongly Disagree"
+    X[:, 59] = 4  # item 60
+    return X
+
+
+def synthetic_player(k):
+    return {"name": f"Player {k}", "id": f"FPY-{k:06d}", "team": f"Team {k % 12}",
+            "position": POSITIONS[k % len(POSITIONS)], "dob": "01/01/2005", "age": 20}
+
+
+def measure(fn, repeat, items=1):
+    """Best and median wall time of `repeat` runs of fn(); per-item cost (from the best run,
+    the least noisy figure) when fn handles `items` at once"""
+    fn()  # warm-up
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    best = min(times)
+    return {"best_ms": round(best * 1000, 3), "median_ms": round(statistics.median(times) * 1000, 3),
+            "per_item_us": round(best / items * 1e6, 2), "items": items, "repeat": repeat}
+
+
+def run(n, repeat, seed):
+    plan = ScoringPlan.from_csv(MAPPING_PATH)
+    X = synthetic_responses(n, seed)
+    dicts = [responses_from_vector(x) for x in X]
+    scored = [score_one(r, plan) for r in dicts[:20]]
+    rows = [build_result_row(synthetic_player(k), d, v, dicts[k], timestamp=datetime.datetime(2025, 1, 1))
+            for k, (d, v) in enumerate(score_one(r, plan) for r in dicts)]
+    load_logo()
+    results = {}
+
+    def case(name, fn, items=1, times=repeat):
+        results[name] = measure(fn, times, items)
+        print(f"{name:<28}{results[name]['best_ms']:>12.3f} ms{results[name]['per_item_us']:>14.2f} us/item")
+
+    # --- scoring ---
+    case("score.single", lambda: [score_one(r, plan) for r in dicts], items=n)
+    case("score.batch", lambda: score_batch(X, plan), items=n)
+
+    # --- PDF rendering ---
+    pdf_args = [(synthetic_player(k), d, v, dicts[k]) for k, (d, v) in enumerate(scored)]
+    case("pdf.render", lambda: [render_report(*a) for a in pdf_args], items=len(pdf_args), times=max(1, repeat // 2))
+    case("pdf.render_no_logo", lambda: [render_report(*a, with_logo=False) for a in pdf_args],
+         items=len(pdf_args), times=max(1, repeat // 2))
+
+    # --- persistence against the Google fakes ---
+    def sqlite_append():
+        with tempfile.TemporaryDirectory() as tmp:
+            store = SQLiteResultStore(os.path.join(tmp, "results.sqlite3"))
+            store.append_many(rows)
+            store.close()
+
+    def sheets_direct():
+        clients = make_fake_clients(header=RESULT_COLUMNS)
+        writer = DirectSheetWriter(lambda: clients.sheet)
+        for row in rows:
+            writer.append(row)
+
+    def sheets_buffered():
+        clients = make_fake_clients(header=RESULT_COLUMNS)
+        with tempfile.TemporaryDirectory() as tmp:
+            writer = BufferedSheetWriter(lambda: clients.sheet, os.path.join(tmp, "spool.sqlite3"), max_delay=3600)
+            for row in rows:
+                writer.append(row)
+            writer.close()
+
+    def sheets_load():
+        SheetsResultStore(lambda: loaded.sheet).frame()
+
+    def pipeline_submit():
+        clients = make_fake_clients(header=RESULT_COLUMNS)
+        pipeline = ResultPipeline(lambda: clients, workers=4)
+        pdf = b"%PDF-1.4 benchmark"
+        subs = [pipeline.submit(row, pdf, row[1], row[2]) for row in rows[:200]]
+        for sub in subs:
+            sub.wait()
+        pipeline.executor.shutdown()
+
+    loaded = make_fake_clients(header=RESULT_COLUMNS)
+    loaded.sheet.append_rows(rows)
+
+    case("store.sqlite_append_many", sqlite_append, items=n)
+    case("sheets.direct_append", sheets_direct, items=n)
+    case("sheets.buffered_append", sheets_buffered, items=n)
+    case("sheets.full_load", sheets_load, items=n)
+    case("pipeline.submit", pipeline_submit, items=min(n, 200), times=max(1, repeat // 2))
+    return results
+
+
+def compare(results, baseline, tolerance):
+    regressions = []
+    for name, current in results.items():
+        before = baseline["results"].get(name)
+        if not before:
+            continue
+        ratio = current["per_item_us"] / before["per_item_us"] if before["per_item_us"] else 1.0
+        flag = "REGRESSION" if ratio > 1 + tolerance else ""
+        print(f"{name:<28}{before['per_item_us']:>12.2f} -> {current['per_item_us']:>10.2f} us/item  {ratio:6.2f}x {flag}")
+        if flag:
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--respondents", type=int, default=1000)
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--out", help="write results as baseline JSON")
+    ap.add_argument("--compare", help="baseline JSON to compare against")
+    ap.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown before failing (0.25 = 25%%)")
+    args = ap.parse_args()
+
+    results = run(args.respondents, args.repeat, args.seed)
+    report = {
+        "meta": {
+            "created": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "respondents": args.respondents,
+            "repeat": args.repeat,
+            "seed": args.seed,
+        },
+        "results": results,
+    }
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline written to {args.out}")
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"{len(regressions)} case(s) slower than baseline by more than {args.tolerance:.0%}: "
+                  + ", ".join(regressions))
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
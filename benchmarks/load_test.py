@@ -0,0 +1,176 @@
+"""Headless load test: N concurrent athletes through pages 1 -> 2–7 -> 8.
+
+Every simulated athlete is its own Streamlit AppTest session. AppTest swaps a
+process-global runtime on each rerun, so sessions cannot overlap inside one
+process: each concurrency slot is a worker process with warm caches (scoring
+plan, logo, pipeline) that runs its athletes back to back. All workers share
+the same on-disk result store. Google services are the in-memory fakes
+(FOOTPSY_FAKE_GOOGLE) with optional simulated latency.
+
+    python benchmarks/load_test.py --sessions 30 --concurrency 10
+
+Reports p50/p95 latency per page transition, plus memory per session: RSS
+growth of the workers divided by the sessions they served, and the size of
+st.session_state.
+"""
+import argparse, datetime, os, pickle, random, statistics, sys, tempfile, time
+from concurrent.futures import ProcessPoolExecutor
+
+BASE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_PATH = os.path.join(BASE, "football_psych_auto_report_generator.py")
+LABELS = ["Strongly Disagree", "Disagree", "Neutral", "Agree", "Strongly Agree"]
+STAGES = ["page 1", "start", "questions", "results", "saved"]
+
+
+def rss_mb():
+    """Resident set size of this process in MiB (Linux /proc, else peak RSS)"""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def session_state_bytes(at):
+    """Approximate per-session state size: everything picklable in st.session_state"""
+    state = object.__getattribute__(at.session_state, "_state").filtered_state  # the wrapper proxies attributes
+    total = 0
+    for value in state.values():
+        try:
+            total += len(pickle.dumps(value))
+        except Exception:  # e.g. the live Submission object
+            pass
+    return total
+
+
+def timed_run(at, timings, stage):
+    start = time.perf_counter()
+    at.run()
+    timings.setdefault(stage, []).append(time.perf_counter() - start)
+    if at.exception:
+        raise RuntimeError(f"{stage}: {at.exception[0].value}")
+
+
+_worker = {}
+
+
+def init_worker(tmp, timeout, latency):
+    os.environ["FOOTPSY_FAKE_GOOGLE"] = "1"
+    os.environ["FOOTPSY_DB"] = os.path.join(tmp, "results.sqlite3")
+    os.environ["FOOTPSY_SPOOL"] = os.path.join(tmp, f"spool-{os.getpid()}.sqlite3")
+    os.environ["FOOTPSY_OUTBOX"] = os.path.join(tmp, f"outbox-{os.getpid()}.sqlite3")
+    if latency:
+        os.environ["FOOTPSY_FAKE_LATENCY"] = latency
+    from streamlit.testing.v1 import AppTest
+    # Warm the shared caches once, as an already running server would have them
+    AppTest.from_file(APP_PATH, default_timeout=timeout).run()
+    _worker.update(timeout=timeout, baseline_rss=rss_mb())
+
+
+def simulate(athlete):
+    """One athlete's full questionnaire in this worker; returns (pid, timings, state bytes, RSS growth)"""
+    from streamlit.testing.v1 import AppTest
+
+    timeout = _worker["timeout"]
+    rng = random.Random(athlete)
+    timings = {}
+    at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+    timed_run(at, timings, "page 1")
+
+    fields = {"Player Name": f"Load Test {athlete}", "Player ID": f"LOAD-{athlete:05d}",
+              "Team Name": f"Team {athlete % 8}", "Position": rng.choice(["GK", "DF", "MF", "FW"])}
+    for box in at.text_input:
+        if box.label in fields:
+            box.set_value(fields[box.label])
+    at.date_input[0].set_value(datetime.date(2000 + athlete % 10, 1 + athlete % 12, 1))
+    timed_run(at, timings, "page 1")  # "Start" is enabled once the form is filled in
+    next(b for b in at.button if b.label == "Start the assessment").click()
+    timed_run(at, timings, "start")
+
+    while at.session_state.page != 8:
+        for radio in at.radio:
+            if radio.key and radio.key.startswith("form_q"):
+                radio.set_value(rng.choice(LABELS))
+        next(b for b in at.button if b.label == "💾 Save & Next").click()
+        timed_run(at, timings, "questions")
+
+    # first render of the results page includes scoring and the PDF build
+    timings["results"] = timings["questions"][-1:]
+    timings["questions"] = timings["questions"][:-1]
+
+    start = time.perf_counter()
+    if not at.session_state.submission.wait(timeout):
+        raise RuntimeError("results page: submission did not finish")
+    timings["saved"] = [time.perf_counter() - start]
+    return os.getpid(), timings, session_state_bytes(at), rss_mb() - _worker["baseline_rss"]
+
+
+def try_simulate(athlete):
+    try:
+        return simulate(athlete)
+    except Exception as e:
+        return f"athlete {athlete}: {e}"
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, round(q * (len(ordered) - 1))))]
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--sessions", type=int, default=20, help="athletes to simulate")
+    ap.add_argument("--concurrency", type=int, default=10, help="athletes in flight at once")
+    ap.add_argument("--timeout", type=float, default=120, help="per-rerun timeout (s)")
+    ap.add_argument("--sheet-latency", type=float, default=0.0, help="simulated Sheets API latency (s)")
+    ap.add_argument("--drive-latency", type=float, default=0.0, help="simulated Drive API latency (s)")
+    args = ap.parse_args()
+
+    tmp = tempfile.mkdtemp(prefix="footpsy-load-")
+    latency = f"{args.sheet_latency},{args.drive_latency}" if args.sheet_latency or args.drive_latency else ""
+
+    # AppTest runs the app as __main__ inside each worker, so hand the pool
+    # functions by their importable module name rather than from this script
+    from load_test import init_worker, try_simulate
+
+    failures, state_sizes, all_timings, growth, served = [], [], {}, {}, {}
+    with ProcessPoolExecutor(max_workers=args.concurrency, initializer=init_worker,
+                             initargs=(tmp, args.timeout, latency)) as pool:
+        # wait until every worker is warm so start-up is not counted as page latency
+        list(pool.map(time.sleep, [0.5] * args.concurrency))
+        start = time.perf_counter()
+        for result in pool.map(try_simulate, range(args.sessions)):
+            if isinstance(result, str):
+                failures.append(result)
+                continue
+            pid, timings, state_bytes, rss_growth = result
+            state_sizes.append(state_bytes)
+            growth[pid] = max(growth.get(pid, 0.0), rss_growth)
+            served[pid] = served.get(pid, 0) + 1
+            for stage, values in timings.items():
+                all_timings.setdefault(stage, []).extend(values)
+        wall = time.perf_counter() - start
+
+    completed = args.sessions - len(failures)
+    print(f"{completed}/{args.sessions} sessions completed in {wall:.1f}s "
+          f"({args.concurrency} concurrent, {completed / wall * 60:.1f} athletes/min)")
+    print(f"{'stage':<12}{'n':>6}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}")
+    for stage in STAGES:
+        values = all_timings.get(stage)
+        if values:
+            print(f"{stage:<12}{len(values):>6}{percentile(values, 0.5) * 1000:>10.0f}"
+                  f"{percentile(values, 0.95) * 1000:>10.0f}{max(values) * 1000:>10.0f}")
+    if completed:
+        print(f"memory: {sum(growth.values()) / sum(served.values()):.2f} MiB/session RSS growth "
+              f"over {len(served)} workers, {statistics.mean(state_sizes) / 1024:.0f} KiB/session in st.session_state")
+    for failure in failures[:10]:
+        print(f"FAILED {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
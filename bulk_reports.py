@@ -0,0 +1,122 @@
+"""Regenerate every PDF report from an admin CSV export.
+
+Rows are rescored from their raw Q1–Q66 columns with the current
+scales_mapping.csv, then rendered across a process pool. Rows without any
+recorded answers are skipped, and a row that fails to render is reported by
+CSV line without stopping the run.
+
+    python bulk_reports.py footpsy_all_assessments.csv --out reports/ --workers 4
+    python bulk_reports.py footpsy_all_assessments.csv --out reports.zip
+"""
+import argparse, os, re, sys, time, zipfile
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+
+from report import render_report
+from results import response_matrix, player_info_from_row, responses_from_vector
+from scoring import ScoringPlan, score_batch, scores_at
+
+BASE = os.path.dirname(os.path.abspath(__file__))
+MAPPING_PATH = os.path.join(BASE, "assets", "scales_mapping.csv")
+
+
+def build_jobs(df, plan, skipped):
+    """Rescore the whole export in one vectorized pass; yield one render job per row.
+    Rows without any answers (legacy "N/A" or blank Q cells) go to `skipped` as (line, problem)"""
+    X = response_matrix(df)
+    scores = score_batch(X, plan)
+    blank = np.isnan(X).all(axis=1)
+    for n, row in enumerate(df.to_dict("records")):
+        line = n + 2  # header is line 1
+        player_info = player_info_from_row(row)
+        if blank[n]:
+            skipped.append((line, f"no answers recorded for {player_info['name']} ({player_info['id']}), skipped"))
+            continue
+        domain_means, validity_scores = scores_at(scores, n, plan)
+        yield line, player_info, domain_means, validity_scores, responses_from_vector(X[n]), row.get("Timestamp", "")
+
+
+def report_filename(player_info, timestamp):
+    stamp = re.sub(r"\D", "", str(timestamp)) or "undated"
+    name = f"FOOTPSY_Report_{player_info['name']}_{player_info['id']}_{stamp}.pdf"
+    return re.sub(r"[^\w.\-]+", "_", name)
+
+
+def render_job(job):
+    """(line, file name, PDF bytes, error); a failed row comes back with its error instead of stopping the pool"""
+    line, player_info, domain_means, validity_scores, responses, timestamp = job
+    name = report_filename(player_info, timestamp)
+    try:
+        return line, name, render_report(player_info, domain_means, validity_scores, responses), None
+    except Exception as e:
+        return line, name, None, f"{name} not rendered: {type(e).__name__}: {e}"
+
+
+class DirectoryWriter:
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+
+    def write(self, name, data):
+        with open(os.path.join(self.path, name), "wb") as f:
+            f.write(data)
+
+    def close(self):
+        pass
+
+
+class ZipWriter:
+    def __init__(self, path):
+        # PDFs are already compressed; storing avoids burning CPU on deflate
+        self.zf = zipfile.ZipFile(path, "w", compression=zipfile.ZIP_STORED)
+
+    def write(self, name, data):
+        self.zf.writestr(name, data)
+
+    def close(self):
+        self.zf.close()
+
+
+def regenerate(csv_path, out, workers=None, chunksize=8):
+    """Render every row of csv_path into out (directory or .zip).
+    Returns (count, seconds, skipped, failed), the last two as (line, problem) lists"""
+    df = pd.read_csv(csv_path, dtype=str, keep_default_na=False)
+    plan = ScoringPlan.from_csv(MAPPING_PATH)
+    writer = ZipWriter(out) if out.lower().endswith(".zip") else DirectoryWriter(out)
+
+    start = time.perf_counter()
+    count, skipped, failed = 0, [], []
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            # map() yields in order as chunks finish, so PDFs stream to disk
+            for line, name, pdf, error in pool.map(render_job, build_jobs(df, plan, skipped), chunksize=chunksize):
+                if error:
+                    failed.append((line, error))
+                    continue
+                writer.write(name, pdf)
+                count += 1
+    finally:
+        writer.close()
+    return count, time.perf_counter() - start, skipped, failed
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("csv", help="admin CSV export (same columns as the results sheet)")
+    ap.add_argument("--out", default="reports", help="output directory, or a path ending in .zip")
+    ap.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    ap.add_argument("--chunksize", type=int, default=8, help="rows handed to a worker at a time")
+    args = ap.parse_args(argv)
+
+    count, elapsed, skipped, failed = regenerate(args.csv, args.out, args.workers, args.chunksize)
+    for line, problem in sorted(skipped + failed):
+        print(f"line {line}: {problem}")
+    rate = count / elapsed if elapsed else 0.0
+    print(f"Rendered {count} reports to {args.out} in {elapsed:.1f}s ({rate:.1f} reports/s); "
+          f"{len(skipped)} skipped, {len(failed)} failed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+import threading, time
+import pandas as pd
+from search_index import SearchIndex
+from history import PlayerIndex
+from metrics import span
+
+
+class CachedDataset:
+    """Admin view of the result store, kept in memory and synced incrementally.
+
+    Within `ttl` seconds of the last sync the cached frame is returned as is;
+    after that only rows appended since the last sync are fetched. `version`
+    changes whenever the frame does, so derived structures (search index,
+    player index, aggregates) are updated only when needed. In-place edits to old rows
+    (e.g. a back-filled PDF link) show up on the next forced refresh. `mark_stale`
+    makes the next call sync without waiting out the ttl (e.g. after a submission).
+    """
+
+    def __init__(self, store, ttl=30.0):
+        self.store = store
+        self.ttl = ttl
+        self.version = 0
+        self._reloads = 0
+        self._frame = None
+        self._marker = None
+        self._synced = 0.0
+        self._stale = False
+        self._derived = {}
+        self._lock = threading.Lock()
+
+    def mark_stale(self):
+        """Sync on the next frame() call even within the ttl; cheap enough to call on every write"""
+        self._stale = True
+
+    def frame(self, force=False):
+        with self._lock:
+            now = time.monotonic()
+            if self._frame is None or force:
+                self._stale = False
+                self._full_load()
+            elif self._stale or now - self._synced >= self.ttl:
+                self._stale = False  # a write landing during the fetch marks it stale again
+                with span("admin.delta_sync"):
+                    delta, marker = self.store.frame_since(self._marker)
+                if len(delta) and len(self._frame) and delta.index.isin(self._frame.index).any():
+                    # rows the frame already holds came back (the source was re-sorted or
+                    # rows were removed): positions no longer line up, so start over
+                    self._full_load()
+                elif len(delta):
+                    self._frame = pd.concat([self._frame, delta]) if len(self._frame) else delta
+                    self._marker = marker
+                    self.version += 1
+                else:
+                    self._marker = marker
+            else:
+                return self._frame
+            self._synced = now
+            return self._frame
+
+    def _full_load(self):
+        with span("admin.full_load"):
+            self._frame, self._marker = self.store.frame_since(None)
+        self.version += 1
+        self._reloads += 1
+
+    def derived(self, name, build, extend):
+        """Structure built from the frame by `build(frame)` and kept current with
+        `extend(obj, new_rows)` after delta syncs; rebuilt after a full reload.
+
+        Deriving syncs on its own, so the structure can cover rows appended
+        after a frame the caller already holds; positional lookups take that
+        frame's length (`within`) to stay inside it.
+        """
+        frame = self.frame()
+        with self._lock:
+            entry = self._derived.get(name)
+            if entry is None or entry[0] != self._reloads:
+                with span(f"admin.build.{name}"):
+                    obj = build(frame)
+            else:
+                obj = entry[1]
+                if entry[2] < len(frame):
+                    with span(f"admin.extend.{name}"):
+                        extend(obj, frame.iloc[entry[2]:])
+            self._derived[name] = (self._reloads, obj, len(frame))
+            return obj
+
+    def search_index(self):
+        """Name/ID/team index over the current frame"""
+        return self.derived("search", SearchIndex, SearchIndex.extend)
+
+    def player_index(self):
+        """Player ID -> row positions over the current frame"""
+        return self.derived("players", PlayerIndex, PlayerIndex.extend)
@@ -0,0 +1,51 @@
+import gzip, io, tempfile
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet export is optional
+    pa = pq = None
+
+CHUNK_ROWS = 5000
+SPOOL_MAX_BYTES = 16 * 1024 * 1024  # larger exports spill to a temp file on disk
+
+# label -> (file extension, mime type)
+EXPORT_FORMATS = {
+    "CSV": ("csv", "text/csv"),
+    "CSV (gzip)": ("csv.gz", "application/gzip"),
+}
+if pq is not None:
+    EXPORT_FORMATS["Parquet"] = ("parquet", "application/vnd.apache.parquet")
+
+
+def write_csv(df, fileobj, chunk_rows=CHUNK_ROWS):
+    """Write df as CSV one chunk at a time, so the whole export never exists as one string"""
+    text = io.TextIOWrapper(fileobj, encoding="utf-8", newline="", write_through=True)
+    for start in range(0, max(len(df), 1), chunk_rows):
+        df.iloc[start:start + chunk_rows].to_csv(text, index=False, header=start == 0)
+    text.detach()
+
+
+def write_parquet(df, fileobj, chunk_rows=CHUNK_ROWS):
+    """One row group per chunk; the schema comes from the whole frame so chunks agree"""
+    schema = pa.Schema.from_pandas(df, preserve_index=False)
+    with pq.ParquetWriter(fileobj, schema, compression="zstd") as writer:
+        for start in range(0, len(df), chunk_rows):
+            writer.write_table(pa.Table.from_pandas(df.iloc[start:start + chunk_rows], schema=schema,
+                                                    preserve_index=False))
+
+
+def export_frame(df, fmt="CSV"):
+    """Render df in one of EXPORT_FORMATS into a spooled temp file, rewound for reading"""
+    out = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES)
+    if fmt == "CSV":
+        write_csv(df, out)
+    elif fmt == "CSV (gzip)":
+        with gzip.GzipFile(fileobj=out, mode="wb", compresslevel=6) as gz:
+            write_csv(df, gz)
+    elif fmt == "Parquet" and pq is not None:
+        write_parquet(df, out)
+    else:
+        raise ValueError(f"Unsupported export format: {fmt}")
+    out.seek(0)
+    return out
@@ -0,0 +1,167 @@
+"""In-memory stand-ins for the gspread and Drive APIs used by the app.
+
+    clients = make_fake_clients()
+    clients.sheet.append_row([...])
+"""
+import itertools, re, threading, time
+from google_clients import GoogleClients
+
+
+class FakeWorksheet:
+    def __init__(self, header=None, latency=0.0):
+        self.rows = [list(header)] if header else []
+        self.latency = latency
+        self.calls = 0
+        self.offline = False  # set to simulate lost connectivity
+        self._lock = threading.Lock()
+
+    def _call(self):
+        self.calls += 1
+        if self.offline:
+            raise ConnectionError("Sheets unreachable (fake offline)")
+        if self.latency:
+            time.sleep(self.latency)
+
+    def append_row(self, row, **kwargs):
+        return self.append_rows([row], **kwargs)
+
+    def append_rows(self, rows, **kwargs):
+        self._call()
+        with self._lock:
+            start = len(self.rows) + 1
+            self.rows.extend(list(r) for r in rows)
+        return {"updates": {"updatedRange": f"Sheet1!A{start}:A{start + len(rows) - 1}"}}
+
+    def update_cell(self, row, col, value):
+        self._call()
+        with self._lock:
+            r = self.rows[row - 1]
+            r.extend([""] * (col - len(r)))
+            r[col - 1] = value
+
+    def get_all_values(self):
+        self._call()
+        with self._lock:
+            return [list(r) for r in self.rows]
+
+    def get_all_records(self):
+        values = self.get_all_values()
+        if not values:
+            return []
+        header = values[0]
+        return [dict(zip(header, r)) for r in values[1:]]
+
+    def get_values(self, range_name=None):
+        values = self.get_all_values()
+        if not range_name:
+            return values
+        # only "A<start>:<col>" / "<start>:<end>" style row ranges are needed by the app
+        bounds = [int("".join(ch for ch in part if ch.isdigit()) or 0) for part in range_name.split(":")]
+        start = max(bounds[0], 1)
+        end = bounds[1] if len(bounds) > 1 and bounds[1] else len(values)
+        return values[start - 1:end]
+
+    @property
+    def row_count(self):
+        return len(self.rows)
+
+
+class FakeSpreadsheet:
+    def __init__(self, sheet1):
+        self.sheet1 = sheet1
+
+
+class FakeSheetsClient:
+    def __init__(self, worksheet):
+        self.worksheet = worksheet
+
+    def open(self, name):
+        return FakeSpreadsheet(self.worksheet)
+
+
+class _Request:
+    def __init__(self, fn):
+        self.fn = fn
+
+    def execute(self, **kwargs):
+        return self.fn()
+
+
+class FakeDriveService:
+    def __init__(self, latency=0.0):
+        self.files_store = {}
+        self.permissions_store = {}
+        self.latency = latency
+        self.offline = False  # set to simulate lost connectivity
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def _sleep(self):
+        if self.offline:
+            raise ConnectionError("Drive unreachable (fake offline)")
+        if self.latency:
+            time.sleep(self.latency)
+
+    def files(self):
+        return self
+
+    def permissions(self):
+        return _FakePermissions(self)
+
+    def create(self, body=None, media_body=None, **kwargs):
+        def run():
+            self._sleep()
+            data = b""
+            if media_body is not None:
+                fd = media_body.stream() if hasattr(media_body, "stream") else media_body
+                data = fd.getvalue() if hasattr(fd, "getvalue") else fd.read()
+            with self._lock:
+                file_id = f"fake{next(self._ids)}"
+                self.files_store[file_id] = {"name": (body or {}).get("name"), "data": data,
+                                             "appProperties": dict((body or {}).get("appProperties") or {})}
+            return {"id": file_id,
+                    "webViewLink": f"https://drive.example/{file_id}/view",
+                    "webContentLink": f"https://drive.example/{file_id}/download"}
+        return _Request(run)
+
+    def list(self, q="", **kwargs):
+        # only the "appProperties has { key='k' and value='v' }" form used by the app is understood
+        def run():
+            self._sleep()
+            match = re.search(r"key='([^']*)' and value='((?:[^'\\]|\\.)*)'", q or "")
+            key, value = (match.group(1), re.sub(r"\\(.)", r"\1", match.group(2))) if match else (None, None)
+            with self._lock:
+                files = [{"id": file_id, "webViewLink": f"https://drive.example/{file_id}/view"}
+                         for file_id, f in self.files_store.items()
+                         if key is None or f["appProperties"].get(key) == value]
+            return {"files": files}
+        return _Request(run)
+
+
+class _FakePermissions:
+    def __init__(self, drive):
+        self.drive = drive
+
+    def create(self, fileId=None, body=None, **kwargs):
+        def run():
+            self.drive._sleep()
+            self.drive.permissions_store[fileId] = body
+            return {"id": "anyone"}
+        return _Request(run)
+
+
+class FakeCredentials:
+    token = "fake"
+    valid = True
+
+
+def make_fake_clients(header=None, sheet_latency=0.0, drive_latency=0.0):
+    """GoogleClients wired to in-memory fakes; the fakes are reachable as .sheet / .drive"""
+    worksheet = FakeWorksheet(header, latency=sheet_latency)
+    drive = FakeDriveService(latency=drive_latency)
+    return GoogleClients(
+        service_account_info={},
+        credentials_factory=lambda info: FakeCredentials(),
+        sheets_factory=lambda creds: FakeSheetsClient(worksheet),
+        drive_factory=lambda creds: drive,
+    )
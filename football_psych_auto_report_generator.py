@@ -1,16 +1,21 @@
 import streamlit as st
-import pandas as pd, os, datetime, random, string
-from io import BytesIO
-from reportlab.lib.pagesizes import A4
-from reportlab.pdfgen import canvas
-from scoring import compute_domain_means, compute_im_score, inconsistency_index, max_longstring
-import gspread
-from google.oauth2.service_account import Credentials
-try:
-    from googleapiclient.discovery import build
-    from googleapiclient.http import MediaIoBaseUpload
-except ImportError:
-    st.error("googleapiclient not installed. Please add 'google-api-python-client==2.108.0' to requirements.txt")
+import pandas as pd, os, datetime, hashlib, threading
+from scoring import ScoringPlan, score_one, CORE_SCALES, BANDS, HIGH_CUTOFF, MODERATE_CUTOFF
+from report import warm_up, render_report
+from results import build_result_row, generate_player_id, RESULT_COLUMNS, SUMMARY_COLUMNS
+from google_clients import clients_from_env
+from pipeline import ResultPipeline
+from outbox import PdfOutbox, DEFAULT_OUTBOX_PATH
+from storage import SQLiteResultStore, sheet_records, store_from_env
+from dataset import CachedDataset
+from export import EXPORT_FORMATS, export_frame
+from paper_import import IMPORT_TYPES, prepare, read_sheet
+from analytics import CohortAnalytics, GROUP_COLUMNS, group_keys
+from norms import NormTables, age_group, ordinal
+from history import player_key, trajectory, session_deltas
+from questionnaire import (QUESTIONS, RESPONSE_LABELS, LABEL_TO_VALUE, TOTAL_QPAGES, page_items,
+                           new_answers, answers_to_responses)
+import metrics
 
 # ======= PAGE CONFIG & STYLING =======
 BASE = os.path.dirname(__file__)
@@ -30,216 +35,90 @@ st.set_page_config(
     initial_sidebar_state="collapsed"
 )
 
-# Additional theme forcing
-try:
-    st._config.set_option('theme.base', 'dark')
-    st._config.set_option('theme.primaryColor', primary_green)
-    st._config.set_option('theme.backgroundColor', '#111111')
-    st._config.set_option('theme.secondaryBackgroundColor', '#1E1E1E')
-    st._config.set_option('theme.textColor', '#FFFFFF')
-except:
-    pass
+# Additional theme forcing (config options are process-wide, so once per process)
+@st.cache_resource
+def apply_theme():
+    try:
+        st._config.set_option('theme.base', 'dark')
+        st._config.set_option('theme.primaryColor', primary_green)
+        st._config.set_option('theme.backgroundColor', '#111111')
+        st._config.set_option('theme.secondaryBackgroundColor', '#1E1E1E')
+        st._config.set_option('theme.textColor', '#FFFFFF')
+    except:
+        pass
+
+apply_theme()
 
 # ======= GOOGLE SHEETS HELPER =======
-def log_to_gsheet(player_info, domain_scores, validity_scores, responses, pdf_link=""):
-    """Append one assessment result to Google Sheets with PDF link"""
-    try:
-        SCOPES = [
-            "https://www.googleapis.com/auth/spreadsheets",
-            "https://www.googleapis.com/auth/drive"
-        ]
-        creds = Credentials.from_service_account_info(
-            st.secrets["google_service_account"],
-            scopes=SCOPES
-        )
-        client = gspread.authorize(creds)
-
-        sheet = client.open("Footpsy - Football Psychological Assessment Database").sheet1
-
-        # --- Build the row ---
-        row = [
-            datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            player_info.get("name", "N/A"),
-            player_info.get("id", "N/A"),
-            player_info.get("team", "N/A"),
-            player_info.get("position", "N/A"),
-            player_info.get("dob", "N/A"),
-            player_info.get("age", "N/A"),
-        ]
-
-        # Add domain scores
-        ordered_domains = [
-            "Resilience", "Self-Discipline", "Competitiveness",
-            "Achievement Motivation", "Focus & Concentration",
-            "Confidence", "Emotional Control", "Coachability & Adaptability",
-            "Risk-Taking", "Team Orientation", "Leadership & Influence",
-            "Aggressiveness & Bravery"
-        ]
-
-        for domain in ordered_domains:
-            val = domain_scores.get(domain, "")
-            row.append(round(val, 2) if isinstance(val, (int, float)) else "")
-
-        # Add validity & quality checks
-        row.extend([
-            validity_scores.get("IM", ""),
-            validity_scores.get("Inconsistency", ""),
-            validity_scores.get("Longstring", ""),
-            validity_scores.get("AttentionPass", "")
-        ])
-
-        # Add all individual question responses
-        for i in range(1, 67):
-            row.append(responses.get(i, ""))
-
-        # Add PDF link
-        row.append(pdf_link if pdf_link else "Not saved")
-
-        # Append the row
-        sheet.append_row(row)
-        return True
+@st.cache_resource
+def get_google_clients():
+    """Authorized Sheets/Drive clients shared by every session in this process"""
+    return clients_from_env(lambda: dict(st.secrets["google_service_account"]))
 
-    except Exception as e:
-        st.error(f"Failed to log data: {e}")
-        return False
 
+@st.cache_resource
+def get_result_store():
+    """Local results database (system of record); the Google Sheet is an async mirror.
+    FOOTPSY_STORE=sheets falls back to reading and writing the sheet directly."""
+    return store_from_env(lambda: get_google_clients().sheet)
 
-def save_pdf_to_shared_drive(pdf_data, player_name, player_id):
-    """Save PDF report to a Shared Drive"""
-    try:
-        SCOPES = [
-            "https://www.googleapis.com/auth/spreadsheets",
-            "https://www.googleapis.com/auth/drive"
-        ]
-        creds = Credentials.from_service_account_info(
-            st.secrets["google_service_account"],
-            scopes=SCOPES
-        )
-
-        # Build Drive API client
-        drive_service = build('drive', 'v3', credentials=creds)
-
-        # === REPLACE THIS WITH YOUR ACTUAL SHARED DRIVE ID ===
-        SHARED_DRIVE_ID = "0AOT9SySfSgB9Uk9PVA"  # ← Replace with your actual Shared Drive ID
-
-        # Create file metadata
-        file_metadata = {
-            'name': f"FOOTPSY_Report_{player_name}_{player_id}_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf",
-            'parents': [SHARED_DRIVE_ID]
-        }
-
-        # Create media upload
-        media = MediaIoBaseUpload(
-            pdf_data,
-            mimetype='application/pdf',
-            resumable=True
-        )
-
-        # Upload file to shared drive
-        file = drive_service.files().create(
-            body=file_metadata,
-            media_body=media,
-            supportsAllDrives=True,  # Required for shared drives
-            fields='id, webViewLink, webContentLink'
-        ).execute()
-
-        # Make the file publicly viewable
-        drive_service.permissions().create(
-            fileId=file['id'],
-            body={'type': 'anyone', 'role': 'reader'},
-            supportsAllDrives=True  # Required for shared drives
-        ).execute()
-
-        st.success("✅ Report saved!")
-        return file['webViewLink']
 
-    except Exception as e:
-        st.error(f"Failed to save PDF: {e}")
-        return None
+@st.cache_resource
+def get_admin_dataset():
+    """In-memory admin dataset, delta-synced from the result store at most every 30 s"""
+    return CachedDataset(get_result_store(), ttl=30)
+
+
+@st.cache_resource(ttl=3600)
+def get_norm_tables():
+    """Percentile norms for the results page, precomputed from the result store at most once an hour;
+    the athlete's path never loads the admin dataset"""
+    return NormTables(get_result_store().frame())
+
+
+@st.cache_resource
+def get_cohort_analytics():
+    """Team/position aggregates over the admin dataset, memoized per filter combination"""
+    return CohortAnalytics(get_admin_dataset())
+
+
+@st.cache_resource
+def get_pdf_outbox():
+    """On-disk queue for report PDFs that could not reach Google Drive yet"""
+    return PdfOutbox(lambda: get_google_clients().drive, get_result_store().set_pdf_link,
+                     os.environ.get("FOOTPSY_OUTBOX", DEFAULT_OUTBOX_PATH))
+
+
+@st.cache_resource
+def get_result_pipeline():
+    """Background upload/logging workers shared by every session in this process.
+    FOOTPSY_OFFLINE=1 (kiosk mode) queues every PDF locally and syncs in the background.
+    Each stored row marks the admin dataset stale, so the admin panel shows it on its next run."""
+    return ResultPipeline(get_google_clients, writer=get_result_store(), outbox=get_pdf_outbox(),
+                          offline=os.environ.get("FOOTPSY_OFFLINE") == "1",
+                          on_logged=get_admin_dataset().mark_stale)
 
 # ======= SETUP =======
-mapping = pd.read_csv(os.path.join(BASE, "assets", "scales_mapping.csv"))
-map_dict = {}
-for _, r in mapping.iterrows():
-    map_dict.setdefault(r['Scale'], []).append(int(r['Item']))
-
-reverse_items = [7, 14, 23, 25, 26, 30, 31, 34, 36, 37, 38, 39, 41, 44, 45, 47, 48, 49, 50, 55, 57, 61, 62, 63, 64]
-im_items = map_dict.get("Impression Management", [])
-inconsistency_pairs = [(17,64),(6,25),(22,39),(4,49)]
-
-# --- Sample Questions ---
-questions = {
-    1: "I can maintain my focus on the game for the full 90 minutes, even when we are winning comfortably.",
-    2: "I will often attempt a difficult through-pass or progressive pass, even if it might be intercepted. ",
-    3: "I am confident that I can perform well even in a high-pressure match, like a cup final or a derby.",
-    4: "I follow a strict routine for sleep, nutrition, and recovery, even on my days off.",
-    5: "I feel just as much satisfaction from providing a crucial assist as I do from scoring a goal myself.",
-    6: "I can stay calm and make rational decisions even when opponents are trying to provoke me.",
-    7: "If I get beaten in a 1v1, my confidence drops and I become hesitant and worried next time I encounter a 1v1 again.",
-    8: "I am comfortable being the one who gives instructions and organizes the team during a game.",
-    9: "I get extra motivation from playing against opponents who are considered better than me.",
-    10: "I am always willing to admit when I make a mistake.",
-    11: "I enjoy trying creative flicks and tricks during a game if I see an opportunity.",
-    12: "I am always willing to sacrifice my own positioning to cover for a teammate who has pushed forward.",
-    13: "I have a specific technique that I use to calm myself down quickly when I feel frustration building.",
-    14: "I sometimes skip the recommended cool-down or stretching after training if I'm feeling tired.",
-    15: "I rarely let the referee's decisions affect my mood or my focus on the game.",
-    16: "I set specific personal goals for myself for each season and review my progress regularly.",
-    17: "I can shake off a bad pass or a missed tackle and focus on the next play immediately.",
-    18: "This is an attention check. Please select 'Strongly Disagree'.",
-    19: "I actively seek out feedback from my coaches on how I can improve, even after a good game.",
-    20: "I will happily do the 'unseen' defensive work that might not get noticed by fans but helps the team win.",
-    21: "I have never felt jealous of a teammate's success or recognition.",
-    22: "I enjoy the challenge of learning a new playing position or tactical role.",
-    23: "I believe it's always better to keep possession with a simple pass than to risk losing the ball with an ambitious one.",
-    24: "I am always fully focused and give 100% effort in every training session, not just the ones before a big game.",
-    25: "I often react impulsively in the heat of the moment and later regret my actions.",
-    26: "I am just as satisfied with a good personal performance in a loss as I am with a win.",
-    27: "If the game is on the line, I want to be the one taking the penalty/free-kick or having the decisive moment.",
-    28: "I make a conscious effort to encourage teammates, especially when they are struggling or have made a mistake.",
-    29: "When the opponent scores, it makes me more determined to make an immediate impact to turn things around.",
-    30: "I sometimes lose track of my tactical position when I get tired in the last 15 minutes of a game.",
-    31: "I avoid high-risk actions unless the odds of success are strongly in my favor.",
-    32: "I am not intimidated by playing against opponents who are known for being physically stronger or more aggressive.",
-    33: "I constantly compare my performance and statistics to my teammates and rivals.",
-    34: "If I make an error in the first half, it's hard for me to perform well for the rest of the game.",
-    35: "The feeling of mastering a new skill is one of the most rewarding parts of football for me.",
-    36: "I get frustrated when a coach asks me to change a technique that I'm already comfortable with.",
-    37: "I sometimes doubt my abilities when my team is about to face a much stronger opponent.",
-    38: "After an opponent scores a goal, I find it difficult to regain my composure and focus.",
-    39: "I prefer to stick to a familiar game plan rather than adapt to the specific strengths of our opponent.",
-    40: "I always give 100% in every drill, regardless of how tired or unmotivated I feel.",
-    41: "If a teammate makes a mistake that costs us a goal, I struggle to hide my frustration with them.",
-    42: "I will voluntarily do extra training sessions to work on my weaknesses.",
-    43: "I have a specific routine or technique to quickly refocus my mind if it starts to wander during a match.",
-    44: "I am happy with my current ability level and don't feel a strong need to improve.",
-    45: "I believe that technical skill and intelligence are far more important in football than physical aggression.",
-    46: "Winning my individual battles on the pitch is just as important to me as the final score.",
-    47: "I tend to avoid 50/50 challenges where I might get hurt.",
-    48: "Once I've achieved a goal, I tend to relax my efforts rather than immediately set a new one.",
-    49: "During the off-season, I find it difficult to maintain the same level of fitness and discipline.",
-    50: "I am not particularly bothered by losing in training games or small-sided matches.",
-    51: "I’ve never felt frustrated with a teammate, even after a costly mistake.",
-    52: "I am always willing to put my body on the line, for example, by throwing myself to win a duel or block a shot.",
-    53: "I enjoy the physical side of football and look for opportunities to win my individual duels.",
-    54: "If the coach changes the game plan at halftime, I can quickly understand and execute the new instructions.",
-    55: "I sometimes get frustrated when a teammate doesn’t pass the ball to me when I’m in a better position.",
-    56: "I believe I have what it takes to succeed at the highest level of football.",
-    57: "If I have a run of poor form, I start to question whether I'm good enough.",
-    58: "I am driven by a need to see how good I can ultimately become.",
-    59: "When I'm on the pitch, I can easily tune out distractions like the crowd or opponents' comments.",
-    60: "To show you are paying attention, please select 'Agree' for this statement.",
-    61: "I feel uncomfortable having to give critical feedback to a teammate, even if it would help the team.",
-    62: "My primary personal goal is to be the star player of the team, even if the team doesn't win.",
-    63: "I prefer to focus solely on my own performance and let others worry about organizing the team.",
-    64: "If I make a mistake, I find it very difficult to stop thinking about it and focus on the next play.",
-    65: "I will speak up in the dressing room to address issues or to motivate the group before an important match.",
-    66: "When under pressure, I prefer to attempt a high-risk/ambitious play rather than play it safe."
-}
+@st.cache_resource
+def load_scoring_plan():
+    """Parse scales_mapping.csv once per process, shared by every session"""
+    return ScoringPlan.from_csv(os.path.join(BASE, "assets", "scales_mapping.csv"))
+
+scoring_plan = load_scoring_plan()
+
+@st.cache_resource
+def warm_report_renderer():
+    """Import ReportLab and downsample the logo once per process, in the background while the
+    first athlete answers the questions (page 1 and the admin panel never load them)"""
+    thread = threading.Thread(target=warm_up, name="footpsy-warmup", daemon=True)
+    thread.start()
+    return thread
+
 
 # ======= SESSION STATE =======
 if 'page' not in st.session_state: st.session_state.page = 1
 if 'qpage' not in st.session_state: st.session_state.qpage = 1
+if 'answers' not in st.session_state: st.session_state.answers = new_answers()
 if 'admin_authenticated' not in st.session_state: st.session_state.admin_authenticated = False
 
 # ======= PAGE 1: ATHLETE INFO =======
@@ -279,11 +158,6 @@ if st.session_state.page == 1:
             sticky_warning("⚠️ Please fill this field, put N/A if unsure.")
 
     with col2:
-        def generate_player_id():
-            rand = ''.join(random.choices(string.ascii_uppercase + string.digits, k=6))
-            now = datetime.datetime.now()
-            return f"FPY-{now.month:02d}-{now.year}-{rand}"
-
         st.session_state.player_id = st.text_input("Player ID", st.session_state.get("player_id", ""), placeholder="Auto-generated if left blank")
         st.markdown("<span style='color:gray; font-size:0.8em;'>Leave blank if unsure — ID will be generated automatically.</span>", unsafe_allow_html=True)
         if not st.session_state.player_id:
@@ -333,42 +207,31 @@ if st.session_state.page == 1:
 
 # ======= PAGES 2–7: QUESTIONS =======
 if st.session_state.page >= 2 and st.session_state.page <= 7:
+    warm_report_renderer()  # a report is coming: load the PDF libraries before page 8 needs them
     st.title("⚽ FOOTPSY — Assessment")
     st.markdown(
         "**Purpose:** Measures key psychological skills such as drive, resilience, focus, and adaptability.\n\n"
         "**Instructions:** Read each statement and select how true it is for you (1–5)."
     )
 
-    q_per_page = 11
-    total_q = len(questions)
-    total_qpages = (total_q + q_per_page - 1) // q_per_page
     qpage = st.session_state.qpage
-    start_q, end_q = (qpage - 1) * q_per_page + 1, min(qpage * q_per_page, total_q)
+    items = page_items(qpage)
+    answers = st.session_state.answers
 
-    st.subheader(f"Questions {start_q}–{end_q}  (Page {qpage}/{total_qpages})")
-
-    for i in range(start_q, end_q + 1):
-        if f"q{i}" not in st.session_state: st.session_state[f"q{i}"] = 0
+    st.subheader(f"Questions {items[0]}–{items[-1]}  (Page {qpage}/{TOTAL_QPAGES})")
 
     with st.form(key=f"form_page_{qpage}"):
         st.markdown("### Answer the following questions:")
 
-        response_labels = [
-            "Strongly Disagree",
-            "Disagree",
-            "Neutral",
-            "Agree",
-            "Strongly Agree"
-        ]
-
-        for i in range(start_q, end_q + 1):
-            existing = st.session_state.get(f"q{i}", 0)
+        chosen = {}
+        for i in items:
+            existing = answers[i - 1]
             default_idx = (existing - 1) if existing in [1, 2, 3, 4, 5] else 2
 
-            st.markdown(f"**{i}. {questions[i]}**")
-            st.radio(
+            st.markdown(f"**{i}. {QUESTIONS[i]}**")
+            chosen[i] = st.radio(
                 "Your answer:",
-                options=response_labels,
+                options=RESPONSE_LABELS,
                 key=f"form_q{i}",
                 index=default_idx,
                 horizontal=True,
@@ -388,28 +251,12 @@ if st.session_state.page >= 2 and st.session_state.page <= 7:
             st.rerun()
 
     if submitted:
-        incomplete = False
-        label_to_num = {
-            "Strongly Disagree": 1,
-            "Disagree": 2,
-            "Neutral": 3,
-            "Agree": 4,
-            "Strongly Agree": 5
-        }
-
-        for i in range(start_q, end_q + 1):
-            val = st.session_state.get(f"form_q{i}", None)
-            if val is None:
-                incomplete = True
-                break
-
-        if incomplete:
+        if any(label is None for label in chosen.values()):
             st.warning("⚠️ Please answer all questions on this page before continuing.")
         else:
-            for i in range(start_q, end_q + 1):
-                label = st.session_state.get(f"form_q{i}")
-                st.session_state[f"q{i}"] = label_to_num.get(label, 0)
-            if qpage < total_qpages:
+            for i, label in chosen.items():
+                answers[i - 1] = LABEL_TO_VALUE.get(label, 0)
+            if qpage < TOTAL_QPAGES:
                 st.session_state.qpage += 1
             else:
                 st.session_state.page = 8
@@ -418,31 +265,25 @@ if st.session_state.page >= 2 and st.session_state.page <= 7:
 # ======= PAGE 8: RESULTS =======
 if st.session_state.page == 8:
     st.title("📊 Results & Report")
-    responses = {i: st.session_state.get(f"q{i}", 0) for i in range(1, 67)}
-    domain_means = compute_domain_means(responses, map_dict, reverse_items)
-    im_avg = compute_im_score(responses, im_items, reverse_items) / len(im_items)
-    inconsistency = inconsistency_index(responses, inconsistency_pairs)
-    long_run = max_longstring(responses)
-    att_pass = (responses.get(18) == 1) and (responses.get(60) == 4)
+    responses = answers_to_responses(st.session_state.answers)
+    domain_means, validity_scores = score_one(responses, scoring_plan)
+    im_avg = validity_scores["IM"]
+    inconsistency = validity_scores["Inconsistency"]
+    long_run = validity_scores["Longstring"]
+    att_pass = validity_scores["AttentionPass"]
     adjusted = domain_means
 
     # Define core scales (12 domains)
-    core_scales = [
-        "Resilience", "Self-Discipline", "Competitiveness",
-        "Achievement Motivation", "Focus & Concentration",
-        "Confidence", "Emotional Control", "Coachability & Adaptability",
-        "Risk-Taking", "Team Orientation", "Leadership & Influence",
-        "Aggressiveness & Bravery"
-    ]
+    core_scales = CORE_SCALES
 
     st.subheader("Psychological Domain Scores")
 
 
     # Function to determine color based on score
     def get_score_color(score):
-        if score >= 4.2:
+        if score >= HIGH_CUTOFF:
             return "#4CAF50"  # Green for High
-        elif score >= 3.0:
+        elif score >= MODERATE_CUTOFF:
             return "#FFA500"  # Orange/Yellow for Moderate
         else:
             return "#FF4B4B"  # Red for Low
@@ -478,10 +319,10 @@ if st.session_state.page == 8:
                     st.markdown(create_progress_bar(score), unsafe_allow_html=True)
 
                 with text_col:
-                    if score >= 4.2:
+                    if score >= HIGH_CUTOFF:
                         st.markdown("<span style='color: #4CAF50; font-weight: bold;'>High</span>",
                                     unsafe_allow_html=True)
-                    elif score >= 3.0:
+                    elif score >= MODERATE_CUTOFF:
                         st.markdown("<span style='color: #FFA500; font-weight: bold;'>Moderate</span>",
                                     unsafe_allow_html=True)
                     else:
@@ -505,413 +346,73 @@ if st.session_state.page == 8:
         "age": st.session_state.get("player_age", "N/A"),
     }
 
-    validity_scores = {
-        "IM": im_avg,
-        "Inconsistency": inconsistency,
-        "Longstring": long_run,
-        "AttentionPass": att_pass
-    }
-
-    # === Generate PDF Report ===
-    buffer = BytesIO()
-    c = canvas.Canvas(buffer, pagesize=A4)
-    width, height = A4
-
-    # === PDF STYLING CONSTANTS ===
-    LEFT_MARGIN = 40
-    RIGHT_MARGIN = width - 40
-    LINE_HEIGHT = 14
-    SECTION_SPACING = 20
-
-    # Progress bar dimensions for PDF
-    PROGRESS_BAR_WIDTH = 200
-    PROGRESS_BAR_HEIGHT = 12
-
-
-    def draw_header():
-        """Draw the header with logo and title"""
-        logo_path = os.path.join(BASE, "assets", "footpsylogo.png")
-        if os.path.exists(logo_path):
-            c.drawImage(logo_path, LEFT_MARGIN, height - 110, width=120, preserveAspectRatio=True)
-        c.setFont("Helvetica-Bold", 16)
-        c.drawString(180, height - 60, "FOOTPSY — Individual Psychological Report")
-        c.setFont("Helvetica", 10)
-        now = datetime.datetime.now().strftime("%Y-%m-%d %H:%M")
-        c.drawString(LEFT_MARGIN, height - 85, f"Report Generated: {now}")
-
-
-    player_name = st.session_state.get("player_name", "N/A")
-    player_id = st.session_state.get("player_id", "N/A")
-    team_name = st.session_state.get("team_name", "N/A")
-    player_position = st.session_state.get("player_position", "N/A")
-    dob = st.session_state.get("dob", None)
-    player_age = (datetime.date.today().year - dob.year) if dob else "N/A"
-
-
-    def draw_player_info(y_position):
-        """Draw player information section"""
-        c.setFont("Helvetica-Bold", 12)
-        c.drawString(LEFT_MARGIN, y_position, "Player Information")
-        y_position -= LINE_HEIGHT
-
-        c.setFont("Helvetica", 10)
-        info_lines = [
-            f"Name: {player_name}",
-            f"ID: {player_id}",
-            f"Team: {team_name}",
-            f"Position: {player_position}",
-            f"Date of Birth: {dob.strftime('%d/%m/%Y') if dob else 'N/A'}",
-            f"Age: {player_age}"
-        ]
-
-        for line in info_lines:
-            c.drawString(LEFT_MARGIN, y_position, line)
-            y_position -= LINE_HEIGHT
-
-        return y_position - 10
-
-
-    def draw_progress_bar(c, x, y, score, width=PROGRESS_BAR_WIDTH, height=PROGRESS_BAR_HEIGHT):
-        """Draw a progress bar for PDF"""
-        # Background
-        c.setFillColorRGB(0.94, 0.94, 0.94)  # Light gray
-        c.rect(x, y, width, height, fill=1, stroke=0)
-
-        # Determine color
-        if score >= 4.2:
-            color = (0.3, 0.69, 0.3)  # Green
-        elif score >= 3.0:
-            color = (1.0, 0.65, 0.0)  # Orange
-        else:
-            color = (1.0, 0.29, 0.29)  # Red
-
-        # Progress fill
-        progress_width = (score / 5.0) * width
-        c.setFillColorRGB(*color)
-        c.rect(x, y, progress_width, height, fill=1, stroke=0)
-
-        # Border
-        c.setStrokeColorRGB(0.7, 0.7, 0.7)
-        c.rect(x, y, width, height, fill=0, stroke=1)
-
-        # Score text
-        c.setFillColorRGB(0, 0, 0)
-        c.setFont("Helvetica-Bold", 8)
-        text = f"{score:.2f}/5.00"
-        text_width = c.stringWidth(text, "Helvetica-Bold", 8)
-        c.drawString(x + (width - text_width) / 2, y + 2, text)
-
-
-    def draw_domain_scores(y_position):
-        """Draw domain scores section with progress bars"""
-        c.setFont("Helvetica-Bold", 12)
-        c.drawString(LEFT_MARGIN, y_position, "Psychological Domain Scores")
-        y_position -= LINE_HEIGHT + 5
-
-        c.setFont("Helvetica", 10)
-
-        # Draw in two columns
-        col_width = (RIGHT_MARGIN - LEFT_MARGIN) / 2
-        column_gap = 20
-
-        for i, scale in enumerate(core_scales):
-            score = domain_means.get(scale, 0)
-
-            # Determine column position
-            if i % 2 == 0:
-                col_x = LEFT_MARGIN
-                item_y = y_position - (i // 2) * 35
-            else:
-                col_x = LEFT_MARGIN + col_width + column_gap
-                item_y = y_position - ((i - 1) // 2) * 35
-
-            # Scale name
-            c.setFont("Helvetica-Bold", 9)
-            c.drawString(col_x, item_y, scale)
-
-            # Progress bar
-            draw_progress_bar(c, col_x, item_y - 15, score)
-
-            # Interpretation text
-            c.setFont("Helvetica", 8)
-            if score >= 4.2:
-                interpretation = "High"
-                c.setFillColorRGB(0.3, 0.69, 0.3)  # Green
-            elif score >= 3.0:
-                interpretation = "Moderate"
-                c.setFillColorRGB(1.0, 0.65, 0.0)  # Orange
-            else:
-                interpretation = "Development Area"
-                c.setFillColorRGB(1.0, 0.29, 0.29)  # Red
-
-            c.drawString(col_x + PROGRESS_BAR_WIDTH + 5, item_y - 10, interpretation)
-            c.setFillColorRGB(0, 0, 0)  # Reset to black
-
-        # Calculate new y position (6 rows of content)
-        return y_position - (len(core_scales) // 2 * 35) - 20
-
-
-    def draw_validity_scores(y_position):
-        """Draw validity and quality checks"""
-        c.setFont("Helvetica-Bold", 12)
-        c.drawString(LEFT_MARGIN, y_position, "Validity & Quality Checks")
-        y_position -= LINE_HEIGHT
-
-        c.setFont("Helvetica", 10)
-        validity_lines = [
-            f"Impression Management: {im_avg:.2f}",
-            f"Inconsistency Index: {inconsistency}",
-            f"Longest Straight Run: {long_run}",
-            f"Attention Check: {'PASS' if att_pass else 'FAIL'}"
-        ]
-
-        for line in validity_lines:
-            c.drawString(LEFT_MARGIN, y_position, line)
-            y_position -= LINE_HEIGHT
-
-        return y_position - 10
-
-
-    def draw_question_responses(y_position):
-        """Draw all question responses with abbreviated question text in 2 columns"""
-        c.setFont("Helvetica-Bold", 12)
-        c.drawString(LEFT_MARGIN, y_position, "Complete Question Responses")
-        y_position -= LINE_HEIGHT
-
-        # Define response labels for display
-        response_labels = {
-            1: "SD",  # Strongly Disagree
-            2: "D",  # Disagree
-            3: "N",  # Neutral
-            4: "A",  # Agree
-            5: "SA"  # Strongly Agree
-        }
-
-        # Setup two columns
-        col_width = (RIGHT_MARGIN - LEFT_MARGIN) / 2
-        column_gap = 20
-        current_col = 0
-        start_x = LEFT_MARGIN
-        current_y = y_position
-
-        # Column headers
-        c.setFont("Helvetica-Bold", 9)
-        c.drawString(start_x, current_y, "Question & Response")
-        c.drawString(start_x + col_width + column_gap, current_y, "Question & Response")
-        current_y -= LINE_HEIGHT
-
-        c.setFont("Helvetica", 8)
-
-        # Create abbreviated question texts
-        abbreviated_questions = {
-            1: "Maintain focus for full 90 minutes",
-            2: "Attempt difficult progressive/through-passes",
-            3: "Confident in high-pressure matches",
-            4: "Strict sleep/nutrition/recovery routine",
-            5: "Satisfaction from assists equals goals",
-            6: "Stay calm when provoked",
-            7: "Confidence drops after beaten in 1v1",
-            8: "Comfortable giving instructions",
-            9: "Motivated vs better opponents",
-            10: "Willing to admit mistakes",
-            11: "Enjoy creative flicks/tricks",
-            12: "Sacrifice positioning to cover teammates",
-            13: "Technique to calm frustration",
-            14: "Skip cool-down if tired",
-            15: "Referee decisions don't affect focus",
-            16: "Set and review seasonal goals",
-            17: "Shake off bad passes immediately",
-            18: "Attention check: select Strongly Disagree",
-            19: "Seek feedback after good games",
-            20: "Do unseen defensive work",
-            21: "Never jealous of teammates",
-            22: "Enjoy learning new positions",
-            23: "Prefer safe passes over risky ones",
-            24: "100% effort in all training",
-            25: "React impulsively and regret",
-            26: "Satisfied with good performance in loss",
-            27: "Want decisive moments",
-            28: "Encourage struggling teammates",
-            29: "Determined after opponent scores",
-            30: "Lose tactical position when tired",
-            31: "Avoid high-risk actions",
-            32: "Not intimidated by physical opponents",
-            33: "Compare stats with teammates",
-            34: "Errors affect rest of game",
-            35: "Reward from mastering new skills",
-            36: "Frustrated by technique changes",
-            37: "Doubt abilities vs stronger teams",
-            38: "Difficulty refocusing after conceding",
-            39: "Prefer familiar game plans",
-            40: "100% in all drills",
-            41: "Struggle to hide frustration with teammates",
-            42: "Extra training for weaknesses",
-            43: "Routine to refocus during matches",
-            44: "Happy with current ability",
-            45: "Skill over physical aggression",
-            46: "Individual battles important",
-            47: "Avoid 50/50 challenges",
-            48: "Relax after achieving goals",
-            49: "Off-season fitness difficult",
-            50: "Not bothered by training losses",
-            51: "Never frustrated with teammates",
-            52: "Willing to put body on line",
-            53: "Enjoy physical duels",
-            54: "Quickly adapt to halftime changes",
-            55: "Frustrated when not passed to",
-            56: "Believe in highest level success",
-            57: "Question ability after poor form",
-            58: "Driven to maximize potential",
-            59: "Tune out crowd/distractions",
-            60: "Attention check: select Agree",
-            61: "Uncomfortable giving critical feedback",
-            62: "Want to be star player",
-            63: "Focus on own performance only",
-            64: "Difficulty moving past mistakes",
-            65: "Speak up in dressing room",
-            66: "Prefer high-risk plays under pressure"
-        }
-
-        # Draw all questions in 2 columns
-        for q_num in range(1, 67):
-            response_num = responses.get(q_num, 0)
-            response_text = response_labels.get(response_num, "NR")
-            question_abbr = abbreviated_questions.get(q_num, f"Q{q_num}")
-
-            # Calculate position
-            if current_col == 0:
-                col_x = start_x
-            else:
-                col_x = start_x + col_width + column_gap
-
-            # Draw the line
-            line_text = f"Q{q_num:02d}: {question_abbr} [{response_text}]"
-            c.drawString(col_x, current_y, line_text)
-
-            # Move to next row/column
-            current_col += 1
-            if current_col >= 2:
-                current_col = 0
-                current_y -= LINE_HEIGHT
-
-                # Check if we need a new page
-                if current_y < 100:
-                    c.showPage()
-                    current_y = height - 50
-                    c.setFont("Helvetica-Bold", 9)
-                    c.drawString(start_x, current_y, "Question & Response")
-                    c.drawString(start_x + col_width + column_gap, current_y, "Question & Response")
-                    current_y -= LINE_HEIGHT
-                    c.setFont("Helvetica", 8)
-
-        # Add response key
-        current_y -= 10
-        c.setFont("Helvetica-Bold", 8)
-        c.drawString(LEFT_MARGIN, current_y,
-                     "Response Key: SD=Strongly Disagree, D=Disagree, N=Neutral, A=Agree, SA=Strongly Agree")
-        current_y -= LINE_HEIGHT
-
-        return current_y
-
-
-    def draw_recommendations(y_position):
-        """Draw actionable recommendations"""
-        c.setFont("Helvetica-Bold", 12)
-        c.drawString(LEFT_MARGIN, y_position, "Actionable Recommendations")
-        y_position -= LINE_HEIGHT
-
-        c.setFont("Helvetica", 10)
-
-        # Generate personalized recommendations based on scores
-        personalized_recos = []
-
-        # Generate recommendations for each core scale
+    # === Percentiles against stored results ===
+    st.markdown("**Compared with Other Players**")
+    norm_choice = st.radio("Norm group", ["All players", "Same position", "Same age group"], horizontal=True)
+    norm_group = {
+        "Same position": ("Position", player_info["position"]),
+        "Same age group": ("Age group", age_group(player_info["age"])),
+    }.get(norm_choice, (None, None))
+    try:
+        norms = get_norm_tables()
+    except Exception as e:
+        norms = None
+        st.warning(f"⚠️ Norms unavailable: {e}")
+    if norms is not None:
+        norm_rows = []
         for scale in core_scales:
-            score = domain_means.get(scale, 0)
-            if score < 3.0:
-                personalized_recos.append(f"• Develop strategies to improve {scale.lower()}")
-            elif score > 4.0:
-                personalized_recos.append(f"• Leverage strong {scale.lower()} in team leadership")
-
-        if not personalized_recos:
-            personalized_recos = [
-                "• Continue current development path with focus on maintaining strengths",
-                "• Set specific performance targets for each psychological domain",
-                "• Regular self-reflection on mental performance after each game",
-                "• Seek regular feedback from coaches on psychological development"
-            ]
-
-        # Draw recommendations
-        for reco in personalized_recos:
-            if y_position < 100:  # Start new page if needed
-                c.showPage()
-                y_position = height - 100
-                c.setFont("Helvetica", 10)
-            c.drawString(LEFT_MARGIN, y_position, reco)
-            y_position -= LINE_HEIGHT
-
-        return y_position
-
-
-    # === BUILD THE PDF ===
-    current_y = height - 50
-
-    # Header
-    draw_header()
-    current_y = height - 120
-
-    # Player Information
-    current_y = draw_player_info(current_y)
-
-    # Domain Scores with Progress Bars
-    current_y = draw_domain_scores(current_y)
-
-    # Validity Scores
-    current_y = draw_validity_scores(current_y)
-
-    # Question Responses (start new page if needed)
-    if current_y < 200:
-        c.showPage()
-        current_y = height - 50
-
-    current_y = draw_question_responses(current_y)
-
-    # Recommendations (start new page if needed)
-    if current_y < 150:
-        c.showPage()
-        current_y = height - 50
-
-    current_y = draw_recommendations(current_y)
-
-    # Footer
-    c.setFont("Helvetica-Oblique", 8)
-    c.drawString(LEFT_MARGIN, 30, "Confidential Psychological Assessment - For Professional Use Only")
-    c.drawString(LEFT_MARGIN, 20, "FOOTPSY Football Psychological Assessment System")
-
-    c.save()
-    buffer.seek(0)
-
-    # Make a copy of the PDF data for saving
-    pdf_data = BytesIO(buffer.getvalue())
-    pdf_data.seek(0)
-
-    # === Log results to Google Sheets ===
-    if "logged" not in st.session_state:
-        # First, save PDF to shared drive
-        pdf_link = save_pdf_to_shared_drive(pdf_data, player_name, player_id)
-
-        # Then log all data including PDF link
-        success = log_to_gsheet(player_info, adjusted, validity_scores, responses, pdf_link)
-
-        if success:
+            found = norms.percentile(scale, domain_means.get(scale, 0), *norm_group)
+            if found:
+                pct, label, n = found
+                norm_rows.append({"Domain": scale, "Score": round(domain_means.get(scale, 0), 2),
+                                  "Percentile": ordinal(pct), "Compared with": f"{label} (n={n})"})
+        if norm_rows:
+            st.dataframe(pd.DataFrame(norm_rows), hide_index=True)
+        else:
+            st.caption("No stored results to compare with yet.")
+
+    # === BUILD THE PDF (once per completed assessment) ===
+    # Reruns (widget clicks, download, restart) reuse the cached bytes
+    pdf_key = hashlib.sha256(repr((sorted(responses.items()), sorted(player_info.items()))).encode()).hexdigest()
+    if st.session_state.get("pdf_key") != pdf_key:
+        st.session_state.pdf_bytes = render_report(player_info, domain_means, validity_scores, responses)
+        st.session_state.pdf_key = pdf_key
+
+    player_name = player_info["name"]
+    player_id = player_info["id"]
+
+    # === Upload PDF + log results in the background ===
+    if "submission" not in st.session_state:
+        row = build_result_row(player_info, adjusted, validity_scores, responses)
+        st.session_state.submission = get_result_pipeline().submit(
+            row, st.session_state.pdf_bytes, player_name, player_id)
+
+    # Poll while the upload is in flight; a full rerun once it lands stops the timer
+    status_poll = None if st.session_state.submission.done else 2
+
+    @st.fragment(run_every=status_poll)
+    def show_submission_status():
+        submission = st.session_state.submission
+        if not submission.done:
+            st.info("⏳ Saving your report in the background...")
+            return
+        if status_poll:
+            st.rerun()
+        for error in submission.errors:
+            st.error(error)
+        if submission.pdf_link:
+            st.success("✅ Report saved!")
+        elif submission.pdf_queued:
+            st.info("📴 Report saved on this device. It will be uploaded to Google Drive "
+                    "automatically once the connection is back.")
+        if submission.logged:
             st.success("✅ Assessment completed!")
+        # Show PDF link if available
+        if submission.pdf_link:
+            st.markdown(f"**🌐 Online Report Link:** [View Permanent Online Copy]({submission.pdf_link})")
+            st.markdown("*This link will always be accessible*")
 
-        st.session_state.logged = True
-
-    # Show PDF link if available
-    if hasattr(st.session_state, 'pdf_link'):
-        st.markdown(f"**🌐 Online Report Link:** [View Permanent Online Copy]({st.session_state.pdf_link})")
-        st.markdown("*This link will always be accessible*")
+    show_submission_status()
 
     # === Do another test button ===
     restart = st.button("🏠 Do another test")
@@ -926,7 +427,7 @@ if st.session_state.page == 8:
     # === Download button ===
     st.download_button(
         label="📄 Download PDF Report",
-        data=buffer,
+        data=st.session_state.pdf_bytes,
         file_name=f"FOOTPSY_Report_{player_name}.pdf",
         mime="application/pdf"
     )
@@ -949,54 +450,182 @@ if st.session_state.page == 9:
         st.session_state.page = 1
         st.rerun()
 
-    # Rest of your admin panel code remains the same...
     try:
-        SCOPES = [
-            "https://www.googleapis.com/auth/spreadsheets",
-            "https://www.googleapis.com/auth/drive"
-        ]
-        creds = Credentials.from_service_account_info(
-            st.secrets["google_service_account"],
-            scopes=SCOPES
-        )
-        client = gspread.authorize(creds)
-
-        # Access the spreadsheet
-        sheet = client.open("Footpsy - Football Psychological Assessment Database").sheet1
-
-        # Get all records
-        records = sheet.get_all_records()
-
-        if records:
-            st.subheader(f"Total Assessments: {len(records)}")
-
-            # Create a DataFrame for display
-            df = pd.DataFrame(records)
-
-            # Search and filter
-            col1, col2 = st.columns(2)
-            with col1:
-                search_name = st.text_input("Search by Player Name")
-            with col2:
-                search_team = st.text_input("Search by Team")
-
-            # Filter data
-            if search_name:
-                df = df[df['Player Name'].str.contains(search_name, case=False, na=False)]
-            if search_team:
-                df = df[df['Team Name'].str.contains(search_team, case=False, na=False)]
-
-            # Display results
-            st.dataframe(df)
-
-            # Option to download all data
-            csv = df.to_csv(index=False)
-            st.download_button(
-                label="📥 Download All Data as CSV",
-                data=csv,
-                file_name="footpsy_all_assessments.csv",
-                mime="text/csv"
-            )
+        store = get_result_store()
+        dataset = get_admin_dataset()
+        force_refresh = st.button("🔄 Refresh data")
+
+        # Offline queue: PDFs and sheet rows that have not reached Google yet
+        outbox = get_pdf_outbox()
+        mirror = getattr(store, "mirror", None)
+        waiting_pdfs = outbox.pending_count()
+        waiting_rows = mirror.pending_count() if mirror is not None else 0
+        if waiting_pdfs or waiting_rows:
+            st.warning(f"📴 Waiting to sync: {waiting_pdfs} report PDF(s) to Google Drive, "
+                       f"{waiting_rows} row(s) to Google Sheets")
+            if st.button("📤 Sync now"):
+                try:
+                    uploaded = outbox.drain()
+                    flushed = mirror.flush() if mirror is not None else 0
+                    st.success(f"✅ Uploaded {uploaded} PDF(s), synced {flushed} row(s)")
+                    force_refresh = True
+                except Exception as e:
+                    st.error(f"Still offline: {e}")
+
+        # Backfill the local database with sheet results it lacks (first deploy, wiped
+        # disk); results already stored are skipped, so this is safe to run any time
+        if isinstance(store, SQLiteResultStore):
+            if st.button("⬇️ Import missing results from Google Sheets"):
+                try:
+                    imported = store.import_records(sheet_records(get_google_clients().sheet))
+                    st.success(f"✅ Imported {imported} result(s) missing from the local database")
+                    force_refresh = True
+                except Exception as e:
+                    st.error(f"❌ Could not read Google Sheets: {e}")
+
+        # Paper assessments keyed into a spreadsheet: scored and stored as one batch
+        with st.expander("📄 Import paper assessments"):
+            upload = st.file_uploader("Sheet with Q1–Q66 (answers 1–5) and Player Name, Player ID, Team Name, "
+                                      "Position, Date of Birth columns", type=IMPORT_TYPES)
+            if upload is not None:
+                upload_key = hashlib.sha256(upload.getvalue()).hexdigest()
+                # parsed and scored once per uploaded file, not again on every rerun
+                cached = st.session_state.get("paper_import")
+                if cached is None or cached[0] != upload_key:
+                    try:
+                        cached = (upload_key, prepare(read_sheet(upload, upload.name), scoring_plan), None)
+                    except ValueError as e:
+                        cached = (upload_key, None, str(e))
+                    st.session_state.paper_import = cached
+                _, batch, problem = cached
+                if problem:
+                    st.error(f"❌ Cannot import {upload.name}: {problem}")
+                if batch is not None:
+                    st.write(f"{len(batch.rows)} assessment(s) ready, {len(batch.errors)} rejected, "
+                             f"{len(batch.attention_failures)} failed the attention check")
+                    if batch.errors:
+                        st.dataframe(pd.DataFrame(batch.errors, columns=["Line", "Problem"]), hide_index=True)
+                    if batch.attention_failures:
+                        st.warning("⚠️ Attention check failed (items 18 and 60) — imported, but review before use")
+                        st.dataframe(pd.DataFrame(batch.attention_failures, columns=["Line", "Player Name", "Player ID"]),
+                                     hide_index=True)
+                    if upload_key in st.session_state.setdefault("imported_uploads", set()):
+                        st.info("This file has already been imported.")
+                    elif batch.rows and st.button(f"⬆️ Import {len(batch.rows)} assessment(s)"):
+                        store.append_many(batch.rows)
+                        st.session_state.imported_uploads.add(upload_key)
+                        st.success(f"✅ Imported {len(batch.rows)} assessment(s)")
+                        force_refresh = True
+
+        # Cached frame; only rows added since the last sync are fetched
+        df = dataset.frame(force=force_refresh)
+
+        # Live per-stage latencies for this process (FOOTPSY_METRICS=1)
+        if metrics.ENABLED:
+            with st.expander("⏱ Stage timings"):
+                snapshot = metrics.REGISTRY.snapshot()
+                if snapshot["stages"]:
+                    st.dataframe(pd.DataFrame(snapshot["stages"]).T.drop(columns="buckets"))
+                st.write(snapshot["counters"])
+
+        if len(df):
+            st.subheader(f"Total Assessments: {len(df)}")
+
+            admin_view = st.radio("View", ["📋 Results", "📈 Team Analytics", "🧭 Player History"], horizontal=True)
+
+            if admin_view == "📋 Results":
+                # Search and filter
+                col1, col2, col3 = st.columns(3)
+                with col1:
+                    search_name = st.text_input("Search by Player Name")
+                with col2:
+                    search_id = st.text_input("Search by Player ID")
+                with col3:
+                    search_team = st.text_input("Search by Team")
+
+                # Filter data through the prebuilt index (case-insensitive substring match)
+                matches = dataset.search_index().search(within=len(df), **{
+                    "Player Name": search_name, "Player ID": search_id, "Team Name": search_team})
+                if matches is not None:
+                    df = df.iloc[matches]
+
+                # Display results: one page at a time, summary columns unless raw items are requested
+                page_col, size_col, raw_col = st.columns([1, 1, 2])
+                with size_col:
+                    page_size = st.selectbox("Rows per page", [25, 50, 100, 250], index=1)
+                total_pages = max(1, -(-len(df) // page_size))
+                with page_col:
+                    page_no = st.number_input(f"Page (of {total_pages})", min_value=1, max_value=total_pages, value=1)
+                with raw_col:
+                    show_raw = st.checkbox("Show raw item responses (Q1–Q66)")
+
+                columns = [c for c in (RESULT_COLUMNS if show_raw else SUMMARY_COLUMNS) if c in df.columns]
+                start = (page_no - 1) * page_size
+                st.caption(f"Showing {min(start + 1, len(df))}–{min(start + page_size, len(df))} of {len(df)} matching assessments")
+                st.dataframe(df.iloc[start:start + page_size][columns])
+
+                # Option to download all data (built only when the button is clicked)
+                export_fmt = st.selectbox("Export format", list(EXPORT_FORMATS))
+                extension, mime = EXPORT_FORMATS[export_fmt]
+                export_df = df
+                st.download_button(
+                    label=f"📥 Download All Data as {export_fmt}",
+                    data=lambda: export_frame(export_df, export_fmt),
+                    file_name=f"footpsy_all_assessments.{extension}",
+                    mime=mime,
+                    on_click="ignore"
+                )
+            elif admin_view == "📈 Team Analytics":
+                # Cohort view: grouped aggregations over the cached dataset, memoized per filter combination
+                f1, f2, f3 = st.columns(3)
+                with f1:
+                    group_label = st.selectbox("Group by", list(GROUP_COLUMNS))
+                with f2:
+                    team_filter = st.multiselect("Teams", sorted(group_keys(df["Team Name"]).unique()))
+                with f3:
+                    position_filter = st.multiselect("Positions", sorted(group_keys(df["Position"]).unique()))
+                tables = get_cohort_analytics().tables(GROUP_COLUMNS[group_label], team_filter, position_filter)
+
+                st.markdown("**Domain means**")
+                st.dataframe(tables["means"])
+
+                domain = st.selectbox("Domain", CORE_SCALES)
+                pct_col, band_col = st.columns(2)
+                with pct_col:
+                    st.markdown(f"**{domain} — percentiles**")
+                    st.dataframe(tables["percentiles"][domain].unstack("Percentile"))
+                with band_col:
+                    st.markdown(f"**{domain} — score bands**")
+                    st.dataframe(tables["bands"][domain].unstack("Band")[BANDS])
+
+                st.markdown("**Validity & Quality Checks**")
+                st.dataframe(tables["validity"])
+            else:
+                # One player's sessions over time, looked up through the per-player index
+                search_player = st.text_input("Find player by name or ID")
+                players = dataset.player_index()
+                index = dataset.search_index()
+                by_name = index.search(within=len(df), **{"Player Name": search_player})
+                if by_name is None:
+                    player_ids = players.player_ids()
+                else:
+                    by_id = index.search(within=len(df), **{"Player ID": search_player})
+                    matched = df["Player ID"].iloc[sorted(set(by_name) | set(by_id))]
+                    player_ids = sorted({player_key(pid) for pid in matched.fillna("")})
+                player_id = st.selectbox("Player", player_ids,
+                                         format_func=lambda pid: f"{pid} — {players.names.get(pid, '')}")
+
+                sessions = players.sessions(df, player_id) if player_id is not None else None
+                if sessions is not None and len(sessions):
+                    scores = trajectory(sessions)
+                    st.subheader(f"{sessions['Player Name'].iloc[-1]} — {len(sessions)} session(s)")
+                    st.line_chart(scores)
+                    if len(scores) > 1:
+                        st.markdown("**Change since previous session**")
+                        st.dataframe(session_deltas(scores))
+                        st.markdown("**Change since first session**")
+                        st.dataframe((scores.iloc[-1] - scores.iloc[0]).round(2).rename("Δ").to_frame().T)
+                    st.dataframe(sessions[[c for c in SUMMARY_COLUMNS if c in sessions.columns]])
         else:
             st.info("No assessment data found.")
 
@@ -0,0 +1,112 @@
+import os, threading
+
+SCOPES = [
+    "https://www.googleapis.com/auth/spreadsheets",
+    "https://www.googleapis.com/auth/drive"
+]
+SHEET_NAME = "Footpsy - Football Psychological Assessment Database"
+SECRETS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".streamlit", "secrets.toml")
+
+
+# The Google libraries are imported on first use: page 1 never needs them and
+# they are a large share of a cold start.
+
+def service_account_credentials(info):
+    from google.oauth2.service_account import Credentials
+    return Credentials.from_service_account_info(info, scopes=SCOPES)
+
+
+def authorize_sheets(creds):
+    import gspread
+    return gspread.authorize(creds)
+
+
+def build_drive_service(creds):
+    """Drive v3 service whose requests each get their own authorized http (httplib2 is not thread-safe)"""
+    import google_auth_httplib2, httplib2
+    from googleapiclient.discovery import build
+    from googleapiclient.http import HttpRequest
+
+    def request_builder(http, *args, **kwargs):
+        return HttpRequest(google_auth_httplib2.AuthorizedHttp(creds, http=httplib2.Http()), *args, **kwargs)
+
+    # static_discovery uses the discovery document bundled with the library: no fetch, parsed once here
+    return build('drive', 'v3', credentials=creds, requestBuilder=request_builder,
+                 static_discovery=True, cache_discovery=False)
+
+
+class GoogleClients:
+    """One authorized gspread client, worksheet handle and Drive service per process.
+
+    Factories are injectable so a local fake (see fake_google.py) can stand in
+    for the real APIs.
+    """
+
+    def __init__(self, service_account_info=None, credentials_factory=None, sheets_factory=None,
+                 drive_factory=None, sheet_name=SHEET_NAME):
+        self.service_account_info = service_account_info
+        self.credentials_factory = credentials_factory or service_account_credentials
+        self.sheets_factory = sheets_factory or authorize_sheets
+        self.drive_factory = drive_factory or build_drive_service
+        self.sheet_name = sheet_name
+        self._lock = threading.RLock()
+        self.reset()
+
+    def reset(self):
+        """Drop every cached handle; the next call rebuilds them (e.g. after revoked credentials)"""
+        with self._lock:
+            self._creds = None
+            self._client = None
+            self._sheet = None
+            self._drive = None
+
+    @property
+    def credentials(self):
+        with self._lock:
+            if self._creds is None:
+                self._creds = self.credentials_factory(self.service_account_info)
+            # gspread and the Drive http refresh on 401 too; refreshing here avoids the failed round-trip
+            if getattr(self._creds, "token", None) and not getattr(self._creds, "valid", True):
+                from google.auth.transport.requests import Request
+                self._creds.refresh(Request())
+            return self._creds
+
+    @property
+    def client(self):
+        with self._lock:
+            if self._client is None:
+                self._client = self.sheets_factory(self.credentials)
+            return self._client
+
+    @property
+    def sheet(self):
+        with self._lock:
+            if self._sheet is None:
+                self._sheet = self.client.open(self.sheet_name).sheet1
+            return self._sheet
+
+    @property
+    def drive(self):
+        with self._lock:
+            if self._drive is None:
+                self._drive = self.drive_factory(self.credentials)
+            return self._drive
+
+
+def service_account_from_secrets(path=SECRETS_PATH):
+    """The service account from the Streamlit secrets file, for command-line tools"""
+    import tomllib
+    with open(path, "rb") as f:
+        return tomllib.load(f)["google_service_account"]
+
+
+def clients_from_env(service_account_info):
+    """Real clients, or the in-memory fakes when FOOTPSY_FAKE_GOOGLE is set
+    (FOOTPSY_FAKE_LATENCY="sheet_s,drive_s" simulates API latency).
+    `service_account_info` is a callable, only invoked for real clients."""
+    if os.environ.get("FOOTPSY_FAKE_GOOGLE"):
+        from fake_google import make_fake_clients
+        from results import RESULT_COLUMNS
+        sheet_latency, drive_latency = (float(v) for v in os.environ.get("FOOTPSY_FAKE_LATENCY", "0,0").split(","))
+        return make_fake_clients(header=RESULT_COLUMNS, sheet_latency=sheet_latency, drive_latency=drive_latency)
+    return GoogleClients(service_account_info())
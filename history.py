@@ -0,0 +1,60 @@
+from collections import defaultdict
+import pandas as pd
+from scoring import CORE_SCALES
+
+
+def player_key(value):
+    return str(value).strip()
+
+
+class PlayerIndex:
+    """Player ID -> row positions in the dataset frame, in the order rows were stored.
+
+    Looking up a player costs their number of sessions, not the size of the
+    dataset; rows appended by a delta sync are added with `extend`.
+    """
+
+    def __init__(self, df=None):
+        self.rows = defaultdict(list)
+        self.names = {}  # player ID -> name on their most recently stored result
+        self.size = 0
+        self._sorted_ids = []
+        if df is not None:
+            self.extend(df)
+
+    def extend(self, df):
+        ids = df["Player ID"].fillna("").tolist()
+        names = df["Player Name"].fillna("").tolist() if "Player Name" in df.columns else [""] * len(ids)
+        for offset, (player_id, name) in enumerate(zip(ids, names)):
+            key = player_key(player_id)
+            self.rows[key].append(self.size + offset)
+            self.names[key] = name
+        self.size += len(df)
+        self._sorted_ids = None
+
+    def player_ids(self):
+        """Every player ID, sorted (re-sorted only after new rows arrive)"""
+        if self._sorted_ids is None:
+            self._sorted_ids = sorted(self.rows)
+        return self._sorted_ids
+
+    def positions(self, player_id, within=None):
+        """Row positions of one player, only those below `within` (the caller's frame length) if given"""
+        positions = self.rows.get(player_key(player_id), [])
+        return positions if within is None else [p for p in positions if p < within]
+
+    def sessions(self, df, player_id):
+        """One player's stored results in `df`, oldest first"""
+        return df.iloc[self.positions(player_id, len(df))].sort_values("Timestamp", kind="stable")
+
+
+def trajectory(sessions):
+    """Domain scores per session, indexed by timestamp"""
+    scores = sessions[CORE_SCALES].apply(pd.to_numeric, errors="coerce")
+    scores.index = pd.to_datetime(sessions["Timestamp"], errors="coerce").rename("Session")
+    return scores
+
+
+def session_deltas(scores):
+    """Change in each domain from one session to the next (first session dropped)"""
+    return scores.diff().iloc[1:].round(2)
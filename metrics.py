@@ -0,0 +1,156 @@
+"""Per-stage latency histograms and counters.
+
+Off unless FOOTPSY_METRICS is set: "1" writes snapshots to data/metrics.json,
+any other value is taken as the snapshot path. When off, `timed` returns the
+function untouched and `span` hands back a shared no-op context, so the
+instrumented code runs as if it were not there.
+
+    python metrics.py [path]    # print the latest snapshot as a table
+"""
+import atexit, bisect, json, os, sys, threading, time
+from contextlib import nullcontext
+from functools import wraps
+
+BASE = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_METRICS_PATH = os.path.join(BASE, "data", "metrics.json")
+
+_setting = os.environ.get("FOOTPSY_METRICS", "")
+ENABLED = _setting not in ("", "0")
+METRICS_PATH = DEFAULT_METRICS_PATH if _setting == "1" else _setting
+WRITE_INTERVAL = 30.0
+
+# Histogram bucket upper bounds in milliseconds (last bucket is open-ended)
+BUCKETS_MS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000, 30000]
+
+
+class Histogram:
+    def __init__(self):
+        self.buckets = [0] * (len(BUCKETS_MS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, ms):
+        self.buckets[bisect.bisect_left(BUCKETS_MS, ms)] += 1
+        self.count += 1
+        self.total += ms
+        self.max = max(self.max, ms)
+
+    def quantile(self, q):
+        """Upper bound of the bucket holding the q-th observation"""
+        rank, seen = q * self.count, 0
+        for bound, n in zip(BUCKETS_MS + [self.max], self.buckets):
+            seen += n
+            if n and seen >= rank:
+                return round(min(bound, self.max), 2)
+        return 0.0
+
+    def as_dict(self):
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total / self.count, 2) if self.count else 0.0,
+            "p50_ms": self.quantile(0.5),
+            "p95_ms": self.quantile(0.95),
+            "max_ms": round(self.max, 2),
+            "buckets": {f"le_{b}": n for b, n in zip(BUCKETS_MS + ["inf"], self.buckets)},
+        }
+
+
+class Registry:
+    def __init__(self):
+        self.histograms = {}
+        self.counters = {}
+        self._lock = threading.Lock()
+
+    def observe(self, name, ms):
+        with self._lock:
+            hist = self.histograms.get(name)
+            if hist is None:
+                hist = self.histograms[name] = Histogram()
+            hist.observe(ms)
+
+    def incr(self, name, n=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "written_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+                "stages": {name: h.as_dict() for name, h in sorted(self.histograms.items())},
+                "counters": dict(sorted(self.counters.items())),
+            }
+
+    def write(self, path):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp = f"{path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.snapshot(), f, indent=2)
+        os.replace(tmp, path)
+
+
+REGISTRY = Registry()
+_NO_SPAN = nullcontext()
+
+
+class _Span:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        REGISTRY.observe(self.name, (time.perf_counter() - self.start) * 1000)
+        if exc_type is not None:
+            REGISTRY.incr(f"{self.name}.errors")
+
+
+def span(name):
+    """Context manager timing one stage into the `name` histogram"""
+    return _Span(name) if ENABLED else _NO_SPAN
+
+
+def timed(name):
+    """Decorator form of `span`; a no-op (returns fn itself) when metrics are off"""
+    def decorate(fn):
+        if not ENABLED:
+            return fn
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            with _Span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def incr(name, n=1):
+    if ENABLED:
+        REGISTRY.incr(name, n)
+
+
+def _writer():
+    while True:
+        time.sleep(WRITE_INTERVAL)
+        REGISTRY.write(METRICS_PATH)
+
+
+if ENABLED and __name__ != "__main__":
+    threading.Thread(target=_writer, name="footpsy-metrics", daemon=True).start()
+    atexit.register(lambda: REGISTRY.write(METRICS_PATH))
+
+
+if __name__ == "__main__":
+    path = sys.argv[1] if len(sys.argv) > 1 else METRICS_PATH or DEFAULT_METRICS_PATH
+    with open(path) as f:
+        snap = json.load(f)
+    print(f"Snapshot written {snap['written_at']}")
+    print(f"{'stage':<24}{'count':>8}{'mean':>10}{'p50':>10}{'p95':>10}{'max':>10}  (ms)")
+    for name, h in snap["stages"].items():
+        print(f"{name:<24}{h['count']:>8}{h['mean_ms']:>10}{h['p50_ms']:>10}{h['p95_ms']:>10}{h['max_ms']:>10}")
+    for name, n in snap["counters"].items():
+        print(f"{name:<24}{n:>8}")
@@ -0,0 +1,87 @@
+import threading
+import numpy as np
+import pandas as pd
+from scoring import CORE_SCALES
+
+MIN_NORM_SIZE = 30  # smaller groups fall back to the whole population
+AGE_GROUPS = [(16, "U16"), (18, "U18"), (21, "U21"), (200, "Senior")]
+ALL = ("All players", None)
+
+
+def age_group(age):
+    try:
+        age = float(age)
+    except (TypeError, ValueError):
+        return None
+    if np.isnan(age):
+        return None
+    for upper, label in AGE_GROUPS:
+        if age < upper:
+            return label
+    return None
+
+
+def ordinal(n):
+    suffix = "th" if 10 <= n % 100 <= 20 else {1: "st", 2: "nd", 3: "rd"}.get(n % 10, "th")
+    return f"{n}{suffix}"
+
+
+class NormTables:
+    """Sorted score arrays per (scale, group) built from stored results.
+
+    Groups are the whole population, each position and each age group.
+    New rows are buffered and merged into the sorted arrays on the next
+    lookup, so percentile lookups stay a pair of binary searches.
+    """
+
+    def __init__(self, df=None):
+        self.sorted = {}
+        self.pending = {}
+        self._lock = threading.Lock()
+        if df is not None:
+            self.extend(df)
+
+    def extend(self, df):
+        groups = {
+            "Position": df["Position"].fillna("").astype(str).str.strip().str.casefold(),
+            "Age group": df["Age"].map(age_group),
+        }
+        for scale in CORE_SCALES:
+            scores = pd.to_numeric(df[scale], errors="coerce")
+            self._add((scale,) + ALL, scores)
+            for kind, keys in groups.items():
+                for value, part in scores.groupby(keys):
+                    if value:
+                        self._add((scale, kind, value), part)
+
+    def _add(self, key, scores):
+        values = scores.to_numpy(dtype=float)
+        values = values[~np.isnan(values)]
+        if len(values):
+            with self._lock:
+                self.pending.setdefault(key, []).append(values)
+
+    def _array(self, key):
+        with self._lock:
+            if key in self.pending:
+                merged = [self.sorted.get(key, np.empty(0))] + self.pending.pop(key)
+                self.sorted[key] = np.sort(np.concatenate(merged))
+            return self.sorted.get(key)
+
+    def norm_group(self, scale, kind=None, value=None):
+        """(label, sorted scores) for the requested group, or the whole population if it is too small"""
+        if kind and value:
+            key = str(value).strip().casefold() if kind == "Position" else value
+            arr = self._array((scale, kind, key))
+            if arr is not None and len(arr) >= MIN_NORM_SIZE:
+                return f"{kind}: {value}", arr
+        return ALL[0], self._array((scale,) + ALL)
+
+    def percentile(self, scale, score, kind=None, value=None):
+        """Mid-rank percentile of `score` within the norm group; (percentile, label, n) or None"""
+        label, arr = self.norm_group(scale, kind, value)
+        if arr is None or not len(arr) or score is None or np.isnan(score):
+            return None
+        below = np.searchsorted(arr, score, side="left")
+        equal = np.searchsorted(arr, score, side="right") - below
+        return round(100 * (below + 0.5 * equal) / len(arr)), label, len(arr)
@@ -0,0 +1,183 @@
+"""Offline outbox: report PDFs kept on disk until Google Drive is reachable.
+
+The app queues a PDF here when its upload fails (or always, in kiosk mode)
+and a background thread drains the queue in batches. Each entry carries the
+result key (player ID + timestamp), which is stored on the Drive file, so an
+upload that landed without being recorded is found instead of repeated. The
+result rows themselves sit in the local store and its Sheets spool, which is
+reconciled the same way (see BufferedSheetWriter).
+
+    python outbox.py            # drain the outbox and the Sheets spool once, then exit
+    python outbox.py --status   # show what is still waiting
+"""
+import argparse, os, sqlite3, threading, time
+from metrics import span, incr
+from pipeline import publish_pdf
+from sheet_writer import BUSY_TIMEOUT, add_claim_columns, claim_owner, claim_rows, release_rows
+
+BASE = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_OUTBOX_PATH = os.path.join(BASE, "data", "pdf_outbox.sqlite3")
+
+
+class PdfOutbox:
+    """Durable PDF upload queue. `link_writer(row_key, link)` records the Drive
+    link against the stored result once an upload succeeds."""
+
+    def __init__(self, drive_getter, link_writer, path=DEFAULT_OUTBOX_PATH, batch_size=10, interval=60.0,
+                 autostart=True):
+        self.drive_getter = drive_getter
+        self.link_writer = link_writer
+        self.batch_size = batch_size
+        self.interval = interval
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.db = sqlite3.connect(path, timeout=BUSY_TIMEOUT, check_same_thread=False, isolation_level=None)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("""CREATE TABLE IF NOT EXISTS outbox (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            result_key TEXT NOT NULL UNIQUE,
+            row_key INTEGER,
+            player_name TEXT,
+            player_id TEXT,
+            pdf BLOB,
+            queued_at REAL NOT NULL,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            last_error TEXT,
+            uploaded_at REAL,
+            link TEXT)""")
+        self.db.execute("CREATE INDEX IF NOT EXISTS outbox_pending ON outbox (uploaded_at, id)")
+        # outbox.py drains the same file as the app: entries are claimed before upload
+        add_claim_columns(self.db, "outbox")
+        self.owner = claim_owner()
+        self._lock = threading.RLock()
+        self._drain_lock = threading.Lock()
+        self._wake = threading.Condition(self._lock)
+        self._closed = False
+        self._thread = None
+        if autostart:
+            self._thread = threading.Thread(target=self._run, name="footpsy-outbox", daemon=True)
+            self._thread.start()
+
+    def enqueue(self, result_key, row_key, pdf_bytes, player_name, player_id):
+        """Store one PDF for upload; re-queuing the same result key is a no-op"""
+        with self._lock:
+            self.db.execute(
+                "INSERT OR IGNORE INTO outbox (result_key, row_key, player_name, player_id, pdf, queued_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (result_key, row_key, player_name, str(player_id), pdf_bytes, time.time()))
+            self._wake.notify()
+
+    def pending_count(self):
+        with self._lock:
+            return self.db.execute("SELECT COUNT(*) FROM outbox WHERE uploaded_at IS NULL").fetchone()[0]
+
+    def pending(self):
+        """(result key, attempts, last error) of every PDF still waiting, oldest first"""
+        with self._lock:
+            return self.db.execute("SELECT result_key, attempts, last_error FROM outbox "
+                                   "WHERE uploaded_at IS NULL ORDER BY id").fetchall()
+
+    def _upload(self, entry):
+        _, key, row_key, player_name, player_id, pdf, attempts = entry
+        # an earlier attempt may have uploaded the file and then failed before sharing or recording it
+        link = publish_pdf(self.drive_getter, pdf, player_name, player_id, key, uploaded_before=attempts > 0)
+        if row_key is not None:
+            self.link_writer(row_key, link)
+        return link
+
+    def drain(self):
+        """Upload pending PDFs in batches until the queue is empty or Drive fails; returns the number uploaded"""
+        uploaded = 0
+        with self._drain_lock:
+            while True:
+                with self._lock:
+                    batch = claim_rows(self.db, "outbox",
+                                       "id, result_key, row_key, player_name, player_id, pdf, attempts",
+                                       "uploaded_at IS NULL", self.owner, self.batch_size)
+                if not batch:
+                    return uploaded
+                for n, entry in enumerate(batch):
+                    try:
+                        with span("outbox.upload"):
+                            link = self._upload(entry)
+                    except Exception as e:
+                        with self._lock:
+                            self.db.execute("UPDATE outbox SET attempts = attempts + 1, last_error = ? WHERE id = ?",
+                                            (str(e)[:500], entry[0]))
+                            release_rows(self.db, "outbox", self.owner, [left[0] for left in batch[n:]])
+                        # still offline: leave the rest for the next round
+                        raise
+                    with self._lock:
+                        # the PDF is on Drive now; keep only the record
+                        self.db.execute("UPDATE outbox SET uploaded_at = ?, link = ?, pdf = NULL WHERE id = ?",
+                                        (time.time(), link, entry[0]))
+                    uploaded += 1
+                    incr("outbox.uploaded")
+
+    def _run(self):
+        wait = self.interval
+        while True:
+            with self._lock:
+                if not self._closed:
+                    self._wake.wait(timeout=wait)
+                if self._closed:
+                    return
+            try:
+                self.drain()
+                wait = self.interval
+            except Exception:
+                # offline: back off up to 15 minutes
+                wait = min(wait * 2, 900)
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            self._wake.notify()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+        self.db.close()
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Drain the offline PDF outbox and Sheets spool")
+    ap.add_argument("--status", action="store_true", help="only list what is waiting")
+    ap.add_argument("--secrets", default=os.path.join(BASE, ".streamlit", "secrets.toml"))
+    args = ap.parse_args()
+
+    from google_clients import clients_from_env, service_account_from_secrets
+    from storage import store_from_env
+
+    clients = clients_from_env(lambda: service_account_from_secrets(args.secrets))
+    # the same store the app writes to, so links land where its admin panel reads them
+    store = store_from_env(lambda: clients.sheet)
+    spool = getattr(store, "mirror", None)
+    outbox = PdfOutbox(lambda: clients.drive, store.set_pdf_link,
+                       os.environ.get("FOOTPSY_OUTBOX", DEFAULT_OUTBOX_PATH), autostart=False)
+
+    def waiting():
+        return f"{outbox.pending_count()} PDF(s) and {spool.pending_count() if spool else 0} sheet row(s)"
+
+    if args.status:
+        for key, attempts, error in outbox.pending():
+            print(f"{key}  attempts={attempts}  {error or ''}")
+        print(f"{waiting()} waiting")
+    else:
+        try:
+            print(f"Uploaded {outbox.drain()} PDF(s)")
+        except Exception as e:
+            print(f"Drive still unreachable: {e}")
+        if spool is not None:
+            try:
+                print(f"Flushed {spool.flush()} sheet row(s)")
+            except Exception as e:
+                print(f"Sheets still unreachable: {e}")
+        print(f"{waiting()} still waiting")
+    outbox.close()
+    if spool is not None:
+        spool.close(flush=False)
+    if hasattr(store, "close"):
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
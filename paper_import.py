@@ -0,0 +1,211 @@
+"""Import paper assessments keyed into a spreadsheet (CSV, or XLSX with openpyxl).
+
+One row per player: Q1–Q66 answered 1–5, plus the player columns of the
+results sheet (Player Name, Team Name, Position, Date of Birth). Player ID,
+Age and Timestamp are filled in when missing. Valid rows are scored in one
+vectorized pass and written to the result store in one batch; rows with bad
+answers are reported by spreadsheet line and left out.
+
+    python paper_import.py squad.csv [--dry-run]
+"""
+import argparse, datetime, os, re, sys
+from dataclasses import dataclass, field
+from importlib.util import find_spec
+import numpy as np
+import pandas as pd
+
+from results import (INFO_COLUMNS, QUESTION_COLUMNS, TIMESTAMP_FORMAT, build_result_row, generate_player_id,
+                     result_key)
+from scoring import ScoringPlan, score_batch, scores_at
+
+BASE = os.path.dirname(os.path.abspath(__file__))
+MAPPING_PATH = os.path.join(BASE, "assets", "scales_mapping.csv")
+
+# file types the admin uploader accepts (XLSX needs the optional openpyxl)
+IMPORT_TYPES = ["csv", "xlsx"] if find_spec("openpyxl") else ["csv"]
+DATE_FORMAT = "%d/%m/%Y"
+REQUIRED_COLUMNS = ["Player Name"]
+# common spellings on hand-made sheets -> results column
+COLUMN_ALIASES = {
+    "name": "Player Name", "player": "Player Name",
+    "id": "Player ID",
+    "team": "Team Name", "club": "Team Name",
+    "dob": "Date of Birth", "birth date": "Date of Birth", "birthdate": "Date of Birth",
+}
+_ITEM_HEADER = re.compile(r"^(?:q|item)?\s*0*(\d+)$", re.IGNORECASE)
+
+
+@dataclass
+class ImportBatch:
+    """Scored rows ready for the store, plus what was rejected or flagged"""
+    rows: list = field(default_factory=list)
+    lines: list = field(default_factory=list)  # spreadsheet line of each row
+    errors: list = field(default_factory=list)  # (line, problem)
+    attention_failures: list = field(default_factory=list)  # (line, player name, player ID)
+
+
+def read_sheet(source, filename=""):
+    """The uploaded or on-disk spreadsheet as strings (blank cells = "")"""
+    name = filename or (source if isinstance(source, str) else "")
+    if name.lower().endswith((".xlsx", ".xlsm")):
+        if "xlsx" not in IMPORT_TYPES:
+            raise ValueError("XLSX import needs openpyxl (pip install openpyxl); save the sheet as CSV instead")
+        df = pd.read_excel(source, dtype=str)
+    else:
+        df = pd.read_csv(source, dtype=str, keep_default_na=False, encoding="utf-8-sig")
+    return df.fillna("")
+
+
+def normalize_columns(df):
+    """Rename headers like "q7", "Item 07" or "DOB" to the results sheet's column names"""
+    known = {c.casefold(): c for c in INFO_COLUMNS}
+    renamed = {}
+    for col in df.columns:
+        key = str(col).strip()
+        item = _ITEM_HEADER.match(key)
+        if item:
+            renamed[col] = f"Q{int(item.group(1))}"
+        else:
+            renamed[col] = known.get(key.casefold()) or COLUMN_ALIASES.get(key.casefold(), key)
+    return df.rename(columns=renamed)
+
+
+def parse_date(value):
+    """DD/MM/YYYY as the app writes it; ISO dates from spreadsheet software also accepted"""
+    value = str(value).strip()
+    for fmt in (DATE_FORMAT, "%Y-%m-%d", "%Y-%m-%d %H:%M:%S"):
+        try:
+            return datetime.datetime.strptime(value, fmt).date()
+        except ValueError:
+            pass
+    return None
+
+
+def stripped(column):
+    """A column of sheet cells as stripped text"""
+    return column.astype(str).str.strip()
+
+
+def cell(record, column):
+    """A sheet cell as stripped text ("" when the column is absent)"""
+    return str(record.get(column, "")).strip()
+
+
+def age_on(dob, day):
+    return day.year - dob.year - ((day.month, day.day) < (dob.month, dob.day))
+
+
+def prepare(df, plan, now=None):
+    """Validate, fill in and score every row of an import sheet"""
+    df = normalize_columns(df)
+    missing = [c for c in REQUIRED_COLUMNS + QUESTION_COLUMNS if c not in df.columns]
+    if missing:
+        shown = ", ".join(missing[:8]) + (f" and {len(missing) - 8} more" if len(missing) > 8 else "")
+        raise ValueError(f"Missing columns: {shown}")
+    now = now or datetime.datetime.now()
+    batch = ImportBatch()
+
+    raw = df[QUESTION_COLUMNS].apply(stripped)
+    X = raw.apply(pd.to_numeric, errors="coerce").to_numpy(dtype=float)
+    valid = np.isin(X, [1, 2, 3, 4, 5])
+    keep = []
+    for n, record in enumerate(df.to_dict("records")):
+        line = n + 2  # header is line 1
+        if not any(str(v).strip() for v in record.values()):
+            continue  # blank line at the end of the sheet
+        problems = []
+        if not cell(record, "Player Name"):
+            problems.append("Player Name is blank")
+        bad = [f"{q}={raw.iat[n, k]!r}" for k, q in enumerate(QUESTION_COLUMNS) if not valid[n, k]]
+        if bad:
+            problems.append("answers must be 1–5: " + ", ".join(bad[:6]) + (" …" if len(bad) > 6 else ""))
+        if problems:
+            batch.errors.append((line, "; ".join(problems)))
+        else:
+            keep.append(n)
+    if not keep:
+        return batch
+
+    scores = score_batch(X[keep], plan)
+    records = df.iloc[keep].to_dict("records")
+    seen = {}
+    for k, (n, record) in enumerate(zip(keep, records)):
+        line = n + 2
+        stamp = cell(record, "Timestamp")
+        try:
+            timestamp = datetime.datetime.strptime(stamp, TIMESTAMP_FORMAT) if stamp else now
+        except ValueError:
+            batch.errors.append((line, f"Timestamp {stamp!r} is not YYYY-MM-DD HH:MM:SS"))
+            continue
+        dob = parse_date(cell(record, "Date of Birth"))
+        age = cell(record, "Age") or (age_on(dob, timestamp.date()) if dob else "N/A")
+        player_info = {
+            "name": cell(record, "Player Name"),
+            "id": cell(record, "Player ID") or generate_player_id(timestamp),
+            "team": cell(record, "Team Name") or "N/A",
+            "position": cell(record, "Position") or "N/A",
+            "dob": dob.strftime(DATE_FORMAT) if dob else cell(record, "Date of Birth") or "N/A",
+            "age": age,
+        }
+        domain_means, validity_scores = scores_at(scores, k, plan)
+        responses = {i: int(v) for i, v in enumerate(X[n], start=1)}
+        row = build_result_row(player_info, domain_means, validity_scores, responses, timestamp=timestamp)
+        # player ID + timestamp identifies a result downstream (sheet sync, PDF outbox)
+        key = result_key(row)
+        if key in seen:
+            batch.errors.append((line, f"same Player ID and Timestamp as line {seen[key]}"))
+            continue
+        seen[key] = line
+        batch.rows.append(row)
+        batch.lines.append(line)
+        if not validity_scores["AttentionPass"]:
+            batch.attention_failures.append((line, player_info["name"], player_info["id"]))
+    return batch
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Score paper assessments from a CSV/XLSX sheet into the result store")
+    ap.add_argument("sheet", help="CSV or XLSX file with Q1–Q66 and player columns")
+    ap.add_argument("--dry-run", action="store_true", help="validate and score only, write nothing")
+    ap.add_argument("--secrets", default=os.path.join(BASE, ".streamlit", "secrets.toml"))
+    args = ap.parse_args()
+
+    try:
+        batch = prepare(read_sheet(args.sheet), ScoringPlan.from_csv(MAPPING_PATH))
+    except (ValueError, OSError) as e:
+        sys.exit(f"Cannot import {args.sheet}: {e}")
+    for line, problem in batch.errors:
+        print(f"line {line}: {problem}")
+    for line, name, player_id in batch.attention_failures:
+        print(f"line {line}: attention check failed for {name} ({player_id})")
+    print(f"{len(batch.rows)} assessment(s) ready, {len(batch.errors)} rejected, "
+          f"{len(batch.attention_failures)} failed the attention check")
+    if args.dry_run or not batch.rows:
+        return
+
+    from google_clients import clients_from_env, service_account_from_secrets
+    from storage import store_from_env
+
+    clients = None
+
+    def sheet():
+        nonlocal clients
+        clients = clients or clients_from_env(lambda: service_account_from_secrets(args.secrets))
+        return clients.sheet
+
+    store = store_from_env(sheet)
+    store.append_many(batch.rows)
+    print(f"Imported {len(batch.rows)} assessment(s)")
+    mirror = getattr(store, "mirror", None)
+    if mirror is not None:
+        try:
+            print(f"Synced {mirror.flush()} row(s) to Google Sheets")
+        except Exception as e:
+            print(f"Google Sheets unreachable ({e}); rows stay spooled until the app or outbox.py syncs them")
+        mirror.close(flush=False)
+    if hasattr(store, "close"):
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
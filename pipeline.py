@@ -0,0 +1,221 @@
+import datetime, threading, time
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from results import result_key
+from sheet_writer import DirectSheetWriter
+from metrics import timed, span, incr
+
+# === REPLACE THIS WITH YOUR ACTUAL SHARED DRIVE ID ===
+SHARED_DRIVE_ID = "0AOT9SySfSgB9Uk9PVA"  # ← Replace with your actual Shared Drive ID
+RESULT_KEY_PROPERTY = "footpsy_result_key"
+
+
+def upload_pdf(drive_service, pdf_bytes, player_name, player_id, result_key=None):
+    """Upload a report PDF to the Shared Drive; returns the file's id and webViewLink.
+    `result_key` is stored on the file so a retried upload can find it (see find_uploaded_pdf)"""
+    from googleapiclient.http import MediaIoBaseUpload
+
+    # Create file metadata
+    file_metadata = {
+        'name': f"FOOTPSY_Report_{player_name}_{player_id}_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf",
+        'parents': [SHARED_DRIVE_ID]
+    }
+    if result_key:
+        file_metadata['appProperties'] = {RESULT_KEY_PROPERTY: result_key}
+
+    # Create media upload
+    media = MediaIoBaseUpload(
+        BytesIO(pdf_bytes),
+        mimetype='application/pdf',
+        resumable=True
+    )
+
+    # Upload file to shared drive
+    return drive_service.files().create(
+        body=file_metadata,
+        media_body=media,
+        supportsAllDrives=True,  # Required for shared drives
+        fields='id, webViewLink, webContentLink'
+    ).execute()
+
+
+def share_pdf(drive_service, file_id):
+    """Make an uploaded report publicly viewable (granting it again is harmless)"""
+    drive_service.permissions().create(
+        fileId=file_id,
+        body={'type': 'anyone', 'role': 'reader'},
+        supportsAllDrives=True  # Required for shared drives
+    ).execute()
+
+
+def find_uploaded_pdf(drive_service, result_key):
+    """The report already uploaded for `result_key` (id and webViewLink), or None"""
+    escaped = result_key.replace("\\", "\\\\").replace("'", "\\'")
+    found = drive_service.files().list(
+        q=f"appProperties has {{ key='{RESULT_KEY_PROPERTY}' and value='{escaped}' }} and trashed = false",
+        corpora="drive",
+        driveId=SHARED_DRIVE_ID,
+        includeItemsFromAllDrives=True,
+        supportsAllDrives=True,
+        fields="files(id, webViewLink)"
+    ).execute().get("files", [])
+    return found[0] if found else None
+
+
+def save_pdf_to_shared_drive(drive_service, pdf_bytes, player_name, player_id, result_key=None):
+    """Save PDF report to a Shared Drive; returns its web link (one attempt, see publish_pdf)"""
+    return publish_pdf(lambda: drive_service, pdf_bytes, player_name, player_id, result_key)
+
+
+@timed("drive.upload")
+def publish_pdf(drive_getter, pdf_bytes, player_name, player_id, result_key=None, retry=None,
+                uploaded_before=False):
+    """Upload a report once and share it; returns its web link.
+
+    Upload and permission grant are retried separately with `retry(fn)`, so a
+    failed grant never re-uploads. An upload retried after an error (or after
+    an earlier attempt, `uploaded_before`) first looks the file up by
+    `result_key`, since the failed call may have created it anyway.
+    """
+    retry = retry or (lambda fn: fn())
+    tried = [uploaded_before and bool(result_key)]
+
+    def upload():
+        drive = drive_getter()
+        if tried[0]:
+            found = find_uploaded_pdf(drive, result_key)
+            if found:
+                return found
+        tried[0] = bool(result_key)
+        return upload_pdf(drive, pdf_bytes, player_name, player_id, result_key)
+
+    file = retry(upload)
+    retry(lambda: share_pdf(drive_getter(), file['id']))
+    return file['webViewLink']
+
+
+def with_retries(fn, attempts=3, backoff=1.0):
+    for attempt in range(1, attempts + 1):
+        try:
+            return fn()
+        except Exception:
+            if attempt == attempts:
+                raise
+            incr("retries")
+            time.sleep(backoff * 2 ** (attempt - 1))
+
+
+class Submission:
+    """Progress of one assessment through upload + logging, polled by the results page"""
+
+    def __init__(self):
+        self.logged = False
+        self.row_key = None
+        self.pdf_link = None
+        self.pdf_queued = False  # waiting in the offline outbox for Drive
+        self.link_backfilled = False
+        self.errors = []
+        self._pending = 2
+        self._queued = None
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+
+    @property
+    def done(self):
+        return self._done.is_set()
+
+    def wait(self, timeout=None):
+        return self._done.wait(timeout)
+
+
+class ResultPipeline:
+    """Background worker pool that uploads the PDF and logs the row concurrently.
+
+    The row is handed to the writer straight away with "Not saved" as its PDF
+    link; once the upload finishes the link is written back into that row.
+    With an `outbox` (see outbox.PdfOutbox) a PDF whose upload fails is queued
+    on disk for a later sync instead of being dropped; `offline=True` (kiosk
+    mode) queues every PDF without trying Drive first. A retried log asks the
+    writer to `recover` the row first, so a failed attempt that still stored it
+    is not written twice. `on_logged()` is called once a row is stored (the app
+    marks the admin dataset stale with it).
+    """
+
+    def __init__(self, clients_getter, writer=None, workers=4, attempts=3, backoff=1.0, outbox=None, offline=False,
+                 on_logged=None):
+        self.clients_getter = clients_getter
+        self.writer = writer or DirectSheetWriter(lambda: clients_getter().sheet)
+        self.outbox = outbox
+        self.offline = offline and outbox is not None
+        self.on_logged = on_logged
+        self.attempts = attempts
+        self.backoff = backoff
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="footpsy-upload")
+
+    def _retry(self, fn):
+        return with_retries(fn, self.attempts, self.backoff)
+
+    def submit(self, row, pdf_bytes, player_name, player_id):
+        sub = Submission()
+        incr("submissions")
+        key = result_key(row)
+        self.executor.submit(self._upload, sub, key, pdf_bytes, player_name, player_id)
+        self.executor.submit(self._log, sub, row)
+        return sub
+
+    def _upload(self, sub, key, pdf_bytes, player_name, player_id):
+        if not self.offline:
+            try:
+                sub.pdf_link = publish_pdf(lambda: self.clients_getter().drive, pdf_bytes, player_name, player_id,
+                                           key, retry=self._retry)
+            except Exception as e:
+                if self.outbox is None:
+                    sub.errors.append(f"Failed to save PDF: {e}")
+        if sub.pdf_link is None and self.outbox is not None:
+            # kept on disk until the outbox reaches Drive; the row key may not be known yet
+            sub._queued = (key, pdf_bytes, player_name, player_id)
+        self._finish(sub)
+
+    def _log(self, sub, row):
+        attempted = False
+
+        def append():
+            nonlocal attempted
+            # a failed attempt may still have stored the row (a sheet append that landed and
+            # then timed out, a local insert whose mirror step failed): finish that, don't append twice
+            key = self.writer.recover(row) if attempted else None
+            attempted = True
+            return key if key is not None else self.writer.append(row)
+        try:
+            with span("result.log"):
+                sub.row_key = self._retry(append)
+            sub.logged = True
+        except Exception as e:
+            sub.errors.append(f"Failed to log data: {e}")
+        if sub.logged and self.on_logged is not None:
+            self.on_logged()
+        self._finish(sub)
+
+    def _finish(self, sub):
+        with sub._lock:
+            sub._pending -= 1
+            last = sub._pending == 0
+        if not last:
+            return
+        if sub._queued:
+            key, pdf_bytes, player_name, player_id = sub._queued
+            try:
+                self.outbox.enqueue(key, sub.row_key if sub.logged else None, pdf_bytes, player_name, player_id)
+                sub.pdf_queued = True
+                incr("pdfs.queued")
+            except Exception as e:
+                sub.errors.append(f"Failed to queue PDF for upload: {e}")
+        if sub.logged and sub.pdf_link and sub.row_key:
+            try:
+                self._retry(lambda: self.writer.set_pdf_link(sub.row_key, sub.pdf_link))
+                sub.link_backfilled = True
+            except Exception as e:
+                sub.errors.append(f"Failed to save PDF link to the sheet: {e}")
+        if sub.errors:
+            incr("submissions.failed")
+        sub._done.set()
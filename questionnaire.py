@@ -0,0 +1,93 @@
+from scoring import N_ITEMS
+
+# Imported once per process; the app script reruns on every interaction, so the
+# question text and page layout live here instead of being rebuilt each time.
+
+QUESTIONS = {
+    1: "I can maintain my focus on the game for the full 90 minutes, even when we are winning comfortably.",
+    2: "I will often attempt a difficult through-pass or progressive pass, even if it might be intercepted. ",
+    3: "I am confident that I can perform well even in a high-pressure match, like a cup final or a derby.",
+    4: "I follow a strict routine for sleep, nutrition, and recovery, even on my days off.",
+    5: "I feel just as much satisfaction from providing a crucial assist as I do from scoring a goal myself.",
+    6: "I can stay calm and make rational decisions even when opponents are trying to provoke me.",
+    7: "If I get beaten in a 1v1, my confidence drops and I become hesitant and worried next time I encounter a 1v1 again.",
+    8: "I am comfortable being the one who gives instructions and organizes the team during a game.",
+    9: "I get extra motivation from playing against opponents who are considered better than me.",
+    10: "I am always willing to admit when I make a mistake.",
+    11: "I enjoy trying creative flicks and tricks during a game if I see an opportunity.",
+    12: "I am always willing to sacrifice my own positioning to cover for a teammate who has pushed forward.",
+    13: "I have a specific technique that I use to calm myself down quickly when I feel frustration building.",
+    14: "I sometimes skip the recommended cool-down or stretching after training if I'm feeling tired.",
+    15: "I rarely let the referee's decisions affect my mood or my focus on the game.",
+    16: "I set specific personal goals for myself for each season and review my progress regularly.",
+    17: "I can shake off a bad pass or a missed tackle and focus on the next play immediately.",
+    18: "This is an attention check. Please select 'Strongly Disagree'.",
+    19: "I actively seek out feedback from my coaches on how I can improve, even after a good game.",
+    20: "I will happily do the 'unseen' defensive work that might not get noticed by fans but helps the team win.",
+    21: "I have never felt jealous of a teammate's success or recognition.",
+    22: "I enjoy the challenge of learning a new playing position or tactical role.",
+    23: "I believe it's always better to keep possession with a simple pass than to risk losing the ball with an ambitious one.",
+    24: "I am always fully focused and give 100% effort in every training session, not just the ones before a big game.",
+    25: "I often react impulsively in the heat of the moment and later regret my actions.",
+    26: "I am just as satisfied with a good personal performance in a loss as I am with a win.",
+    27: "If the game is on the line, I want to be the one taking the penalty/free-kick or having the decisive moment.",
+    28: "I make a conscious effort to encourage teammates, especially when they are struggling or have made a mistake.",
+    29: "When the opponent scores, it makes me more determined to make an immediate impact to turn things around.",
+    30: "I sometimes lose track of my tactical position when I get tired in the last 15 minutes of a game.",
+    31: "I avoid high-risk actions unless the odds of success are strongly in my favor.",
+    32: "I am not intimidated by playing against opponents who are known for being physically stronger or more aggressive.",
+    33: "I constantly compare my performance and statistics to my teammates and rivals.",
+    34: "If I make an error in the first half, it's hard for me to perform well for the rest of the game.",
+    35: "The feeling of mastering a new skill is one of the most rewarding parts of football for me.",
+    36: "I get frustrated when a coach asks me to change a technique that I'm already comfortable with.",
+    37: "I sometimes doubt my abilities when my team is about to face a much stronger opponent.",
+    38: "After an opponent scores a goal, I find it difficult to regain my composure and focus.",
+    39: "I prefer to stick to a familiar game plan rather than adapt to the specific strengths of our opponent.",
+    40: "I always give 100% in every drill, regardless of how tired or unmotivated I feel.",
+    41: "If a teammate makes a mistake that costs us a goal, I struggle to hide my frustration with them.",
+    42: "I will voluntarily do extra training sessions to work on my weaknesses.",
+    43: "I have a specific routine or technique to quickly refocus my mind if it starts to wander during a match.",
+    44: "I am happy with my current ability level and don't feel a strong need to improve.",
+    45: "I believe that technical skill and intelligence are far more important in football than physical aggression.",
+    46: "Winning my individual battles on the pitch is just as important to me as the final score.",
+    47: "I tend to avoid 50/50 challenges where I might get hurt.",
+    48: "Once I've achieved a goal, I tend to relax my efforts rather than immediately set a new one.",
+    49: "During the off-season, I find it difficult to maintain the same level of fitness and discipline.",
+    50: "I am not particularly bothered by losing in training games or small-sided matches.",
+    51: "I’ve never felt frustrated with a teammate, even after a costly mistake.",
+    52: "I am always willing to put my body on the line, for example, by throwing myself to win a duel or block a shot.",
+    53: "I enjoy the physical side of football and look for opportunities to win my individual duels.",
+    54: "If the coach changes the game plan at halftime, I can quickly understand and execute the new instructions.",
+    55: "I sometimes get frustrated when a teammate doesn’t pass the ball to me when I’m in a better position.",
+    56: "I believe I have what it takes to succeed at the highest level of football.",
+    57: "If I have a run of poor form, I start to question whether I'm good enough.",
+    58: "I am driven by a need to see how good I can ultimately become.",
+    59: "When I'm on the pitch, I can easily tune out distractions like the crowd or opponents' comments.",
+    60: "To show you are paying attention, please select 'Agree' for this statement.",
+    61: "I feel uncomfortable having to give critical feedback to a teammate, even if it would help the team.",
+    62: "My primary personal goal is to be the star player of the team, even if the team doesn't win.",
+    63: "I prefer to focus solely on my own performance and let others worry about organizing the team.",
+    64: "If I make a mistake, I find it very difficult to stop thinking about it and focus on the next play.",
+    65: "I will speak up in the dressing room to address issues or to motivate the group before an important match.",
+    66: "When under pressure, I prefer to attempt a high-risk/ambitious play rather than play it safe."
+}
+
+RESPONSE_LABELS = ["Strongly Disagree", "Disagree", "Neutral", "Agree", "Strongly Agree"]
+LABEL_TO_VALUE = {label: value for value, label in enumerate(RESPONSE_LABELS, start=1)}
+
+Q_PER_PAGE = 11
+TOTAL_QPAGES = (len(QUESTIONS) + Q_PER_PAGE - 1) // Q_PER_PAGE
+
+
+def page_items(qpage):
+    """Item numbers shown on question page `qpage` (1-based)"""
+    return range((qpage - 1) * Q_PER_PAGE + 1, min(qpage * Q_PER_PAGE, len(QUESTIONS)) + 1)
+
+
+def new_answers():
+    """Per-session answer store: one byte per item, 0 = unanswered"""
+    return bytearray(N_ITEMS)
+
+
+def answers_to_responses(answers):
+    return {i: value for i, value in enumerate(answers, start=1)}
@@ -0,0 +1,421 @@
+import os, datetime
+from functools import lru_cache
+from io import BytesIO
+from scoring import CORE_SCALES, HIGH_CUTOFF, MODERATE_CUTOFF
+from metrics import timed
+
+BASE = os.path.dirname(os.path.abspath(__file__))
+LOGO_PATH = os.path.join(BASE, "assets", "footpsylogo.png")
+LOGO_WIDTH_PT = 120  # printed width of the logo in the PDF header
+LOGO_DPI = 300
+LOGO_BOX_PT = 120  # the logo is drawn into a LOGO_WIDTH_PT x LOGO_BOX_PT box, aspect ratio kept
+HEADER_HEIGHT = 160  # header with the logo; content starts this far below the top of page 1
+
+
+class Logo:
+    def __init__(self, jpeg):
+        self.jpeg = jpeg
+
+    @property
+    def reader(self):
+        from reportlab.lib.utils import ImageReader
+        # a fresh file handle per canvas: Streamlit sessions render on separate threads
+        return ImageReader(BytesIO(self.jpeg))
+
+
+@lru_cache(maxsize=None)
+def load_logo(path=LOGO_PATH, width_pt=LOGO_WIDTH_PT, dpi=LOGO_DPI):
+    """Downsample the logo once to its print size and share it across reports"""
+    if not os.path.exists(path):
+        return None
+    from PIL import Image
+    with Image.open(path) as im:
+        px = round(width_pt / 72 * dpi)
+        if im.width > px:
+            im = im.resize((px, round(im.height * px / im.width)), Image.LANCZOS)
+        # ReportLab flattens to RGB anyway (no mask is used); storing it as JPEG
+        # lets every canvas embed the bytes as-is instead of re-compressing pixels
+        im = im.convert("RGB")
+    buf = BytesIO()
+    im.save(buf, format="JPEG", quality=90)
+    return Logo(buf.getvalue())
+
+
+def warm_up():
+    """Import ReportLab and prepare the logo ahead of the first report"""
+    from reportlab.pdfgen import canvas  # noqa: F401
+    load_logo()
+
+
+# ======= PDF LAYOUT =======
+# reportlab.lib.pagesizes.A4, spelled out so importing this module doesn't load ReportLab
+A4 = (595.2755905511812, 841.8897637795277)
+PAGE_WIDTH, PAGE_HEIGHT = A4
+LEFT_MARGIN = 40
+RIGHT_MARGIN = PAGE_WIDTH - 40
+LINE_HEIGHT = 14
+
+# Progress bar dimensions for PDF
+PROGRESS_BAR_WIDTH = 200
+PROGRESS_BAR_HEIGHT = 12
+
+RESPONSE_ABBREVIATIONS = {
+    1: "SD",  # Strongly Disagree
+    2: "D",  # Disagree
+    3: "N",  # Neutral
+    4: "A",  # Agree
+    5: "SA"  # Strongly Agree
+}
+
+ABBREVIATED_QUESTIONS = {
+        1: "Maintain focus for full 90 minutes",
+        2: "Attempt difficult progressive/through-passes",
+        3: "Confident in high-pressure matches",
+        4: "Strict sleep/nutrition/recovery routine",
+        5: "Satisfaction from assists equals goals",
+        6: "Stay calm when provoked",
+        7: "Confidence drops after beaten in 1v1",
+        8: "Comfortable giving instructions",
+        9: "Motivated vs better opponents",
+        10: "Willing to admit mistakes",
+        11: "Enjoy creative flicks/tricks",
+        12: "Sacrifice positioning to cover teammates",
+        13: "Technique to calm frustration",
+        14: "Skip cool-down if tired",
+        15: "Referee decisions don't affect focus",
+        16: "Set and review seasonal goals",
+        17: "Shake off bad passes immediately",
+        18: "Attention check: select Strongly Disagree",
+        19: "Seek feedback after good games",
+        20: "Do unseen defensive work",
+        21: "Never jealous of teammates",
+        22: "Enjoy learning new positions",
+        23: "Prefer safe passes over risky ones",
+        24: "100% effort in all training",
+        25: "React impulsively and regret",
+        26: "Satisfied with good performance in loss",
+        27: "Want decisive moments",
+        28: "Encourage struggling teammates",
+        29: "Determined after opponent scores",
+        30: "Lose tactical position when tired",
+        31: "Avoid high-risk actions",
+        32: "Not intimidated by physical opponents",
+        33: "Compare stats with teammates",
+        34: "Errors affect rest of game",
+        35: "Reward from mastering new skills",
+        36: "Frustrated by technique changes",
+        37: "Doubt abilities vs stronger teams",
+        38: "Difficulty refocusing after conceding",
+        39: "Prefer familiar game plans",
+        40: "100% in all drills",
+        41: "Struggle to hide frustration with teammates",
+        42: "Extra training for weaknesses",
+        43: "Routine to refocus during matches",
+        44: "Happy with current ability",
+        45: "Skill over physical aggression",
+        46: "Individual battles important",
+        47: "Avoid 50/50 challenges",
+        48: "Relax after achieving goals",
+        49: "Off-season fitness difficult",
+        50: "Not bothered by training losses",
+        51: "Never frustrated with teammates",
+        52: "Willing to put body on line",
+        53: "Enjoy physical duels",
+        54: "Quickly adapt to halftime changes",
+        55: "Frustrated when not passed to",
+        56: "Believe in highest level success",
+        57: "Question ability after poor form",
+        58: "Driven to maximize potential",
+        59: "Tune out crowd/distractions",
+        60: "Attention check: select Agree",
+        61: "Uncomfortable giving critical feedback",
+        62: "Want to be star player",
+        63: "Focus on own performance only",
+        64: "Difficulty moving past mistakes",
+        65: "Speak up in dressing room",
+        66: "Prefer high-risk plays under pressure"
+}
+
+
+def draw_header(c, generated_at, with_logo=True):
+    """Draw the header with logo and title; returns the y position below it"""
+    logo = load_logo() if with_logo else None
+    if logo:
+        # the logo fills the left column, so the title block sits to its right
+        c.drawImage(logo.reader, LEFT_MARGIN, PAGE_HEIGHT - 20 - LOGO_BOX_PT, width=LOGO_WIDTH_PT,
+                    height=LOGO_BOX_PT, preserveAspectRatio=True)
+    c.setFont("Helvetica-Bold", 16)
+    c.drawString(180, PAGE_HEIGHT - 60, "FOOTPSY — Individual Psychological Report")
+    c.setFont("Helvetica", 10)
+    c.drawString(180 if logo else LEFT_MARGIN, PAGE_HEIGHT - 85,
+                 f"Report Generated: {generated_at.strftime('%Y-%m-%d %H:%M')}")
+    return PAGE_HEIGHT - (HEADER_HEIGHT if logo else 120)
+
+
+def draw_player_info(c, y_position, player_info):
+    """Draw player information section"""
+    c.setFont("Helvetica-Bold", 12)
+    c.drawString(LEFT_MARGIN, y_position, "Player Information")
+    y_position -= LINE_HEIGHT
+
+    c.setFont("Helvetica", 10)
+    info_lines = [
+        f"Name: {player_info.get('name', 'N/A')}",
+        f"ID: {player_info.get('id', 'N/A')}",
+        f"Team: {player_info.get('team', 'N/A')}",
+        f"Position: {player_info.get('position', 'N/A')}",
+        f"Date of Birth: {player_info.get('dob') or 'N/A'}",
+        f"Age: {player_info.get('age', 'N/A')}"
+    ]
+
+    for line in info_lines:
+        c.drawString(LEFT_MARGIN, y_position, line)
+        y_position -= LINE_HEIGHT
+
+    return y_position - 10
+
+
+def draw_progress_bar(c, x, y, score, width=PROGRESS_BAR_WIDTH, height=PROGRESS_BAR_HEIGHT):
+    """Draw a progress bar for PDF"""
+    # Background
+    c.setFillColorRGB(0.94, 0.94, 0.94)  # Light gray
+    c.rect(x, y, width, height, fill=1, stroke=0)
+
+    # Determine color
+    if score >= HIGH_CUTOFF:
+        color = (0.3, 0.69, 0.3)  # Green
+    elif score >= MODERATE_CUTOFF:
+        color = (1.0, 0.65, 0.0)  # Orange
+    else:
+        color = (1.0, 0.29, 0.29)  # Red
+
+    # Progress fill
+    progress_width = (score / 5.0) * width
+    c.setFillColorRGB(*color)
+    c.rect(x, y, progress_width, height, fill=1, stroke=0)
+
+    # Border
+    c.setStrokeColorRGB(0.7, 0.7, 0.7)
+    c.rect(x, y, width, height, fill=0, stroke=1)
+
+    # Score text
+    c.setFillColorRGB(0, 0, 0)
+    c.setFont("Helvetica-Bold", 8)
+    text = f"{score:.2f}/5.00"
+    text_width = c.stringWidth(text, "Helvetica-Bold", 8)
+    c.drawString(x + (width - text_width) / 2, y + 2, text)
+
+
+def draw_domain_scores(c, y_position, domain_means):
+    """Draw domain scores section with progress bars"""
+    c.setFont("Helvetica-Bold", 12)
+    c.drawString(LEFT_MARGIN, y_position, "Psychological Domain Scores")
+    y_position -= LINE_HEIGHT + 5
+
+    c.setFont("Helvetica", 10)
+
+    # Draw in two columns
+    col_width = (RIGHT_MARGIN - LEFT_MARGIN) / 2
+    column_gap = 20
+
+    for i, scale in enumerate(CORE_SCALES):
+        score = domain_means.get(scale, 0)
+
+        # Determine column position
+        if i % 2 == 0:
+            col_x = LEFT_MARGIN
+            item_y = y_position - (i // 2) * 35
+        else:
+            col_x = LEFT_MARGIN + col_width + column_gap
+            item_y = y_position - ((i - 1) // 2) * 35
+
+        # Scale name
+        c.setFont("Helvetica-Bold", 9)
+        c.drawString(col_x, item_y, scale)
+
+        # Progress bar
+        draw_progress_bar(c, col_x, item_y - 15, score)
+
+        # Interpretation text
+        c.setFont("Helvetica", 8)
+        if score >= HIGH_CUTOFF:
+            interpretation = "High"
+            c.setFillColorRGB(0.3, 0.69, 0.3)  # Green
+        elif score >= MODERATE_CUTOFF:
+            interpretation = "Moderate"
+            c.setFillColorRGB(1.0, 0.65, 0.0)  # Orange
+        else:
+            interpretation = "Development Area"
+            c.setFillColorRGB(1.0, 0.29, 0.29)  # Red
+
+        c.drawString(col_x + PROGRESS_BAR_WIDTH + 5, item_y - 10, interpretation)
+        c.setFillColorRGB(0, 0, 0)  # Reset to black
+
+    # Calculate new y position (6 rows of content)
+    return y_position - (len(CORE_SCALES) // 2 * 35) - 20
+
+
+def draw_validity_scores(c, y_position, validity_scores):
+    """Draw validity and quality checks"""
+    c.setFont("Helvetica-Bold", 12)
+    c.drawString(LEFT_MARGIN, y_position, "Validity & Quality Checks")
+    y_position -= LINE_HEIGHT
+
+    c.setFont("Helvetica", 10)
+    validity_lines = [
+        f"Impression Management: {validity_scores['IM']:.2f}",
+        f"Inconsistency Index: {validity_scores['Inconsistency']}",
+        f"Longest Straight Run: {validity_scores['Longstring']}",
+        f"Attention Check: {'PASS' if validity_scores['AttentionPass'] else 'FAIL'}"
+    ]
+
+    for line in validity_lines:
+        c.drawString(LEFT_MARGIN, y_position, line)
+        y_position -= LINE_HEIGHT
+
+    return y_position - 10
+
+
+def draw_question_responses(c, y_position, responses):
+    """Draw all question responses with abbreviated question text in 2 columns"""
+    c.setFont("Helvetica-Bold", 12)
+    c.drawString(LEFT_MARGIN, y_position, "Complete Question Responses")
+    y_position -= LINE_HEIGHT
+
+    # Setup two columns
+    col_width = (RIGHT_MARGIN - LEFT_MARGIN) / 2
+    column_gap = 20
+    current_col = 0
+    start_x = LEFT_MARGIN
+    current_y = y_position
+
+    # Column headers
+    c.setFont("Helvetica-Bold", 9)
+    c.drawString(start_x, current_y, "Question & Response")
+    c.drawString(start_x + col_width + column_gap, current_y, "Question & Response")
+    current_y -= LINE_HEIGHT
+
+    c.setFont("Helvetica", 8)
+
+    # Draw all questions in 2 columns
+    for q_num in range(1, 67):
+        response_num = responses.get(q_num, 0)
+        response_text = RESPONSE_ABBREVIATIONS.get(response_num, "NR")
+        question_abbr = ABBREVIATED_QUESTIONS.get(q_num, f"Q{q_num}")
+
+        # Calculate position
+        if current_col == 0:
+            col_x = start_x
+        else:
+            col_x = start_x + col_width + column_gap
+
+        # Draw the line
+        line_text = f"Q{q_num:02d}: {question_abbr} [{response_text}]"
+        c.drawString(col_x, current_y, line_text)
+
+        # Move to next row/column
+        current_col += 1
+        if current_col >= 2:
+            current_col = 0
+            current_y -= LINE_HEIGHT
+
+            # Check if we need a new page
+            if current_y < 100:
+                c.showPage()
+                current_y = PAGE_HEIGHT - 50
+                c.setFont("Helvetica-Bold", 9)
+                c.drawString(start_x, current_y, "Question & Response")
+                c.drawString(start_x + col_width + column_gap, current_y, "Question & Response")
+                current_y -= LINE_HEIGHT
+                c.setFont("Helvetica", 8)
+
+    # Add response key
+    current_y -= 10
+    c.setFont("Helvetica-Bold", 8)
+    c.drawString(LEFT_MARGIN, current_y,
+                 "Response Key: SD=Strongly Disagree, D=Disagree, N=Neutral, A=Agree, SA=Strongly Agree")
+    current_y -= LINE_HEIGHT
+
+    return current_y
+
+
+def draw_recommendations(c, y_position, domain_means):
+    """Draw actionable recommendations"""
+    c.setFont("Helvetica-Bold", 12)
+    c.drawString(LEFT_MARGIN, y_position, "Actionable Recommendations")
+    y_position -= LINE_HEIGHT
+
+    c.setFont("Helvetica", 10)
+
+    # Generate personalized recommendations based on scores
+    personalized_recos = []
+
+    # Generate recommendations for each core scale
+    for scale in CORE_SCALES:
+        score = domain_means.get(scale, 0)
+        if score < MODERATE_CUTOFF:
+            personalized_recos.append(f"• Develop strategies to improve {scale.lower()}")
+        elif score > 4.0:
+            personalized_recos.append(f"• Leverage strong {scale.lower()} in team leadership")
+
+    if not personalized_recos:
+        personalized_recos = [
+            "• Continue current development path with focus on maintaining strengths",
+            "• Set specific performance targets for each psychological domain",
+            "• Regular self-reflection on mental performance after each game",
+            "• Seek regular feedback from coaches on psychological development"
+        ]
+
+    # Draw recommendations
+    for reco in personalized_recos:
+        if y_position < 100:  # Start new page if needed
+            c.showPage()
+            y_position = PAGE_HEIGHT - 100
+            c.setFont("Helvetica", 10)
+        c.drawString(LEFT_MARGIN, y_position, reco)
+        y_position -= LINE_HEIGHT
+
+    return y_position
+
+
+@timed("pdf.render")
+def render_report(player_info, domain_means, validity_scores, responses, generated_at=None, with_logo=True):
+    """Render one individual report and return the PDF bytes (no Streamlit needed)"""
+    from reportlab.pdfgen import canvas
+
+    buffer = BytesIO()
+    c = canvas.Canvas(buffer, pagesize=A4)
+
+    # Header
+    current_y = draw_header(c, generated_at or datetime.datetime.now(), with_logo)
+
+    # Player Information
+    current_y = draw_player_info(c, current_y, player_info)
+
+    # Domain Scores with Progress Bars
+    current_y = draw_domain_scores(c, current_y, domain_means)
+
+    # Validity Scores
+    current_y = draw_validity_scores(c, current_y, validity_scores)
+
+    # Question Responses (start new page if needed)
+    if current_y < 200:
+        c.showPage()
+        current_y = PAGE_HEIGHT - 50
+
+    current_y = draw_question_responses(c, current_y, responses)
+
+    # Recommendations (start new page if needed)
+    if current_y < 150:
+        c.showPage()
+        current_y = PAGE_HEIGHT - 50
+
+    draw_recommendations(c, current_y, domain_means)
+
+    # Footer
+    c.setFont("Helvetica-Oblique", 8)
+    c.drawString(LEFT_MARGIN, 30, "Confidential Psychological Assessment - For Professional Use Only")
+    c.drawString(LEFT_MARGIN, 20, "FOOTPSY Football Psychological Assessment System")
+
+    c.save()
+    return buffer.getvalue()
@@ -0,0 +1,112 @@
+"""Rescore every stored result after scales_mapping.csv (or the reverse-keyed items) changes.
+
+The local result store is read in fixed-size chunks of row ids: only the
+Q1–Q66 answers and the current score columns of one chunk are in memory at a
+time. Each chunk is rescored in one score_batch call and the rows whose
+scale or validity scores changed are written back in one transaction. After
+every chunk the last row id is saved to a checkpoint together with a
+fingerprint of the scoring plan, so an interrupted run picks up where it
+stopped; a run with a different plan starts from the beginning.
+
+    python rescore.py [--chunk 5000] [--dry-run] [--restart]
+
+Only the local store is rewritten; the Google Sheet copy keeps the scores it
+was sent. Rows without any recorded answers are left as they are.
+"""
+import argparse, json, os, time
+import numpy as np
+
+from results import QUESTION_COLUMNS, VALIDITY_COLUMNS
+from scoring import ScoringPlan, score_batch, CORE_SCALES
+
+BASE = os.path.dirname(os.path.abspath(__file__))
+MAPPING_PATH = os.path.join(BASE, "assets", "scales_mapping.csv")
+CHUNK_ROWS = 5000
+SCORE_COLUMNS = CORE_SCALES + VALIDITY_COLUMNS
+BATCH_KEYS = CORE_SCALES + ["IM", "Inconsistency", "Longstring", "AttentionPass"]  # score_batch names
+
+
+def score_matrix(out, n):
+    """score_batch output as an n x len(SCORE_COLUMNS) float matrix, in column order"""
+    return np.column_stack([np.asarray(out[key], dtype=float) if key in out else np.full(n, np.nan)
+                            for key in BATCH_KEYS])
+
+
+def load_checkpoint(path, fingerprint):
+    """Saved progress for this scoring plan, or a fresh start"""
+    try:
+        with open(path) as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        state = None
+    if not state or state.get("plan") != fingerprint:
+        state = {"plan": fingerprint, "last_id": 0, "rows": 0, "changed": 0}
+    return state
+
+
+def save_checkpoint(path, state):
+    state["updated_at"] = time.strftime("%Y-%m-%d %H:%M:%S")
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp, path)
+
+
+def rescore(store, plan, checkpoint_path, chunk_rows=CHUNK_ROWS, restart=False, dry_run=False, progress=None):
+    """Stream the store through `plan`; returns the checkpoint state after the last chunk"""
+    state = {"plan": plan.fingerprint(), "last_id": 0, "rows": 0, "changed": 0} if restart or dry_run \
+        else load_checkpoint(checkpoint_path, plan.fingerprint())
+    width = len(SCORE_COLUMNS)
+    while True:
+        ids, values = store.columns_after(state["last_id"], chunk_rows, SCORE_COLUMNS + QUESTION_COLUMNS)
+        if not ids:
+            break
+        stored, X = values[:, :width], values[:, width:]
+        new = score_matrix(score_batch(X, plan), len(ids))
+        same = (new == stored) | (np.isnan(new) & np.isnan(stored))
+        changed = ~same.all(axis=1) & ~np.isnan(X).all(axis=1)
+        if not dry_run and changed.any():
+            rows = [[None if v != v else v for v in row] for row in new[changed].tolist()]  # NaN -> NULL
+            store.update_columns([k for k, c in zip(ids, changed) if c], SCORE_COLUMNS, rows)
+        state["last_id"] = ids[-1]
+        state["rows"] += len(ids)
+        state["changed"] += int(changed.sum())
+        if not dry_run:
+            save_checkpoint(checkpoint_path, state)
+        if progress:
+            progress(state)
+    return state
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Rescore the result store in chunks with the current scales mapping")
+    ap.add_argument("--db", default=os.environ.get("FOOTPSY_DB"), help="results database (default: FOOTPSY_DB or data/)")
+    ap.add_argument("--mapping", default=MAPPING_PATH)
+    ap.add_argument("--chunk", type=int, default=CHUNK_ROWS, help="rows per chunk")
+    ap.add_argument("--checkpoint", help="progress file (default: next to the database)")
+    ap.add_argument("--restart", action="store_true", help="ignore the checkpoint and rescore everything")
+    ap.add_argument("--dry-run", action="store_true", help="count the rows that would change, write nothing")
+    args = ap.parse_args()
+
+    from storage import SQLiteResultStore, DEFAULT_STORE_PATH
+
+    store = SQLiteResultStore(args.db or DEFAULT_STORE_PATH)
+    checkpoint = args.checkpoint or f"{store.path}.rescore.json"
+    plan = ScoringPlan.from_csv(args.mapping)
+    total = store.count()
+    start = time.perf_counter()
+
+    def progress(state):
+        print(f"\r{state['rows']}/{total} rows checked, {state['changed']} changed (up to id {state['last_id']})",
+              end="", flush=True)
+
+    state = rescore(store, plan, checkpoint, args.chunk, args.restart, args.dry_run, progress)
+    print(f"\n{'Would change' if args.dry_run else 'Changed'} {state['changed']} of {state['rows']} row(s) "
+          f"in {time.perf_counter() - start:.1f}s")
+    if state["changed"] and not args.dry_run:
+        print("The admin panel shows the new scores after 🔄 Refresh data")
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+import datetime, random, string
+import numpy as np
+import pandas as pd
+from scoring import CORE_SCALES, N_ITEMS
+
+# Column layout of one results row (the header row of the results sheet)
+INFO_COLUMNS = ["Timestamp", "Player Name", "Player ID", "Team Name", "Position", "Date of Birth", "Age"]
+VALIDITY_COLUMNS = ["IM", "Inconsistency", "Longstring", "Attention Pass"]
+QUESTION_COLUMNS = [f"Q{i}" for i in range(1, N_ITEMS + 1)]
+RESULT_COLUMNS = INFO_COLUMNS + CORE_SCALES + VALIDITY_COLUMNS + QUESTION_COLUMNS + ["PDF Link"]
+# What the admin table shows by default (raw item responses are opt-in)
+SUMMARY_COLUMNS = INFO_COLUMNS + CORE_SCALES + VALIDITY_COLUMNS + ["PDF Link"]
+
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+TIMESTAMP_INDEX = RESULT_COLUMNS.index("Timestamp")
+PLAYER_ID_INDEX = RESULT_COLUMNS.index("Player ID")
+
+
+def generate_player_id(now=None):
+    """FPY-MM-YYYY-XXXXXX, for players who do not have an ID"""
+    rand = ''.join(random.choices(string.ascii_uppercase + string.digits, k=6))
+    now = now or datetime.datetime.now()
+    return f"FPY-{now.month:02d}-{now.year}-{rand}"
+
+
+def build_result_row(player_info, domain_scores, validity_scores, responses, pdf_link="", timestamp=None):
+    """Flatten one assessment into the list of values for RESULT_COLUMNS"""
+    row = [
+        (timestamp or datetime.datetime.now()).strftime(TIMESTAMP_FORMAT),
+        player_info.get("name", "N/A"),
+        player_info.get("id", "N/A"),
+        player_info.get("team", "N/A"),
+        player_info.get("position", "N/A"),
+        player_info.get("dob", "N/A"),
+        player_info.get("age", "N/A"),
+    ]
+
+    # Add domain scores
+    for domain in CORE_SCALES:
+        val = domain_scores.get(domain, "")
+        row.append(round(val, 2) if isinstance(val, (int, float)) else "")
+
+    # Add validity & quality checks
+    row.extend([
+        validity_scores.get("IM", ""),
+        validity_scores.get("Inconsistency", ""),
+        validity_scores.get("Longstring", ""),
+        validity_scores.get("AttentionPass", "")
+    ])
+
+    # Add all individual question responses
+    for i in range(1, N_ITEMS + 1):
+        row.append(responses.get(i, ""))
+
+    # Add PDF link
+    row.append(pdf_link if pdf_link else "Not saved")
+    return row
+
+
+def result_key(row):
+    """Idempotency key of a results row: player ID + timestamp"""
+    return f"{row[PLAYER_ID_INDEX]}@{row[TIMESTAMP_INDEX]}"
+
+
+def response_matrix(df):
+    """Q1–Q66 columns of a results frame as an N x 66 float matrix (blank = NaN)"""
+    return df.reindex(columns=QUESTION_COLUMNS).apply(pd.to_numeric, errors="coerce").to_numpy(dtype=float)
+
+
+def player_info_from_row(row):
+    return {
+        "name": row.get("Player Name", "N/A"),
+        "id": row.get("Player ID", "N/A"),
+        "team": row.get("Team Name", "N/A"),
+        "position": row.get("Position", "N/A"),
+        "dob": row.get("Date of Birth", "N/A"),
+        "age": row.get("Age", "N/A"),
+    }
+
+
+def responses_from_vector(values):
+    return {i: int(v) for i, v in enumerate(values, start=1) if not np.isnan(v)}
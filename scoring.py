@@ -1,15 +1,23 @@
+import hashlib
 import numpy as np
+import pandas as pd
+from metrics import timed
 def reverse_score(val):
     if val is None or (isinstance(val,float) and np.isnan(val)):
         return val
     return 6 - val
 
+def answer(responses, item):
+    """responses[item], with NaN read as unanswered like a missing key (as score_batch does)"""
+    v = responses.get(item)
+    return None if isinstance(v, float) and np.isnan(v) else v
+
 def compute_domain_means(responses, mapping, reverse_items):
     domain_means = {}
     for scale, items in mapping.items():
         vals = []
         for i in items:
-            v = responses.get(i, None)
+            v = answer(responses, i)
             if v is None:
                 continue
             if i in reverse_items:
@@ -21,7 +29,7 @@ def compute_domain_means(responses, mapping, reverse_items):
 def compute_im_score(responses, im_items, reverse_items):
     vals = []
     for i in im_items:
-        v = responses.get(i, None)
+        v = answer(responses, i)
         if v is None:
             continue
         if i in reverse_items:
@@ -32,14 +40,14 @@ def compute_im_score(responses, im_items, reverse_items):
 def inconsistency_index(responses, pairs):
     diffs = []
     for a,b in pairs:
-        va = responses.get(a,None); vb = responses.get(b,None)
+        va = answer(responses, a); vb = answer(responses, b)
         if va is None or vb is None:
             continue
         diffs.append(abs(va - vb))
     return round(float(np.nanmean(diffs)),3) if diffs else np.nan
 
 def max_longstring(responses):
-    seq = [responses.get(i) for i in range(1,67) if responses.get(i) is not None]
+    seq = [answer(responses, i) for i in range(1,67) if answer(responses, i) is not None]
     if not seq:
         return 0
     run = 1; max_run = 1
@@ -51,3 +59,125 @@ def max_longstring(responses):
             run = 1
     return max_run
 
+
+# ======= SCORING PLAN =======
+N_ITEMS = 66
+REVERSE_ITEMS = [7, 14, 23, 25, 26, 30, 31, 34, 36, 37, 38, 39, 41, 44, 45, 47, 48, 49, 50, 55, 57, 61, 62, 63, 64]
+INCONSISTENCY_PAIRS = [(17,64),(6,25),(22,39),(4,49)]
+IM_SCALE = "Impression Management"
+# Band cutoffs used on the results page and in the PDF (High / Moderate / Development Area)
+HIGH_CUTOFF = 4.2
+MODERATE_CUTOFF = 3.0
+BANDS = ["High", "Moderate", "Development Area"]
+CORE_SCALES = [
+    "Resilience", "Self-Discipline", "Competitiveness",
+    "Achievement Motivation", "Focus & Concentration",
+    "Confidence", "Emotional Control", "Coachability & Adaptability",
+    "Risk-Taking", "Team Orientation", "Leadership & Influence",
+    "Aggressiveness & Bravery"
+]
+
+def _item_index(items):
+    return np.asarray([int(i) - 1 for i in items], dtype=np.intp)
+
+class ScoringPlan:
+    """Item->scale layout compiled once into index arrays for vectorized scoring."""
+    def __init__(self, mapping, reverse_items=REVERSE_ITEMS, pairs=INCONSISTENCY_PAIRS, im_scale=IM_SCALE):
+        self.scale_items = {scale: [int(i) for i in items] for scale, items in mapping.items()}
+        self.scales = list(self.scale_items)
+        self.scale_index = {scale: _item_index(items) for scale, items in self.scale_items.items()}
+        self.reverse_items = sorted(int(i) for i in reverse_items)
+        self.reverse_mask = np.zeros(N_ITEMS, dtype=bool)
+        self.reverse_mask[_item_index(self.reverse_items)] = True
+        self.im_items = self.scale_items.get(im_scale, [])
+        self.im_index = _item_index(self.im_items)
+        self.pairs = [(int(a), int(b)) for a, b in pairs]
+        self.pair_a = _item_index([a for a, _ in self.pairs])
+        self.pair_b = _item_index([b for _, b in self.pairs])
+
+    def fingerprint(self):
+        """Stable hash of everything that affects scores, to tell whether stored scores are current"""
+        layout = (sorted(self.scale_items.items()), self.reverse_items, self.pairs, self.im_items)
+        return hashlib.sha256(repr(layout).encode()).hexdigest()[:16]
+
+    @classmethod
+    def from_csv(cls, path, **kwargs):
+        mapping = {}
+        for scale, item in pd.read_csv(path)[["Scale", "Item"]].itertuples(index=False):
+            mapping.setdefault(scale, []).append(int(item))
+        return cls(mapping, **kwargs)
+
+@timed("score.batch")
+def score_batch(responses, plan):
+    """Score an N x 66 response matrix (NaN = unanswered) in one pass.
+
+    Returns a dict of length-N arrays: one per scale in the plan, plus
+    "IM" (average, as shown on the results page), "Inconsistency",
+    "Longstring" and "AttentionPass". Values match the per-player functions.
+    """
+    X = np.asarray(responses, dtype=float)
+    if X.ndim == 1:
+        X = X[None, :]
+    if X.shape[1] != N_ITEMS:
+        raise ValueError(f"expected {N_ITEMS} item columns, got {X.shape[1]}")
+
+    keyed = np.where(plan.reverse_mask, 6 - X, X)
+    answered = ~np.isnan(keyed)
+    filled = np.where(answered, keyed, 0.0)
+
+    out = {}
+    with np.errstate(invalid="ignore", divide="ignore"):
+        for scale, idx in plan.scale_index.items():
+            n = answered[:, idx].sum(axis=1)
+            out[scale] = np.round(filled[:, idx].sum(axis=1) / n, 2)
+
+        idx = plan.im_index
+        n = answered[:, idx].sum(axis=1)
+        im_sum = np.where(n > 0, filled[:, idx].sum(axis=1), np.nan)
+        out["IM"] = np.round(im_sum, 2) / len(idx) if len(idx) else np.full(len(X), np.nan)
+
+        diffs = np.abs(X[:, plan.pair_a] - X[:, plan.pair_b])
+        ok = ~np.isnan(diffs)
+        out["Inconsistency"] = np.round(np.where(ok, diffs, 0.0).sum(axis=1) / ok.sum(axis=1), 3)
+
+    out["Longstring"] = max_longstring_batch(X)
+    out["AttentionPass"] = (X[:, 17] == 1) & (X[:, 59] == 4)
+    return out
+
+@timed("score.one")
+def score_one(responses, plan):
+    """Score one {item: value} dict; returns (domain_means, validity_scores)."""
+    return scores_at(score_batch(responses_matrix([responses]), plan), 0, plan)
+
+def scores_at(out, n, plan):
+    """Row n of a score_batch result as (domain_means, validity_scores)"""
+    domain_means = {scale: float(out[scale][n]) for scale in plan.scales}
+    validity_scores = {
+        "IM": float(out["IM"][n]),
+        "Inconsistency": float(out["Inconsistency"][n]),
+        "Longstring": int(out["Longstring"][n]),
+        "AttentionPass": bool(out["AttentionPass"][n]),
+    }
+    return domain_means, validity_scores
+
+def max_longstring_batch(X):
+    X = np.asarray(X, dtype=float)
+    missing = np.isnan(X)
+    # push unanswered items to the end of each row, keeping answer order
+    order = np.argsort(missing, axis=1, kind="stable")
+    seq = np.take_along_axis(X, order, axis=1)
+    same = seq[:, 1:] == seq[:, :-1]
+    runs = np.cumsum(same, axis=1)
+    runs = runs - np.maximum.accumulate(np.where(same, 0, runs), axis=1)
+    longest = runs.max(axis=1, initial=0) + 1
+    return np.where(missing.all(axis=1), 0, longest).astype(int)
+
+def responses_matrix(records):
+    """Stack per-player {item: value} dicts into an N x 66 float matrix."""
+    X = np.full((len(records), N_ITEMS), np.nan)
+    for r, responses in enumerate(records):
+        for i in range(1, N_ITEMS + 1):
+            v = responses.get(i)
+            if v is not None:
+                X[r, i - 1] = v
+    return X
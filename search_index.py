@@ -0,0 +1,109 @@
+import bisect
+from collections import defaultdict
+import numpy as np
+
+SEARCH_FIELDS = ["Player Name", "Player ID", "Team Name"]
+GRAM = 3
+
+
+def normalize(value):
+    return str(value).strip().casefold()
+
+
+class FieldIndex:
+    """Substring/prefix index over the distinct values of one column.
+
+    Each distinct normalized value gets an id and trigrams map to the ids of
+    the values containing them. A query intersects the postings of its
+    trigrams and only re-checks the few surviving values; queries shorter
+    than a trigram scan the distinct values, not the rows.
+    """
+
+    def __init__(self, values=()):
+        self.values = []
+        self.value_id = {}
+        self.rows = []
+        self.row_value = []
+        self.postings = defaultdict(list)
+        self.size = 0
+        self.extend(values)
+
+    def extend(self, values):
+        """Index rows appended after the ones already indexed"""
+        for offset, value in enumerate(values):
+            v = normalize(value)
+            i = self.value_id.get(v)
+            if i is None:
+                i = self.value_id[v] = len(self.values)
+                self.values.append(v)
+                self.rows.append([])
+                for g in {v[k:k + GRAM] for k in range(len(v) - GRAM + 1)}:
+                    self.postings[g].append(i)
+            self.rows[i].append(self.size + offset)
+            self.row_value.append(i)
+        self.size += len(values)
+        self.sorted_values = sorted(self.values)
+        self._row_value = np.asarray(self.row_value, dtype=np.int64)
+
+    def _value_ids(self, query):
+        if len(query) < GRAM:
+            return [i for i, v in enumerate(self.values) if query in v]
+        trigrams = {query[k:k + GRAM] for k in range(len(query) - GRAM + 1)}
+        postings = sorted((self.postings.get(g, ()) for g in trigrams), key=len)
+        if not postings[0]:
+            return []
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            candidates.intersection_update(posting)
+        return [i for i in candidates if query in self.values[i]]
+
+    def _rows(self, value_ids):
+        value_ids = list(value_ids)
+        if len(value_ids) <= 64:
+            # selective query: gather the few row lists directly
+            return np.fromiter((r for i in value_ids for r in self.rows[i]), dtype=np.int64)
+        hit = np.zeros(len(self.values), dtype=bool)
+        hit[value_ids] = True
+        return np.flatnonzero(hit[self._row_value])
+
+    def contains(self, query):
+        """Row positions whose value contains `query` (case-insensitive)"""
+        return self._rows(self._value_ids(normalize(query)))
+
+    def prefix(self, query):
+        """Row positions whose value starts with `query` (binary search over sorted values)"""
+        query = normalize(query)
+        lo = bisect.bisect_left(self.sorted_values, query)
+        hi = bisect.bisect_left(self.sorted_values, query + "\U0010ffff")
+        return self._rows(self.value_id[v] for v in self.sorted_values[lo:hi])
+
+
+class SearchIndex:
+    def __init__(self, df, fields=SEARCH_FIELDS):
+        self.size = 0
+        self.fields = {f: FieldIndex() for f in fields if f in df.columns}
+        self.extend(df)
+
+    def extend(self, df):
+        """Index rows appended to the frame since it was last indexed"""
+        for field, index in self.fields.items():
+            index.extend(df[field].fillna("").tolist())
+        self.size += len(df)
+
+    def search(self, mode="contains", within=None, **queries):
+        """Row positions matching every non-empty {field: query}; None when there is nothing to filter.
+
+        The index is shared and may already cover rows a later sync appended;
+        `within` (the length of the caller's frame) drops positions past its end.
+        """
+        matched = None
+        for field, query in queries.items():
+            if not normalize(query or "") or field not in self.fields:
+                continue
+            rows = getattr(self.fields[field], mode)(query)
+            matched = rows if matched is None else np.intersect1d(matched, rows, assume_unique=True)
+        if matched is None:
+            return None
+        if within is not None:
+            matched = matched[matched < within]
+        return np.sort(matched)
@@ -0,0 +1,308 @@
+import json, os, re, sqlite3, threading, time, uuid
+from contextlib import contextmanager
+from results import RESULT_COLUMNS, PLAYER_ID_INDEX, result_key
+from metrics import span, incr
+
+BASE = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_SPOOL_PATH = os.path.join(BASE, "data", "sheet_spool.sqlite3")
+PDF_LINK_INDEX = RESULT_COLUMNS.index("PDF Link")
+BUSY_TIMEOUT = 30.0  # seconds a local database write waits for another process's write lock
+
+
+CLAIM_LEASE = 300.0  # seconds a flush owns the rows it claimed; a crashed owner's rows free up after this
+
+
+@contextmanager
+def transaction(db, immediate=False):
+    """BEGIN ... COMMIT on an autocommit (isolation_level=None) connection. Anything failing
+    inside, COMMIT included, rolls back, so a shared connection is never left mid-transaction.
+    `immediate` takes the write lock up front, so what is read inside cannot change underneath"""
+    db.execute("BEGIN IMMEDIATE" if immediate else "BEGIN")
+    try:
+        yield db
+        db.execute("COMMIT")
+    except BaseException:
+        if db.in_transaction:
+            db.execute("ROLLBACK")
+        raise
+
+
+def column_letter(n):
+    letters = ""
+    while n:
+        n, rem = divmod(n - 1, 26)
+        letters = chr(65 + rem) + letters
+    return letters
+
+
+def claim_owner():
+    """Identifies one writer among the processes sharing a queue file"""
+    return f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+
+
+def add_claim_columns(db, table):
+    existing = {c[1] for c in db.execute(f"PRAGMA table_info({table})")}
+    for column, kind in (("claimed_by", "TEXT"), ("claimed_until", "REAL")):
+        if column not in existing:
+            db.execute(f"ALTER TABLE {table} ADD COLUMN {column} {kind}")
+
+
+def claim_rows(db, table, columns, pending, owner, limit, lease=CLAIM_LEASE):
+    """Claim up to `limit` `pending` rows that no other writer holds, oldest first; returns
+    their `columns` (id first). Queue files are shared by the app and the command-line
+    tools, so the claim is made under the database write lock, not a thread lock"""
+    now = time.time()
+    with transaction(db, immediate=True):
+        rows = db.execute(f"SELECT {columns} FROM {table} WHERE {pending} "
+                          "AND (claimed_until IS NULL OR claimed_until < ? OR claimed_by = ?) ORDER BY id LIMIT ?",
+                          (now, owner, limit)).fetchall()
+        db.executemany(f"UPDATE {table} SET claimed_by = ?, claimed_until = ? WHERE id = ?",
+                       [(owner, now + lease, r[0]) for r in rows])
+    return rows
+
+
+def release_rows(db, table, owner, ids):
+    """Give claimed rows back, e.g. after a failed send, so any writer can retry them"""
+    db.executemany(f"UPDATE {table} SET claimed_by = NULL, claimed_until = NULL WHERE id = ? AND claimed_by = ?",
+                   [(i, owner) for i in ids])
+
+
+def sheet_rows_by_key(sheet):
+    """{result key: 1-based sheet row} of every row already in the sheet"""
+    values = sheet.get_values(f"A:{column_letter(PLAYER_ID_INDEX + 1)}")
+    return {result_key(r): number for number, r in enumerate(values, start=1) if len(r) > PLAYER_ID_INDEX}
+
+
+def first_updated_row(response):
+    """1-based first row number from a values.append response, None if absent"""
+    updated = ((response or {}).get("updates") or {}).get("updatedRange", "")
+    match = re.search(r"![A-Z]+(\d+)", updated)
+    return int(match.group(1)) if match else None
+
+
+class DirectSheetWriter:
+    """Appends each row immediately (one API call per result)"""
+
+    def __init__(self, sheet_getter):
+        self.sheet_getter = sheet_getter
+
+    def append(self, row):
+        with span("sheets.append_row"):
+            return first_updated_row(self.sheet_getter().append_row(row))
+
+    def append_many(self, rows):
+        """All rows in one append_rows call; returns their sheet row numbers"""
+        if not rows:
+            return []
+        with span("sheets.append_rows"):
+            start = first_updated_row(self.sheet_getter().append_rows(rows))
+        return [start + offset if start else None for offset in range(len(rows))]
+
+    def recover(self, row):
+        """Sheet row number of `row` if an earlier append landed (e.g. then timed out), else None"""
+        with span("sheets.get_values"):
+            return sheet_rows_by_key(self.sheet_getter()).get(result_key(row))
+
+    def set_pdf_link(self, key, link):
+        if key:
+            with span("sheets.update_cell"):
+                self.sheet_getter().update_cell(key, PDF_LINK_INDEX + 1, link)
+
+
+class BufferedSheetWriter:
+    """Write-behind buffer: rows are spooled to SQLite and flushed with one append_rows call.
+
+    A flush happens once `max_rows` are pending or the oldest pending row is
+    `max_delay` seconds old. Rows survive a restart in the spool and go out on
+    the next flush. A batch is marked as sent before append_rows; if it was
+    never confirmed (crash, timeout) the next flush first looks its rows up in
+    the sheet by player ID + timestamp and only resends the missing ones.
+
+    The spool file may be shared with other processes (outbox.py, paper_import.py):
+    a flush claims its batch in the database before sending, so two writers never
+    send the same row.
+    """
+
+    def __init__(self, sheet_getter, spool_path=DEFAULT_SPOOL_PATH, max_rows=25, max_delay=10.0, keep_flushed=86400):
+        self.sheet_getter = sheet_getter
+        self.max_rows = max_rows
+        self.max_delay = max_delay
+        self.keep_flushed = keep_flushed
+        if spool_path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(spool_path)), exist_ok=True)
+        self.db = sqlite3.connect(spool_path, timeout=BUSY_TIMEOUT, check_same_thread=False, isolation_level=None)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("""CREATE TABLE IF NOT EXISTS spool (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            row TEXT NOT NULL,
+            queued_at REAL NOT NULL,
+            flushed_at REAL,
+            sheet_row INTEGER)""")
+        if "sent_at" not in {c[1] for c in self.db.execute("PRAGMA table_info(spool)")}:
+            self.db.execute("ALTER TABLE spool ADD COLUMN sent_at REAL")
+        add_claim_columns(self.db, "spool")
+        self.owner = claim_owner()
+        self.db.execute("CREATE INDEX IF NOT EXISTS spool_pending ON spool (flushed_at, id)")
+        self._lock = threading.RLock()
+        self._flush_lock = threading.Lock()
+        self._in_flight = set()
+        self._wake = threading.Condition(self._lock)
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="footpsy-sheet-writer", daemon=True)
+        self._thread.start()
+
+    def append(self, row):
+        """Spool one row durably; returns its spool id"""
+        return self.append_many([row])[0]
+
+    def append_many(self, rows):
+        """Spool rows in one transaction; returns their spool ids"""
+        now = time.time()
+        with self._lock:
+            with transaction(self.db):
+                ids = [self.db.execute("INSERT INTO spool (row, queued_at) VALUES (?, ?)",
+                                       (json.dumps(row), now)).lastrowid for row in rows]
+            if self.pending_count() >= self.max_rows:
+                self._wake.notify()
+            return ids
+
+    def recover(self, row):
+        """Spool id of `row` if an earlier append spooled it, else None"""
+        key = result_key(row)
+        with self._lock:
+            for spool_id, stored in self.db.execute("SELECT id, row FROM spool ORDER BY id DESC"):
+                if result_key(json.loads(stored)) == key:
+                    return spool_id
+        return None
+
+    def set_pdf_link(self, key, link):
+        """Fill in the PDF link: in the spooled row if not flushed yet, else in the sheet"""
+        while True:
+            with self._lock:
+                if key not in self._in_flight:
+                    # under the write lock: a flush in another process either sees the new link
+                    # when it records its batch (and writes it to the sheet) or has recorded it already
+                    with transaction(self.db, immediate=True):
+                        found = self.db.execute("SELECT row, flushed_at, sheet_row FROM spool WHERE id = ?",
+                                                (key,)).fetchone()
+                        if found is None:
+                            return
+                        row, flushed_at, sheet_row = found
+                        if flushed_at is None:
+                            row = json.loads(row)
+                            row[PDF_LINK_INDEX] = link
+                            self.db.execute("UPDATE spool SET row = ? WHERE id = ?", (json.dumps(row), key))
+                            return
+                    break
+            # the row is being sent right now: wait for that batch to land
+            with self._flush_lock:
+                pass
+        if sheet_row:
+            with span("sheets.update_cell"):
+                self.sheet_getter().update_cell(sheet_row, PDF_LINK_INDEX + 1, link)
+
+    def pending_count(self):
+        with self._lock:
+            return self.db.execute("SELECT COUNT(*) FROM spool WHERE flushed_at IS NULL").fetchone()[0]
+
+    def flush(self):
+        """Send every pending row in batches of max_rows; returns the number flushed"""
+        total = 0
+        with self._flush_lock:
+            while True:
+                with self._lock:
+                    batch = claim_rows(self.db, "spool", "id, row, sent_at", "flushed_at IS NULL", self.owner,
+                                       self.max_rows)
+                    self._in_flight = {spool_id for spool_id, _, _ in batch}
+                if not batch:
+                    break
+                try:
+                    if any(sent_at for _, _, sent_at in batch):
+                        batch = self._reconcile(batch)
+                        if not batch:
+                            continue
+                    with self._lock:
+                        self.db.executemany("UPDATE spool SET sent_at = ? WHERE id = ?",
+                                            [(time.time(), spool_id) for spool_id, _, _ in batch])
+                    # network call outside the lock so append() never waits on the Sheets API
+                    with span("sheets.append_rows"):
+                        response = self.sheet_getter().append_rows([json.loads(row) for _, row, _ in batch])
+                except Exception:
+                    with self._lock:
+                        release_rows(self.db, "spool", self.owner, list(self._in_flight))
+                        self._in_flight = set()
+                    raise
+                start = first_updated_row(response)
+                now = time.time()
+                with self._lock:
+                    try:
+                        with transaction(self.db, immediate=True):
+                            for offset, (spool_id, _, _) in enumerate(batch):
+                                self.db.execute("UPDATE spool SET flushed_at = ?, sheet_row = ? WHERE id = ?",
+                                                (now, start + offset if start else None, spool_id))
+                            current = dict(self.db.execute(
+                                f"SELECT id, row FROM spool WHERE id IN ({', '.join('?' for _ in batch)})",
+                                [spool_id for spool_id, _, _ in batch]))
+                    finally:
+                        self._in_flight = set()
+                # links another process filled in while the batch was on its way
+                late = [(start + offset, json.loads(current[spool_id])[PDF_LINK_INDEX])
+                        for offset, (spool_id, row, _) in enumerate(batch) if start and current.get(spool_id) != row]
+                for sheet_row, link in late:
+                    with span("sheets.update_cell"):
+                        self.sheet_getter().update_cell(sheet_row, PDF_LINK_INDEX + 1, link)
+                total += len(batch)
+                incr("sheets.rows_flushed", len(batch))
+            with self._lock:
+                self.db.execute("DELETE FROM spool WHERE flushed_at < ?", (time.time() - self.keep_flushed,))
+        return total
+
+    def _reconcile(self, batch):
+        """Mark rows of an unconfirmed batch that already reached the sheet as flushed; return the rest"""
+        incr("sheets.reconciles")
+        with span("sheets.reconcile"):
+            landed = sheet_rows_by_key(self.sheet_getter())
+        remaining, now = [], time.time()
+        with self._lock:
+            for spool_id, row, sent_at in batch:
+                sheet_row = landed.get(result_key(json.loads(row))) if sent_at else None
+                if sheet_row:
+                    self.db.execute("UPDATE spool SET flushed_at = ?, sheet_row = ? WHERE id = ?",
+                                    (now, sheet_row, spool_id))
+                else:
+                    remaining.append((spool_id, row, sent_at))
+            self._in_flight = {spool_id for spool_id, _, _ in remaining}
+        return remaining
+
+    def _due(self):
+        if self.pending_count() >= self.max_rows:
+            return True
+        with self._lock:
+            oldest = self.db.execute("SELECT MIN(queued_at) FROM spool WHERE flushed_at IS NULL").fetchone()[0]
+        return oldest is not None and time.time() - oldest >= self.max_delay
+
+    def _run(self):
+        poll = self.max_delay / 2
+        wait = poll
+        while True:
+            with self._lock:
+                if not self._closed:
+                    self._wake.wait(timeout=wait)
+                if self._closed:
+                    return
+            try:
+                if self._due():
+                    self.flush()
+                wait = poll
+            except Exception:
+                # rows stay spooled; back off up to a few minutes before retrying
+                wait = min(max(wait, self.max_delay) * 2, 300)
+
+    def close(self, flush=True):
+        with self._lock:
+            self._closed = True
+            self._wake.notify()
+        self._thread.join(timeout=5)
+        if flush:
+            self.flush()
+        self.db.close()
@@ -0,0 +1,276 @@
+import os, sqlite3, threading
+from abc import ABC, abstractmethod
+import pandas as pd
+from results import RESULT_COLUMNS, QUESTION_COLUMNS, PLAYER_ID_INDEX, TIMESTAMP_INDEX, result_key
+from scoring import CORE_SCALES
+from sheet_writer import (DirectSheetWriter, BufferedSheetWriter, DEFAULT_SPOOL_PATH, BUSY_TIMEOUT, column_letter,
+                          transaction)
+from metrics import span
+
+BASE = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_STORE_PATH = os.path.join(BASE, "data", "results.sqlite3")
+
+REAL_COLUMNS = set(CORE_SCALES) | {"IM", "Inconsistency"}
+INTEGER_COLUMNS = set(QUESTION_COLUMNS) | {"Longstring", "Attention Pass"}
+
+
+def _sql_type(column):
+    if column in REAL_COLUMNS:
+        return "REAL"
+    if column in INTEGER_COLUMNS:
+        return "INTEGER"
+    return "TEXT"
+
+
+def _quote(column):
+    return '"' + column.replace('"', '""') + '"'
+
+
+def _clean(column, value):
+    if value == "" and column in REAL_COLUMNS | INTEGER_COLUMNS:
+        return None
+    if isinstance(value, str) and column in INTEGER_COLUMNS and value.upper() in ("TRUE", "FALSE"):
+        return int(value.upper() == "TRUE")
+    return value
+
+
+def coerce_types(df):
+    """Sheet values arrive as text; make score and item columns numeric like the local store"""
+    for column in REAL_COLUMNS | INTEGER_COLUMNS:
+        if column in df.columns:
+            if column == "Attention Pass":
+                df[column] = df[column].map({"TRUE": 1, "FALSE": 0, True: 1, False: 0})
+            else:
+                df[column] = pd.to_numeric(df[column], errors="coerce")
+    return df
+
+
+class ResultStore(ABC):
+    """Where completed assessments live. Rows are lists in RESULT_COLUMNS order.
+
+    Stores double as result-pipeline writers (append + recover + set_pdf_link).
+    """
+
+    def append(self, row):
+        return self.append_many([row])[0]
+
+    @abstractmethod
+    def append_many(self, rows):
+        """Store rows; returns one key per row for set_pdf_link"""
+
+    @abstractmethod
+    def recover(self, row):
+        """The key of `row` if an earlier append stored it, finishing any step that
+        append did not reach; None if it was not stored (so appending it is safe)"""
+
+    @abstractmethod
+    def set_pdf_link(self, key, link):
+        """Fill in the PDF link of the row stored under `key`"""
+
+    def count(self):
+        return len(self.frame())
+
+    def frame(self):
+        """Every stored result as a DataFrame with RESULT_COLUMNS"""
+        return self.frame_since(None)[0]
+
+    @abstractmethod
+    def frame_since(self, marker):
+        """Rows added after `marker` (None = everything); returns (frame, new marker)"""
+
+    def query(self, player_id=None, team=None, since=None, until=None):
+        df = self.frame()
+        if player_id is not None:
+            df = df[df["Player ID"] == player_id]
+        if team is not None:
+            df = df[df["Team Name"] == team]
+        if since is not None:
+            df = df[df["Timestamp"] >= since]
+        if until is not None:
+            df = df[df["Timestamp"] < until]
+        return df
+
+
+class SQLiteResultStore(ResultStore):
+    """Embedded local store, indexed by player ID, team and timestamp.
+
+    An optional `mirror` (e.g. BufferedSheetWriter) receives every row and link
+    too, so the Google Sheet stays a copy without being on the hot path.
+    """
+
+    def __init__(self, path=DEFAULT_STORE_PATH, mirror=None):
+        self.path = path
+        self.mirror = mirror
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.db = sqlite3.connect(path, timeout=BUSY_TIMEOUT, check_same_thread=False, isolation_level=None)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self._lock = threading.RLock()
+        columns = ", ".join(f"{_quote(c)} {_sql_type(c)}" for c in RESULT_COLUMNS)
+        self.db.execute(f"CREATE TABLE IF NOT EXISTS results (id INTEGER PRIMARY KEY AUTOINCREMENT, {columns}, mirror_key)")
+        self.db.execute('CREATE INDEX IF NOT EXISTS results_player ON results ("Player ID", "Timestamp")')
+        self.db.execute('CREATE INDEX IF NOT EXISTS results_team ON results ("Team Name", "Timestamp")')
+        self.db.execute('CREATE INDEX IF NOT EXISTS results_timestamp ON results ("Timestamp")')
+        self._insert = (f"INSERT INTO results ({', '.join(_quote(c) for c in RESULT_COLUMNS)}) "
+                        f"VALUES ({', '.join('?' for _ in RESULT_COLUMNS)})")
+
+    def append_many(self, rows, mirror=True):
+        keys = []
+        with self._lock, span("store.append"):
+            with transaction(self.db):
+                for row in rows:
+                    cur = self.db.execute(self._insert, [_clean(c, v) for c, v in zip(RESULT_COLUMNS, row)])
+                    keys.append(cur.lastrowid)
+        if mirror and self.mirror is not None:
+            mirror_keys = self.mirror.append_many(rows)
+            with self._lock:
+                self.db.executemany("UPDATE results SET mirror_key = ? WHERE id = ?", zip(mirror_keys, keys))
+        return keys
+
+    def recover(self, row):
+        with self._lock:
+            found = self.db.execute('SELECT id, mirror_key FROM results WHERE "Player ID" = ? AND "Timestamp" = ? '
+                                    'ORDER BY id LIMIT 1', (row[PLAYER_ID_INDEX], row[TIMESTAMP_INDEX])).fetchone()
+        if found is None:
+            return None
+        key, mirror_key = found
+        if self.mirror is not None and mirror_key is None:
+            # the local insert landed but the mirror step failed: redo only that
+            mirror_key = self.mirror.recover(row)
+            if mirror_key is None:
+                mirror_key = self.mirror.append(row)
+            with self._lock:
+                self.db.execute("UPDATE results SET mirror_key = ? WHERE id = ?", (mirror_key, key))
+        return key
+
+    def set_pdf_link(self, key, link):
+        with self._lock:
+            self.db.execute('UPDATE results SET "PDF Link" = ? WHERE id = ?', (link, key))
+            found = self.db.execute("SELECT mirror_key FROM results WHERE id = ?", (key,)).fetchone()
+        if self.mirror is not None and found and found[0] is not None:
+            self.mirror.set_pdf_link(found[0], link)
+
+    def count(self):
+        with self._lock:
+            return self.db.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def _select(self, where="", params=()):
+        columns = ", ".join(_quote(c) for c in RESULT_COLUMNS)
+        with self._lock, span("store.select"):
+            df = pd.read_sql_query(f"SELECT id, {columns} FROM results {where} ORDER BY id", self.db, params=params)
+        return df.set_index("id")
+
+    def frame_since(self, marker):
+        df = self._select("WHERE id > ?", (marker or 0,))
+        return df, int(df.index.max()) if len(df) else (marker or 0)
+
+    def query(self, player_id=None, team=None, since=None, until=None):
+        clauses, params = [], []
+        for column, op, value in (("Player ID", "=", player_id), ("Team Name", "=", team),
+                                  ("Timestamp", ">=", since), ("Timestamp", "<", until)):
+            if value is not None:
+                clauses.append(f"{_quote(column)} {op} ?")
+                params.append(value)
+        return self._select("WHERE " + " AND ".join(clauses) if clauses else "", params)
+
+    def columns_after(self, marker, limit, columns):
+        """(row ids, len(ids) x len(columns) float matrix, blank = NaN) of at most `limit`
+        rows after id `marker`; lets a pass over the whole table run in bounded memory"""
+        select = ", ".join(_quote(c) for c in columns)
+        with self._lock, span("store.select"):
+            rows = self.db.execute(f"SELECT id, {select} FROM results WHERE id > ? ORDER BY id LIMIT ?",
+                                   (marker, limit)).fetchall()
+        ids = [row[0] for row in rows]
+        # text left in a numeric column (e.g. "N/A" from an imported sheet) reads as blank
+        values = pd.DataFrame([row[1:] for row in rows], columns=columns).apply(pd.to_numeric, errors="coerce")
+        return ids, values.to_numpy(dtype=float)
+
+    def update_columns(self, ids, columns, values):
+        """Overwrite `columns` of the rows `ids` (one value sequence per row) in one transaction"""
+        assignments = ", ".join(f"{_quote(c)} = ?" for c in columns)
+        with self._lock, span("store.update"):
+            with transaction(self.db):
+                self.db.executemany(f"UPDATE results SET {assignments} WHERE id = ?",
+                                    ([*row, key] for key, row in zip(ids, values)))
+
+    def import_records(self, records):
+        """Copy sheet records ({column: value} dicts) in without mirroring them back.
+        Results already stored (same player ID + timestamp) are skipped, so this can be
+        re-run to backfill whatever the sheet has that the store lacks; returns the number added"""
+        rows = [[record.get(c, "") for c in RESULT_COLUMNS] for record in records]
+        with self._lock:
+            stored = {f"{player_id}@{timestamp}"
+                      for player_id, timestamp in self.db.execute('SELECT "Player ID", "Timestamp" FROM results')}
+            missing = []
+            for row in rows:
+                key = result_key(row)
+                if key not in stored:
+                    stored.add(key)
+                    missing.append(row)
+            return len(self.append_many(missing, mirror=False))
+
+    def close(self):
+        self.db.close()
+
+
+class SheetsResultStore(ResultStore):
+    """Legacy mode: the Google Sheet is the only copy (every read is a full get_all_records)"""
+
+    def __init__(self, sheet_getter, writer=None):
+        self.sheet_getter = sheet_getter
+        self.writer = writer or DirectSheetWriter(sheet_getter)
+
+    def append_many(self, rows):
+        return self.writer.append_many(rows)
+
+    def recover(self, row):
+        return self.writer.recover(row)
+
+    def set_pdf_link(self, key, link):
+        self.writer.set_pdf_link(key, link)
+
+    def frame_since(self, marker):
+        # marker = (header, data rows already seen); later calls only fetch the rows below them
+        sheet = self.sheet_getter()
+        if marker is None:
+            with span("sheets.get_all_values"):
+                values = sheet.get_all_values()
+            if not values:
+                return pd.DataFrame(columns=RESULT_COLUMNS), None
+            header, rows = values[0], values[1:]
+            start = 0
+        else:
+            header, start = marker
+            with span("sheets.get_values"):
+                rows = sheet.get_values(f"A{start + 2}:{column_letter(len(header))}")
+        width = len(header)
+        rows = [(list(r) + [""] * width)[:width] for r in rows]
+        df = coerce_types(pd.DataFrame(rows, columns=header))
+        df.index = range(start + 2, start + 2 + len(df))  # sheet row numbers
+        return df, (header, start + len(rows))
+
+
+def sheet_records(sheet):
+    """Every data row of the results sheet as {column: text}; unlike get_all_records
+    nothing is turned into a number, so IDs such as "007" match the stored ones"""
+    with span("sheets.get_all_values"):
+        values = sheet.get_all_values()
+    if not values:
+        return []
+    header = values[0]
+    return [dict(zip(header, row)) for row in values[1:]]
+
+
+def store_from_env(sheet_getter):
+    """The result store shared by the app and the command-line tools.
+
+    FOOTPSY_STORE=sheets reads and writes the Google Sheet directly; otherwise
+    the local database (FOOTPSY_DB) is mirrored to the sheet through the spool
+    (FOOTPSY_SPOOL) unless FOOTPSY_SHEETS_MIRROR=0.
+    """
+    if os.environ.get("FOOTPSY_STORE") == "sheets":
+        return SheetsResultStore(sheet_getter)
+    mirror = None
+    if os.environ.get("FOOTPSY_SHEETS_MIRROR", "1") != "0":
+        mirror = BufferedSheetWriter(sheet_getter, spool_path=os.environ.get("FOOTPSY_SPOOL", DEFAULT_SPOOL_PATH))
+    return SQLiteResultStore(os.environ.get("FOOTPSY_DB", DEFAULT_STORE_PATH), mirror=mirror)
@@ -0,0 +1,13 @@
+import os, sys
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+MAPPING_PATH = os.path.join(ROOT, "assets", "scales_mapping.csv")
+
+
+@pytest.fixture
+def plan():
+    from scoring import ScoringPlan
+    return ScoringPlan.from_csv(MAPPING_PATH)
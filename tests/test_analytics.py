@@ -0,0 +1,103 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import analytics
+from analytics import CohortAnalytics, cohort_tables
+from scoring import BANDS, CORE_SCALES, HIGH_CUTOFF, MODERATE_CUTOFF
+
+TEAMS = ["Rovers", "United", " Rovers ", "", None]
+
+
+def results(n=120, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({scale: rng.choice([1.0, 2.99, 3.0, 3.5, 4.19, 4.2, 5.0, np.nan], n) for scale in CORE_SCALES})
+    df["Team Name"] = [TEAMS[k] for k in rng.integers(0, len(TEAMS), n)]
+    df["Position"] = rng.choice(["GK", "DF", "MF"], n)
+    df["Attention Pass"] = rng.integers(0, 2, n)
+    df["IM"] = rng.uniform(1, 5, n)
+    df["Inconsistency"] = rng.uniform(0, 2, n)
+    df[CORE_SCALES[0]] = df[CORE_SCALES[0]].astype(object)
+    df.loc[0, CORE_SCALES[0]] = "N/A"  # text left in a score column
+    return df
+
+
+def test_band_counts_match_a_row_by_row_count():
+    df = results()
+    bands = cohort_tables(df)["bands"]
+    expected = {}
+    for team, scores in zip(df["Team Name"], df[CORE_SCALES].to_dict("records")):
+        team = team.strip() if isinstance(team, str) else ""
+        team = team or "N/A"
+        for scale, score in scores.items():
+            score = pd.to_numeric(score, errors="coerce")
+            if np.isnan(score):
+                continue
+            band = BANDS[0] if score >= HIGH_CUTOFF else BANDS[1] if score >= MODERATE_CUTOFF else BANDS[2]
+            expected[team, band, scale] = expected.get((team, band, scale), 0) + 1
+    assert sorted(bands.index.get_level_values(0).unique()) == ["N/A", "Rovers", "United"]
+    for (team, band), counts in bands.iterrows():
+        for scale in CORE_SCALES:
+            assert counts[scale] == expected.get((team, band, scale), 0), (team, band, scale)
+
+
+def test_validity_rates_per_group():
+    df = results()
+    validity = cohort_tables(df, by="Position")["validity"]
+    for position, part in df.groupby("Position"):
+        row = validity.loc[position]
+        assert row["Assessments"] == len(part)
+        assert row["Attention fail %"] == round((part["Attention Pass"] == 0).mean() * 100, 1)
+        assert row["Mean IM"] == round(part["IM"].mean(), 2)
+
+
+class Dataset:
+    def __init__(self, df):
+        self.df = df
+        self.version = 1
+
+    def frame(self):
+        return self.df
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    seen = []
+
+    def counted(df, by="Team Name"):
+        seen.append(by)
+        return cohort_tables(df, by)
+    monkeypatch.setattr(analytics, "cohort_tables", counted)
+    return seen
+
+
+def test_tables_are_memoized_per_version_and_filters(calls):
+    dataset = Dataset(results())
+    cohort = CohortAnalytics(dataset)
+    first = cohort.tables(teams=["United", "Rovers"])
+    assert cohort.tables(teams=["Rovers", "United"]) is first
+    assert len(calls) == 1
+    cohort.tables(by="Position", teams=["Rovers", "United"])
+    assert len(calls) == 2
+    dataset.version += 1
+    assert cohort.tables(teams=["United", "Rovers"]) is not first
+    assert len(calls) == 3
+
+
+def test_least_recently_used_entry_is_dropped_past_maxsize(calls):
+    cohort = CohortAnalytics(Dataset(results()))
+    cohort.tables(teams=["T0"])
+    for n in range(1, cohort.maxsize):
+        cohort.tables(teams=[f"T{n}"])
+    cohort.tables(teams=["T0"])  # hit: now the most recently used
+    assert len(calls) == cohort.maxsize == 32
+    cohort.tables(teams=["T32"])  # evicts T1, the oldest
+    cohort.tables(teams=["T0"])
+    assert len(calls) == 33
+    cohort.tables(teams=["T1"])
+    assert len(calls) == 34 and len(cohort._memo) == 32
+
+
+def test_filter_matching_no_rows_gives_empty_tables():
+    tables = CohortAnalytics(Dataset(results())).tables(teams=["Nobody"])
+    assert tables["means"].empty and tables["bands"].empty and tables["validity"].empty
@@ -0,0 +1,111 @@
+import pandas as pd
+import pytest
+
+from dataset import CachedDataset
+from fake_google import make_fake_clients
+from history import PlayerIndex
+from pipeline import ResultPipeline
+from results import RESULT_COLUMNS, PLAYER_ID_INDEX, TIMESTAMP_INDEX
+from storage import SQLiteResultStore
+
+
+class ListStore:
+    """frame_since over a list of rows; the marker is the number of rows already returned.
+    `resend` makes the next fetch start that many rows before the marker"""
+
+    def __init__(self, ids=()):
+        self.ids = list(ids)
+        self.fetches = []
+        self.resend = 0
+
+    def frame_since(self, marker):
+        start = max((marker or 0) - self.resend, 0) if marker is not None else 0
+        self.fetches.append(marker)
+        df = pd.DataFrame({"Player ID": self.ids[start:], "Player Name": [f"P{i}" for i in self.ids[start:]]},
+                          index=range(start, len(self.ids)))
+        return df, len(self.ids)
+
+
+def player_ids(dataset):
+    return dataset.frame()["Player ID"].tolist()
+
+
+def test_within_ttl_the_cached_frame_is_returned_and_only_new_rows_are_fetched_after():
+    store = ListStore(["a", "b"])
+    dataset = CachedDataset(store, ttl=3600)
+    assert player_ids(dataset) == ["a", "b"]
+    store.ids.append("c")
+    assert player_ids(dataset) == ["a", "b"]
+    assert store.fetches == [None]
+    dataset.ttl = 0
+    assert player_ids(dataset) == ["a", "b", "c"]
+    assert store.fetches == [None, 2]
+
+
+def test_mark_stale_syncs_on_the_next_call_only():
+    store = ListStore(["a"])
+    dataset = CachedDataset(store, ttl=3600)
+    dataset.frame()
+    store.ids.append("b")
+    dataset.mark_stale()
+    version = dataset.version
+    assert player_ids(dataset) == ["a", "b"]
+    assert dataset.version == version + 1
+    dataset.frame()
+    assert store.fetches == [None, 1]
+
+
+def test_frame_loaded_empty_picks_up_the_first_rows():
+    store = ListStore()
+    dataset = CachedDataset(store, ttl=3600)
+    assert dataset.frame().empty
+    assert dataset.player_index().size == 0
+    store.ids += ["a", "b", "a"]
+    dataset.mark_stale()
+    assert player_ids(dataset) == ["a", "b", "a"]
+    assert dataset.player_index().rows["a"] == [0, 2]
+
+
+def test_rows_already_held_coming_back_reload_the_frame():
+    store = ListStore(["a", "b"])
+    dataset = CachedDataset(store, ttl=0)
+    players = dataset.player_index()
+    store.ids = ["b", "a", "c"]  # re-sorted source with one new row
+    store.resend = 2
+    df = dataset.frame()
+    assert df["Player ID"].tolist() == ["b", "a", "c"]
+    assert df.index.is_unique
+    rebuilt = dataset.player_index()
+    assert rebuilt is not players
+    assert dict(rebuilt.rows) == {"b": [0], "a": [1], "c": [2]}
+
+
+def test_extended_structures_match_a_fresh_build():
+    store = ListStore(["a", "b"])
+    dataset = CachedDataset(store, ttl=0)
+    players = dataset.player_index()
+    store.ids += ["c", "a"]
+    assert dataset.player_index() is players
+    fresh = PlayerIndex(dataset.frame())
+    assert dict(players.rows) == dict(fresh.rows) and players.size == fresh.size == 4
+
+
+def result_row(n):
+    row = [""] * len(RESULT_COLUMNS)
+    row[TIMESTAMP_INDEX] = f"2025-01-{n:02d} 10:00:00"
+    row[PLAYER_ID_INDEX] = f"ID{n}"
+    return row
+
+
+@pytest.mark.parametrize("loaded", [0, 1])
+def test_logged_submission_is_visible_to_the_admin_within_the_ttl(tmp_path, loaded):
+    store = SQLiteResultStore(str(tmp_path / "results.sqlite3"))
+    store.append_many([result_row(n) for n in range(1, loaded + 1)])
+    dataset = CachedDataset(store, ttl=3600)
+    assert len(dataset.frame()) == loaded
+    clients = make_fake_clients()
+    pipeline = ResultPipeline(lambda: clients, writer=store, backoff=0, on_logged=dataset.mark_stale)
+    sub = pipeline.submit(result_row(9), b"%PDF-1.4", "Player", "ID9")
+    assert sub.wait(10) and sub.logged
+    assert dataset.frame()["Player ID"].tolist()[-1] == "ID9"
+    assert len(dataset.frame()) == loaded + 1
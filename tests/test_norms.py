@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from norms import ALL, MIN_NORM_SIZE, NormTables, age_group, ordinal
+from scoring import CORE_SCALES
+
+SCALE = CORE_SCALES[0]
+
+
+def results(n, seed=0, position="Midfielder", age=20):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({scale: np.round(rng.uniform(1, 5, n), 2) for scale in CORE_SCALES})
+    df[SCALE] = rng.integers(1, 6, n).astype(float)  # plenty of ties
+    df["Position"] = position
+    df["Age"] = age
+    return df
+
+
+def brute_percentile(values, score):
+    values = [v for v in values if v == v]
+    below = sum(v < score for v in values)
+    equal = sum(v == score for v in values)
+    return round(100 * (below + 0.5 * equal) / len(values))
+
+
+@pytest.mark.parametrize("score", [0.5, 1, 2.5, 3, 4.99, 5, 6])
+def test_percentile_is_the_mid_rank_of_a_brute_force_count(score):
+    df = results(200)
+    df.loc[::17, SCALE] = np.nan  # blanks are left out of the norm group
+    tables = NormTables(df)
+    pct, label, n = tables.percentile(SCALE, score)
+    assert (pct, label, n) == (brute_percentile(df[SCALE], score), ALL[0], df[SCALE].notna().sum())
+
+
+def test_rows_merged_in_later_match_a_single_build():
+    df = results(300, seed=1)
+    tables = NormTables(df.iloc[:100])
+    tables.percentile(SCALE, 3)  # sorts the first part
+    tables.extend(df.iloc[100:250])
+    tables.extend(df.iloc[250:])
+    fresh = NormTables(df)
+    for scale in CORE_SCALES:
+        for score in (1, 2.2, 3, 4.7):
+            assert tables.percentile(scale, score) == fresh.percentile(scale, score)
+
+
+def test_small_groups_fall_back_to_all_players():
+    df = pd.concat([results(MIN_NORM_SIZE, position="Goalkeeper"),
+                    results(MIN_NORM_SIZE - 1, seed=2, position="Striker", age=17)], ignore_index=True)
+    tables = NormTables(df)
+    assert tables.percentile(SCALE, 3, "Position", "goalkeeper ")[1:] == ("Position: goalkeeper ", MIN_NORM_SIZE)
+    assert tables.percentile(SCALE, 3, "Position", "Striker")[1:] == (ALL[0], len(df))
+    assert tables.percentile(SCALE, 3, "Age group", "U18")[1:] == (ALL[0], len(df))
+    assert tables.percentile(SCALE, 3, "Age group", "U21")[1:] == ("Age group: U21", MIN_NORM_SIZE)
+    assert tables.percentile(SCALE, 3, "Position", "Unknown")[1] == ALL[0]
+
+
+def test_no_norms_or_no_score_gives_none():
+    assert NormTables().percentile(SCALE, 3) is None
+    tables = NormTables(results(50))
+    assert tables.percentile(SCALE, np.nan) is None
+    assert tables.percentile(SCALE, None) is None
+
+
+@pytest.mark.parametrize("age, group", [
+    (12, "U16"), (15.99, "U16"), (16, "U18"), ("17", "U18"), (18, "U21"), (20.5, "U21"),
+    (21, "Senior"), (199, "Senior"), (200, None), ("N/A", None), ("", None), (None, None), (np.nan, None),
+])
+def test_age_group_edges(age, group):
+    assert age_group(age) == group
+
+
+@pytest.mark.parametrize("n, text", [(1, "1st"), (2, "2nd"), (3, "3rd"), (4, "4th"), (11, "11th"),
+                                     (12, "12th"), (13, "13th"), (21, "21st"), (22, "22nd"), (100, "100th")])
+def test_ordinal(n, text):
+    assert ordinal(n) == text
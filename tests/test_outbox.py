@@ -0,0 +1,85 @@
+import threading
+import pytest
+
+import fake_google
+from fake_google import make_fake_clients
+from outbox import PdfOutbox
+from pipeline import upload_pdf
+
+
+@pytest.fixture
+def drive():
+    return make_fake_clients().drive
+
+
+@pytest.fixture
+def links():
+    return {}
+
+
+@pytest.fixture
+def outbox(tmp_path, drive, links):
+    box = PdfOutbox(lambda: drive, links.__setitem__, str(tmp_path / "outbox.sqlite3"), autostart=False)
+    yield box
+    box.close()
+
+
+def test_enqueue_twice_uploads_once(outbox, drive, links):
+    outbox.enqueue("ID1@t", 7, b"%PDF-1", "A", "ID1")
+    outbox.enqueue("ID1@t", 7, b"%PDF-1", "A", "ID1")
+    assert outbox.pending_count() == 1
+    assert outbox.drain() == 1
+    assert len(drive.files_store) == 1
+    assert links == {7: "https://drive.example/fake1/view"}
+    assert outbox.drain() == 0 and outbox.pending_count() == 0
+
+
+def test_retry_finds_the_file_an_earlier_attempt_uploaded(outbox, drive, links):
+    upload_pdf(drive, b"%PDF-1", "A", "ID1", "ID1@t")  # landed, but the outbox never heard back
+    outbox.enqueue("ID1@t", 7, b"%PDF-1", "A", "ID1")
+    outbox.db.execute("UPDATE outbox SET attempts = 1")
+
+    assert outbox.drain() == 1
+    assert list(drive.files_store) == ["fake1"]
+    assert "fake1" in drive.permissions_store
+    assert links == {7: "https://drive.example/fake1/view"}
+
+
+def test_failed_grant_is_retried_without_a_second_upload(outbox, drive, monkeypatch):
+    grant = fake_google._FakePermissions.create
+    failures = [ConnectionError("grant failed")]
+
+    def flaky(self, fileId=None, body=None, **kwargs):
+        if failures:
+            raise failures.pop()
+        return grant(self, fileId, body, **kwargs)
+    monkeypatch.setattr(fake_google._FakePermissions, "create", flaky)
+
+    outbox.enqueue("ID1@t", None, b"%PDF-1", "A", "ID1")
+    with pytest.raises(ConnectionError):
+        outbox.drain()
+    assert outbox.pending()[0][1:] == (1, "grant failed")
+
+    assert outbox.drain() == 1
+    assert list(drive.files_store) == ["fake1"]
+    assert list(drive.permissions_store) == ["fake1"]
+
+
+def test_two_outboxes_on_one_file_upload_each_pdf_once(tmp_path, drive):
+    # the app and outbox.py drain the same file from different processes
+    drive.latency = 0.05
+    path = str(tmp_path / "outbox.sqlite3")
+    boxes = [PdfOutbox(lambda: drive, lambda key, link: None, path, batch_size=2, autostart=False) for _ in range(2)]
+    for n in range(6):
+        boxes[0].enqueue(f"ID{n}@t", None, b"%PDF-1", "A", f"ID{n}")
+
+    threads = [threading.Thread(target=box.drain) for box in boxes]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(drive.files_store) == 6
+    assert boxes[1].pending_count() == 0
+    for box in boxes:
+        box.close()
@@ -0,0 +1,72 @@
+import datetime, io
+import pytest
+
+from paper_import import prepare, read_sheet
+from results import RESULT_COLUMNS
+
+NOW = datetime.datetime(2025, 3, 1, 9, 30)
+PLAYER_ID = RESULT_COLUMNS.index("Player ID")
+
+
+def sheet(*rows, header=None):
+    """An import CSV: one (name, {question: answer}, {column: value}) tuple per row, all
+    other answers 3 with the attention check (Q18 = 1, Q60 = 4) passed"""
+    header = header or ["Player Name", "Player ID", "Timestamp"] + [f"Q{i}" for i in range(1, 67)]
+    lines = [",".join(header)]
+    for name, answers, info in rows:
+        values = {"Player Name": name, "Q18": "1", "Q60": "4", **info, **answers}
+        lines.append(",".join(str(values.get(c, "3" if c.startswith("Q") else "")) for c in header))
+    return read_sheet(io.StringIO("\n".join(lines)))
+
+
+def test_valid_rows_are_scored_and_filled_in(plan):
+    batch = prepare(sheet(("Ana", {}, {"Player ID": "P1"}), ("Ben", {}, {})), plan, now=NOW)
+    assert batch.errors == [] and batch.lines == [2, 3]
+    assert batch.rows[0][PLAYER_ID] == "P1"
+    assert batch.rows[1][PLAYER_ID]  # generated
+    assert batch.rows[0][RESULT_COLUMNS.index("Timestamp")] == "2025-03-01 09:30:00"
+
+
+@pytest.mark.parametrize("answer", ["0", "6", "x", "", "2.5"])
+def test_answers_outside_1_to_5_reject_the_row(plan, answer):
+    batch = prepare(sheet(("Ana", {"Q7": answer}, {}), ("Ben", {}, {})), plan, now=NOW)
+    assert len(batch.rows) == 1 and batch.lines == [3]
+    assert batch.errors == [(2, f"answers must be 1–5: Q7={answer!r}")]
+
+
+def test_blank_player_name_rejects_the_row(plan):
+    batch = prepare(sheet(("  ", {}, {})), plan, now=NOW)
+    assert batch.rows == [] and batch.errors == [(2, "Player Name is blank")]
+
+
+def test_bad_timestamp_rejects_the_row(plan):
+    batch = prepare(sheet(("Ana", {}, {"Timestamp": "01/03/2025"})), plan, now=NOW)
+    assert batch.rows == [] and batch.errors == [(2, "Timestamp '01/03/2025' is not YYYY-MM-DD HH:MM:SS")]
+
+
+def test_duplicate_player_id_and_timestamp_keeps_the_first(plan):
+    same = {"Player ID": "P1", "Timestamp": "2025-01-01 10:00:00"}
+    batch = prepare(sheet(("Ana", {}, same), ("Ana again", {}, same), ("Ben", {}, {"Player ID": "P2"})), plan, now=NOW)
+    assert batch.lines == [2, 4]
+    assert batch.errors == [(3, "same Player ID and Timestamp as line 2")]
+
+
+def test_failed_attention_check_is_imported_but_flagged(plan):
+    batch = prepare(sheet(("Ana", {"Q18": "5"}, {"Player ID": "P1"}), ("Ben", {}, {})), plan, now=NOW)
+    assert len(batch.rows) == 2 and batch.errors == []
+    assert batch.attention_failures == [(2, "Ana", "P1")]
+
+
+def test_missing_question_columns_fail_the_whole_sheet(plan):
+    header = ["Player Name"] + [f"Q{i}" for i in range(1, 60)]
+    with pytest.raises(ValueError, match="Missing columns: Q60, Q61"):
+        prepare(sheet(("Ana", {}, {}), header=header), plan, now=NOW)
+
+
+def test_header_spellings_and_blank_lines(plan):
+    header = ["name", "id"] + [f"item {i:02d}" for i in range(1, 67)]
+    answers = ["1" if i == 18 else "4" if i == 60 else "3" for i in range(1, 67)]
+    text = "\n".join([",".join(header), ",".join(["Ana", "P1"] + answers), "," * (len(header) - 1)])
+    batch = prepare(read_sheet(io.StringIO(text)), plan, now=NOW)
+    assert batch.errors == [] and batch.lines == [2]
+    assert batch.rows[0][PLAYER_ID] == "P1" and batch.attention_failures == []
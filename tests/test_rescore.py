@@ -0,0 +1,60 @@
+import datetime
+import numpy as np
+import pytest
+
+from rescore import rescore
+from results import build_result_row, responses_from_vector, response_matrix
+from scoring import ScoringPlan, score_batch, scores_at, N_ITEMS
+from storage import SQLiteResultStore
+
+
+def stored_rows(plan, n, seed=0):
+    X = np.random.default_rng(seed).integers(1, 6, size=(n, N_ITEMS)).astype(float)
+    out = score_batch(X, plan)
+    return [build_result_row({"name": f"P{k}", "id": f"ID{k}"}, *scores_at(out, k, plan), responses_from_vector(X[k]),
+                             timestamp=datetime.datetime(2025, 1, 1)) for k in range(n)]
+
+
+def test_columns_after_reads_text_cells_as_blank():
+    store = SQLiteResultStore(":memory:")
+    store.import_records([{"Player ID": "A", "Timestamp": "t1", "Resilience": "N/A", "Q1": "N/A", "Q2": 3}])
+    ids, values = store.columns_after(0, 10, ["Resilience", "Q1", "Q2"])
+    assert ids == [1]
+    assert np.isnan(values[0, 0]) and np.isnan(values[0, 1]) and values[0, 2] == 3
+
+
+def test_rescore_applies_a_changed_mapping(tmp_path, plan):
+    store = SQLiteResultStore(str(tmp_path / "results.sqlite3"))
+    store.append_many(stored_rows(plan, 23))
+    store.import_records([{"Player ID": "legacy", "Timestamp": "t", "Resilience": "N/A", "Q1": "N/A"}])
+    changed = ScoringPlan({**plan.scale_items, "Resilience": plan.scale_items["Resilience"][1:]})
+
+    state = rescore(store, changed, str(tmp_path / "checkpoint.json"), chunk_rows=5)
+
+    assert state["rows"] == 24
+    frame = store.frame()
+    X = response_matrix(frame)[:23]
+    expected = score_batch(X, changed)["Resilience"]
+    np.testing.assert_allclose(frame["Resilience"].iloc[:23].to_numpy(dtype=float), expected)
+    assert frame["Resilience"].iloc[23] == "N/A"  # no answers recorded: left as it was
+
+
+def test_rescore_resumes_from_checkpoint(tmp_path, plan):
+    store = SQLiteResultStore(str(tmp_path / "results.sqlite3"))
+    store.append_many(stored_rows(plan, 12))
+    checkpoint = str(tmp_path / "checkpoint.json")
+    changed = ScoringPlan({**plan.scale_items, "Resilience": plan.scale_items["Resilience"][1:]})
+
+    def interrupt(state):
+        if state["last_id"] >= 8:
+            raise KeyboardInterrupt
+    with pytest.raises(KeyboardInterrupt):
+        rescore(store, changed, checkpoint, chunk_rows=4, progress=interrupt)
+
+    seen = []
+    state = rescore(store, changed, checkpoint, chunk_rows=4, progress=lambda s: seen.append(s["last_id"]))
+    assert seen == [12] and state["rows"] == 12
+    # same plan, nothing left; a different plan starts over
+    assert rescore(store, changed, checkpoint, chunk_rows=4)["rows"] == 12
+    back = rescore(store, plan, checkpoint, chunk_rows=4)
+    assert back["rows"] == 12 and back["changed"] > 0
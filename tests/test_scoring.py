@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+from scoring import (score_batch, max_longstring_batch, compute_domain_means, compute_im_score,
+                     inconsistency_index, max_longstring, N_ITEMS)
+
+
+def answer_matrix(n=200, seed=0):
+    """Random answers with NaN gaps, long runs, and fully blank / fully answered rows"""
+    rng = np.random.default_rng(seed)
+    X = rng.integers(1, 6, size=(n, N_ITEMS)).astype(float)
+    X[rng.random(X.shape) < 0.15] = np.nan
+    X[0] = np.nan
+    X[1] = 3.0
+    X[2, 10:40] = 5.0
+    X[3, 10:40] = 5.0
+    X[3, 20:25] = np.nan  # a run broken only by unanswered items
+    X[4, :] = np.nan
+    X[4, 7] = 2.0
+    return X
+
+
+def without_nan(row):
+    """Unanswered items left out of the dict"""
+    return {i: v for i, v in enumerate(row.tolist(), start=1) if v == v}
+
+
+def with_nan(row):
+    """Unanswered items kept in the dict as NaN"""
+    return dict(enumerate(row.tolist(), start=1))
+
+
+def assert_same(a, b):
+    assert (a == b) or (np.isnan(a) and np.isnan(b)), (a, b)
+
+
+@pytest.mark.parametrize("as_responses", [without_nan, with_nan])
+def test_score_batch_matches_per_player_functions(plan, as_responses):
+    X = answer_matrix()
+    out = score_batch(X, plan)
+    for n, row in enumerate(X):
+        responses = as_responses(row)
+        for scale, mean in compute_domain_means(responses, plan.scale_items, plan.reverse_items).items():
+            assert_same(out[scale][n], mean)
+        im = compute_im_score(responses, plan.im_items, plan.reverse_items)
+        assert_same(out["IM"][n], im / len(plan.im_items))
+        assert_same(out["Inconsistency"][n], inconsistency_index(responses, plan.pairs))
+        assert out["Longstring"][n] == max_longstring(responses)
+
+
+def test_nan_answers_score_like_missing_ones(plan):
+    blank = with_nan(np.full(N_ITEMS, np.nan))
+    assert np.isnan(compute_im_score(blank, plan.im_items, plan.reverse_items))
+    assert np.isnan(score_batch(np.full((1, N_ITEMS), np.nan), plan)["IM"][0])
+    assert max_longstring(blank) == 0
+
+
+@pytest.mark.parametrize("as_responses", [without_nan, with_nan])
+def test_max_longstring_batch_matches_per_player(as_responses):
+    X = answer_matrix(seed=1)
+    expected = [max_longstring(as_responses(row)) for row in X]
+    assert max_longstring_batch(X).tolist() == expected
+    assert expected[0] == 0 and expected[1] == N_ITEMS and expected[3] >= 25 and expected[4] == 1
@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from search_index import SearchIndex
+
+FIRST = ["Ana", "Anna", "Hannah", "Ben", "Benjamin", "Jo", "Joanna", "Zoë", "Łukasz", "Ann-Marie"]
+LAST = ["Smith", "Annan", "Bento", "O'Brien", "Rovers", "Johansson"]
+TEAMS = ["Rovers FC", "United", "Athletic", "Bento Boys", None, "  rovers  "]
+
+
+def frame(n=600, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "Player Name": [f"{rng.choice(FIRST)} {rng.choice(LAST)}" for _ in range(n)],
+        "Player ID": [f"FPY-{k % 250:04d}" for k in range(n)],  # > 64 distinct values: the bulk row path
+        "Team Name": [TEAMS[k] for k in rng.integers(0, len(TEAMS), n)],
+    })
+
+
+def reference(df, mode="contains", **queries):
+    """Naive str.contains / str.startswith over the whole frame"""
+    hit = pd.Series(True, index=df.index)
+    for field, query in queries.items():
+        text = df[field].fillna("").astype(str).str.strip().str.casefold()
+        query = query.strip().casefold()
+        hit &= text.str.contains(query, regex=False) if mode == "contains" else text.str.startswith(query)
+    return np.flatnonzero(hit.to_numpy())
+
+
+QUERIES = ["a", "An", "nn", "ann", "ANNA", "an s", "rov", "ë", "łuk", "zzz", " ben ", "fpy-01", "0042", "o'b"]
+
+
+@pytest.mark.parametrize("mode", ["contains", "prefix"])
+@pytest.mark.parametrize("query", QUERIES)
+def test_single_field_matches_naive_scan(mode, query):
+    df = frame()
+    index = SearchIndex(df)
+    for field in ["Player Name", "Player ID", "Team Name"]:
+        found = index.search(mode, **{field: query})
+        np.testing.assert_array_equal(found, reference(df, mode, **{field: query}))
+
+
+@pytest.mark.parametrize("mode", ["contains", "prefix"])
+def test_fields_combine_as_and(mode):
+    df = frame()
+    index = SearchIndex(df)
+    queries = {"Player Name": "an", "Team Name": "ro", "Player ID": "fpy-0"}
+    np.testing.assert_array_equal(index.search(mode, **queries), reference(df, mode, **queries))
+
+
+def test_blank_queries_and_unknown_fields_do_not_filter():
+    index = SearchIndex(frame())
+    assert index.search(**{"Player Name": "", "Team Name": "   "}) is None
+    assert index.search(**{"Position": "GK"}) is None
+
+
+def test_extend_matches_a_fresh_index_and_within_clips():
+    df = frame()
+    index = SearchIndex(df.iloc[:200])
+    index.extend(df.iloc[200:])
+    full = reference(df, **{"Player Name": "ann"})
+    np.testing.assert_array_equal(index.search(**{"Player Name": "ann"}), full)
+    # a caller still holding the first 200 rows never gets positions past its frame
+    np.testing.assert_array_equal(index.search(within=200, **{"Player Name": "ann"}), full[full < 200])
+    np.testing.assert_array_equal(index.search("prefix", within=200, **{"Team Name": "rov"}),
+                                  reference(df.iloc[:200], "prefix", **{"Team Name": "rov"}))
@@ -0,0 +1,143 @@
+import threading, time
+import pytest
+
+import sheet_writer
+from fake_google import make_fake_clients
+from results import RESULT_COLUMNS, PLAYER_ID_INDEX, TIMESTAMP_INDEX
+from sheet_writer import BufferedSheetWriter
+
+
+def row(n):
+    out = [""] * len(RESULT_COLUMNS)
+    out[TIMESTAMP_INDEX] = f"2025-01-{n:02d} 10:00:00"
+    out[PLAYER_ID_INDEX] = f"ID{n}"
+    return out
+
+
+@pytest.fixture
+def clients():
+    return make_fake_clients(header=RESULT_COLUMNS)
+
+
+@pytest.fixture
+def spool(tmp_path, clients):
+    writer = BufferedSheetWriter(lambda: clients.sheet, str(tmp_path / "spool.sqlite3"), max_delay=3600)
+    yield writer
+    writer.close(flush=False)
+
+
+def mark_sent(spool, spool_id):
+    spool.db.execute("UPDATE spool SET sent_at = ? WHERE id = ?", (time.time(), spool_id))
+
+
+def test_flush_sends_pending_rows_in_one_call(spool, clients):
+    spool.append_many([row(1), row(2)])
+    calls = clients.sheet.calls
+    assert spool.flush() == 2
+    assert clients.sheet.calls == calls + 1
+    assert [r[PLAYER_ID_INDEX] for r in clients.sheet.rows[1:]] == ["ID1", "ID2"]
+    assert spool.pending_count() == 0
+
+
+def test_unconfirmed_batch_is_reconciled_not_resent(spool, clients):
+    landed, lost = spool.append_many([row(1), row(2)])
+    mark_sent(spool, landed)
+    mark_sent(spool, lost)
+    clients.sheet.append_rows([row(1)])  # reached the sheet before the crash; row 2 did not
+
+    assert spool.flush() == 1
+    assert [r[PLAYER_ID_INDEX] for r in clients.sheet.rows[1:]] == ["ID1", "ID2"]
+    sheet_rows = dict(spool.db.execute("SELECT id, sheet_row FROM spool"))
+    assert sheet_rows == {landed: 2, lost: 3}
+
+
+def test_pdf_link_lands_in_the_spooled_row_or_the_sheet(spool, clients):
+    link_col = RESULT_COLUMNS.index("PDF Link")
+    first = spool.append(row(1))
+    spool.set_pdf_link(first, "before")
+    spool.flush()
+    second = spool.append(row(2))
+    spool.flush()
+    spool.set_pdf_link(second, "after")
+    assert [r[link_col] for r in clients.sheet.rows[1:]] == ["before", "after"]
+
+
+def test_failed_spool_write_rolls_back(spool):
+    with pytest.raises(TypeError):
+        spool.append_many([row(1), object()])  # the second row cannot be serialized
+    assert not spool.db.in_transaction
+    assert spool.pending_count() == 0
+    spool.append(row(2))
+    assert spool.pending_count() == 1
+
+
+def test_failed_flush_bookkeeping_rolls_back(spool, clients, monkeypatch):
+    spool.append(row(1))
+    monkeypatch.setattr(sheet_writer, "first_updated_row", lambda response: "not a row number")
+    with pytest.raises(TypeError):
+        spool.flush()
+    assert not spool.db.in_transaction
+    monkeypatch.undo()
+
+    spool.append(row(2))
+    assert spool.flush() == 1
+    assert spool.pending_count() == 0
+    # the first row reached the sheet before the failure and is reconciled, not resent
+    assert [r[PLAYER_ID_INDEX] for r in clients.sheet.rows[1:]] == ["ID1", "ID2"]
+
+
+class HeldSheet:
+    """The fake sheet, with append_rows held until released (a send still on its way)"""
+
+    def __init__(self, sheet):
+        self.sheet = sheet
+        self.sending = threading.Event()
+        self.release = threading.Event()
+
+    def __getattr__(self, name):
+        return getattr(self.sheet, name)
+
+    def append_rows(self, rows, **kwargs):
+        self.sending.set()
+        self.release.wait(5)
+        return self.sheet.append_rows(rows, **kwargs)
+
+
+def flush_while_held(held, writer, during):
+    """Start writer.flush(), run `during` while its first batch is in flight, then let it land"""
+    flush = threading.Thread(target=writer.flush)
+    flush.start()
+    assert held.sending.wait(5)
+    during()
+    held.release.set()
+    flush.join()
+
+
+def test_two_writers_on_one_spool_send_each_row_once(tmp_path, clients):
+    # the app and outbox.py / paper_import.py flush the same spool file from different processes
+    held = HeldSheet(clients.sheet)
+    path = str(tmp_path / "spool.sqlite3")
+    first = BufferedSheetWriter(lambda: held, path, max_rows=2, max_delay=3600)
+    second = BufferedSheetWriter(lambda: clients.sheet, path, max_rows=2, max_delay=3600)
+    first.append_many([row(n) for n in range(1, 7)])
+
+    flush_while_held(held, first, second.flush)
+
+    assert sorted(r[PLAYER_ID_INDEX] for r in clients.sheet.rows[1:]) == sorted(f"ID{n}" for n in range(1, 7))
+    assert first.pending_count() == 0
+    first.close(flush=False)
+    second.close(flush=False)
+
+
+def test_link_set_by_another_writer_mid_flush_reaches_the_sheet(tmp_path, clients):
+    held = HeldSheet(clients.sheet)
+    path = str(tmp_path / "spool.sqlite3")
+    sender = BufferedSheetWriter(lambda: held, path, max_delay=3600)
+    other = BufferedSheetWriter(lambda: clients.sheet, path, max_delay=3600)
+    spool_id = sender.append(row(1))
+
+    flush_while_held(held, sender, lambda: other.set_pdf_link(spool_id, "https://drive.example/late"))
+
+    assert clients.sheet.rows[1][RESULT_COLUMNS.index("PDF Link")] == "https://drive.example/late"
+    sender.close(flush=False)
+    other.close(flush=False)